@@ -0,0 +1,40 @@
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import FileResponse
+from utils import profiling
+from utils.profiling import profiler_instance
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"]
+)
+
+def _check_access(x_profile: Optional[str]):
+    if not profiling.ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (set BMATS_PROFILING=1)")
+    if profiling.TOKEN and x_profile != profiling.TOKEN:
+        raise HTTPException(status_code=403, detail="Missing or invalid X-Profile token")
+
+@router.get("/profiles")
+async def list_profiles(limit: int = Query(50, ge=1, le=500), x_profile: Optional[str] = Header(None)):
+    """Most recent request profiles (method, path, status, duration)."""
+    _check_access(x_profile)
+    return profiler_instance.recent(limit)
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_profile: Optional[str] = Header(None)):
+    """Profile metadata plus the top functions by cumulative time."""
+    _check_access(x_profile)
+    summary = profiler_instance.summary(profile_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return summary
+
+@router.get("/profiles/{profile_id}/pstats")
+async def download_profile(profile_id: str, x_profile: Optional[str] = Header(None)):
+    """Raw pstats file for `python -m pstats`, snakeviz or speedscope."""
+    _check_access(x_profile)
+    path = profiler_instance.stats_path(profile_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
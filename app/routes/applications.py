@@ -1,6 +1,9 @@
-from fastapi import APIRouter 
-from models.application import ApplicationSubmit 
+from fastapi import APIRouter, Header, Query
+from typing import Optional
+from models.application import ApplicationSubmit, ApplicationBulkSubmit
 from app.services.application import ApplicationService
+from app.services.rescoring import RescoringService, BATCH_SIZE
+from utils.profiling import profile_thread
 
 
 
@@ -9,9 +12,34 @@ router = APIRouter(
     tags=["applications"]
 )
 
+# Scoring handlers are sync so inference runs in the threadpool, bounded by admission control
 @router.post("/")
-async def create_application(application: ApplicationSubmit): 
-    return ApplicationService.create_application(application)
+@profile_thread
+def create_application(application: ApplicationSubmit,
+                       idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)):
+    """
+    Apply to a job. Repeating the request (double submit, client retry) returns
+    the existing application without scoring again; pass an Idempotency-Key to
+    make retries of one submission explicit.
+    """
+    return ApplicationService.create_application(application, idempotency_key=idempotency_key)
+
+@router.post("/bulk")
+@profile_thread
+def create_applications_bulk(submission: ApplicationBulkSubmit):
+    """Apply one user to up to 100 jobs with a single batched scoring pass."""
+    return ApplicationService.create_applications_bulk(submission)
+
+# Sync too: the lease and stale-count queries would otherwise block the event loop
+@router.post("/rescore", status_code=202)
+def start_rescoring(batch_size: int = Query(BATCH_SIZE, ge=1, le=4096)):
+    """Rescore applications whose score is stale (model change, resume re-upload, job update)."""
+    return RescoringService.start(batch_size)
+
+@router.get("/rescore/status")
+def get_rescoring_status():
+    """Progress of the current or last rescoring run."""
+    return RescoringService.progress()
 
 @router.get("/user/{userId}")
 async def get_applications_of_user(userId: str): 
@@ -19,6 +47,18 @@ async def get_applications_of_user(userId: str):
     return ApplicationService.get_applications_of_user(userId)
 
 @router.get("/job/{jobId}")
-async def get_applications_of_job(jobId: str):
-    """Get all applications for a specific job (for job posters to view applicants)."""
-    return ApplicationService.get_applications_of_job(jobId)
+async def get_applications_of_job(jobId: str, skills: Optional[str] = None, min_skill_overlap: int = Query(0, ge=0)):
+    """
+    Get all applications for a specific job (for job posters to view applicants).
+    `skills` (comma-separated) keeps applicants having all of them; `min_skill_overlap`
+    those having at least that many of the job's required skills.
+    """
+    return ApplicationService.get_applications_of_job(jobId, skills=skills, min_skill_overlap=min_skill_overlap)
+
+
+@router.get("/job/{jobId}/leaderboard")
+async def get_job_leaderboard(jobId: str, limit: int = Query(20, ge=1, le=500), min_score: Optional[float] = None,
+                              skills: Optional[str] = None, min_skill_overlap: int = Query(0, ge=0)):
+    """Get the top-ranked applicants for a job along with score statistics (skill filters as above)."""
+    return ApplicationService.get_leaderboard(jobId, limit=limit, min_score=min_score,
+                                              skills=skills, min_skill_overlap=min_skill_overlap)
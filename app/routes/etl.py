@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Request
+from sqlmodel import Session, select
+from core.database import engine, EtlRun
+
+router = APIRouter(
+    prefix="/etl",
+    tags=["etl"]
+)
+
+@router.get("/status")
+async def get_etl_status(request: Request):
+    """Scheduler state and recent ETL runs (last run, duration, rows added, errors)."""
+    scheduler = getattr(request.app.state, "etl_scheduler", None)
+    if scheduler:
+        return scheduler.status()
+    with Session(engine) as session:
+        recent = session.exec(select(EtlRun).order_by(EtlRun.id.desc()).limit(10)).all()
+    return {"enabled": False, "last_run": recent[0] if recent else None, "recent_runs": recent}
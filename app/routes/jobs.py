@@ -1,6 +1,10 @@
-from fastapi import APIRouter 
+from fastapi import APIRouter, BackgroundTasks, Query
+from typing import Optional
 from models.job import Job 
 from app.services.job import JobService 
+from app.services.job_enrichment import JobEnrichmentService
+from app.services.candidates import CandidateSearchService, RERANK_K
+from utils.profiling import profile_thread
 
 router = APIRouter(
     prefix="/jobs",
@@ -8,9 +12,11 @@ router = APIRouter(
 )
 
 @router.post("/")
-async def create_job(job: Job):
+async def create_job(job: Job, background_tasks: BackgroundTasks):
     """Create a new job posting."""
-    return JobService.create_job(job)
+    created = JobService.create_job(job.user_id, job)
+    background_tasks.add_task(JobEnrichmentService.enrich_job_ids, [created.id])
+    return created
 
 @router.get("/")
 async def get_all_jobs():
@@ -30,3 +36,16 @@ async def get_job_by_id(job_id: str):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
+
+@router.get("/{job_id}/candidates")
+@profile_thread
+def get_job_candidates(job_id: str, limit: int = Query(20, ge=1, le=100), k: int = Query(RERANK_K, ge=1, le=500),
+                       skills: Optional[str] = None, min_skill_overlap: int = Query(0, ge=0)):
+    """
+    Strongest candidates for a job among all users (not only applicants):
+    BM25 over every profile picks the top `k`, the cross-encoder re-ranks them.
+    `skills` (comma-separated, all required) and `min_skill_overlap` (with the
+    job's required skills) restrict the profiles before retrieval.
+    Sync handler: the re-ranking runs in the threadpool.
+    """
+    return CandidateSearchService.search(job_id, limit=limit, k=k, skills=skills, min_skill_overlap=min_skill_overlap)
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Optional
 from app.services.resume import ResumeService
 from app.services.users import UserService
 from app.services.job import JobService 
+from app.services.job_enrichment import JobEnrichmentService
+from app.services.application import ApplicationService
 from models.job import JobCreate
+from utils.profiling import profile_thread
+from utils.uploads import SpooledUpload, receive_pdf_upload
 
 router = APIRouter(
     prefix="/users",
@@ -14,16 +19,41 @@ router = APIRouter(
 class UploadResumeRequest(BaseModel):
     user_id: str
 
-@router.post("/upload-resume")
-async def upload_and_store_resume(user_id: str = Form(...), file: UploadFile = File(...)):
+UPLOAD_RESUME_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["user_id", "file"],
+            "properties": {"user_id": {"type": "string"}, "file": {"type": "string", "format": "binary"}}
+        }}}
+    }
+}
+
+@router.post("/upload-resume", openapi_extra=UPLOAD_RESUME_BODY)
+async def upload_and_store_resume(request: Request):
     """
     Upload a resume (PDF) to be parsed, anonymized, and stored.
     - If user doesn't exist, creates new user with extracted data
     - If user exists, updates their data with new resume info
     Returns the user with extracted skills, experience, education.
+    The body is streamed and checked on the event loop (utils/uploads.py), so
+    oversized or non-PDF uploads are refused before a threadpool worker is used;
+    the parse itself runs in the threadpool, bounded by admission control.
     """
+    upload = await receive_pdf_upload(request)
+    try:
+        user_id = upload.fields.get("user_id")
+        if not user_id:
+            raise HTTPException(status_code=422, detail="Form field 'user_id' is required")
+        return await run_in_threadpool(_store_resume, user_id, upload)
+    finally:
+        upload.close()
+
+@profile_thread
+def _store_resume(user_id: str, upload: SpooledUpload) -> dict:
     # Parse and extract data from resume
-    extracted_data = ResumeService.NLP_pipeline(file)
+    extracted_data = ResumeService.NLP_pipeline(upload)
     
     # Convert lists to comma-separated strings for storage
     skills_str = ", ".join(extracted_data.get("skills", []))
@@ -43,13 +73,13 @@ async def upload_and_store_resume(user_id: str = Form(...), file: UploadFile = F
         "skills": user.skills,
         "experience": user.experience,
         "education": user.education,
+        "resume_sha256": upload.sha256,
         "message": "User profile created/updated successfully"
     }
 
 @router.get("/{user_id}")
 async def get_user(user_id: str):
     """Get user profile by ID."""
-    from fastapi import HTTPException
     user = UserService.get_user_by_id(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -61,11 +91,18 @@ async def get_user(user_id: str):
     }
 
 @router.post("/{user_id}/jobs")
-async def create_job_for_user(user_id: str, job: JobCreate):
+async def create_job_for_user(user_id: str, job: JobCreate, background_tasks: BackgroundTasks):
     """Create a new job posting for a user."""
-    return JobService.create_job(user_id, job)
+    created = JobService.create_job(user_id, job)
+    background_tasks.add_task(JobEnrichmentService.enrich_job_ids, [created.id])
+    return created
 
 @router.get("/{user_id}/jobs")
 async def get_jobs_by_user(user_id: str):
     """Get all jobs posted by a user."""
     return JobService.get_jobs_by_user(user_id)
+
+@router.get("/{user_id}/postings")
+async def get_postings_with_applicants(user_id: str, top: int = Query(5, ge=0, le=500)):
+    """A user's job postings with applicant counts, score summaries and top applicants."""
+    return ApplicationService.get_postings_summary(user_id, top=top)
@@ -1,21 +1,41 @@
+from datetime import datetime
 from typing import List, Optional
 from fastapi import HTTPException
-from models.application import ApplicationSubmit, ApplicationStored
-from core.database import add_application, get_applications_for_user, get_applications_for_job, get_job, get_user, Application
+from sqlalchemy.exc import IntegrityError
+from models.application import ApplicationSubmit, ApplicationBulkSubmit, ApplicationStored
+from core.database import add_application, get_applications_for_user, get_job, get_user, Application
+from core.database import get_top_applications_for_job, get_job_score_stats, get_job_score_histogram, HISTOGRAM_BUCKETS, HISTOGRAM_MAX_SCORE
+from core.database import get_postings_with_applicants, get_jobs_with_user_applications, add_applications
+from core.database import get_user_application, update_application_score
 from utils.semantics import semantics_instance
+from utils.job_features import job_scoring_text, provisional_score, PROVISIONAL_VERSION
+from utils import metrics
+from utils.metrics import timed
+from app.services.refinement import ScoreRefinementService, TIERED
+from app.services.skills import SkillIndexService
+
+APPLICATION_REUSES = metrics.counter(
+    "bmats_application_reuses_total", "Apply requests answered with an existing application.", ("reason",))
 
 class ApplicationService:
     @staticmethod
-    def create_application(application: ApplicationSubmit) -> Application:
+    def create_application(application: ApplicationSubmit, idempotency_key: Optional[str] = None) -> Application:
         """
         Create an application:
         1. Fetch job details from jobId
         2. Fetch user data (skills, experience, education) from userId
-        3. Calculate final score
-        4. Store application
+        3. Return the existing application instead when the request repeats
+           one (same Idempotency-Key, or the same job and an unchanged profile)
+        4. Calculate the score: in tiered mode an instant provisional score
+           that ScoreRefinementService later replaces, else the cross-encoder's
+        5. Store the application, or re-score the existing one in place
+        The score's scored_at is when its inputs were read, so a profile change
+        during scoring leaves it stale (see RescoringService).
         """
+        read_at = datetime.utcnow().isoformat()
         # Get job details
-        job = get_job(application.jobId)
+        with timed("application.fetch"):
+            job = get_job(application.jobId)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
@@ -24,27 +44,154 @@ class ApplicationService:
             raise HTTPException(status_code=400, detail="You cannot apply to your own job posting")
         
         # Get user data
-        user = get_user(application.userId)
+        with timed("application.fetch"):
+            user = get_user(application.userId)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
+
+        with timed("application.fetch"):
+            existing, reason = ApplicationService._existing_application(application, idempotency_key, job, user)
+        if reason:
+            APPLICATION_REUSES.inc(reason=reason)
+            return existing
         
-        # Combine user data into a single string for scoring
-        user_data = f"{user.skills} {user.experience} {user.education}"
-        
-        # Combine job details
-        job_string = f"{job.title} {job.description} {job.requirements}"
-        
-        # Calculate score
-        score = ApplicationService.calculate_final_score(job_string, user_data)
+        if TIERED:
+            with timed("application.score"):
+                score = provisional_score(job, user)
+            model_version = PROVISIONAL_VERSION
+        else:
+            # Combine user data into a single string for scoring
+            user_data = f"{user.skills} {user.experience} {user.education}"
+            
+            # Job side of the scoring input
+            job_string = job_scoring_text(job)
+            
+            # Calculate score
+            with timed("application.score"):
+                score = ApplicationService.calculate_final_score(job_string, user_data)
+            model_version = semantics_instance.version
         
-        # Create application record
-        stored_app = Application(
-            job_id=application.jobId,
-            user_id=application.userId,
-            score=score
+        with timed("application.store"):
+            if existing:
+                # Applied before with an older profile (or job): re-score that application
+                stored_app = update_application_score(existing.id, score, model_version, read_at, TIERED)
+            else:
+                try:
+                    stored_app = add_application(Application(
+                        job_id=application.jobId,
+                        user_id=application.userId,
+                        score=score,
+                        model_version=model_version,
+                        scored_at=read_at,
+                        provisional=TIERED,
+                        idempotency_key=idempotency_key
+                    ))
+                except IntegrityError:
+                    # A concurrent duplicate (double submit, retry) was stored first
+                    existing, _ = ApplicationService._existing_application(application, idempotency_key, job, user)
+                    if not existing:
+                        raise
+                    APPLICATION_REUSES.inc(reason="concurrent")
+                    return existing
+        if TIERED:
+            ScoreRefinementService.enqueue([stored_app.id])
+        return stored_app
+
+    @staticmethod
+    def _existing_application(application: ApplicationSubmit, idempotency_key: Optional[str], job, user):
+        """
+        (existing application or None, reuse reason or None). A reason means the
+        existing application is the answer as is: the request replays an
+        Idempotency-Key, or re-applies with the profile and job unchanged since
+        scoring. Reusing a key for another job is a 422.
+        """
+        if idempotency_key is not None:
+            keyed = get_user_application(application.userId, idempotency_key=idempotency_key)
+            if keyed:
+                if keyed.job_id != application.jobId:
+                    raise HTTPException(status_code=422, detail="Idempotency-Key was already used for another application")
+                return keyed, "idempotency_key"
+        existing = get_user_application(application.userId, job_id=application.jobId)
+        if not existing:
+            return None, None
+        # Same test as the rescoring job's staleness check, minus the model version
+        unchanged = existing.scored_at is not None and all(
+            not changed_at or changed_at <= existing.scored_at
+            for changed_at in (user.profile_updated_at, job.scoring_changed_at)
         )
-        
-        return add_application(stored_app)
+        return existing, "unchanged" if unchanged else None
+
+    @staticmethod
+    def create_applications_bulk(submission: ApplicationBulkSubmit) -> dict:
+        """
+        Apply one user to many jobs:
+        1. Validate every job (and find existing applications) in one query
+        2. Skip repeated ids, unknown jobs, the user's own postings and jobs already applied to
+        3. Score all remaining pairs in one batched cross-encoder pass
+           (tiered mode: provisional scores, refined in the background)
+        4. Store all applications in one transaction
+        """
+        scored_at = datetime.utcnow().isoformat()  # when the scoring inputs were read
+        user = get_user(submission.userId)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        job_ids = list(dict.fromkeys(submission.jobIds))
+        with timed("application.fetch"):
+            found = {job.id: (job, existing_id) for job, existing_id in get_jobs_with_user_applications(job_ids, user.id)}
+
+        skipped = []
+        seen = set()
+        for job_id in submission.jobIds:
+            if job_id in seen:
+                skipped.append({"jobId": job_id, "reason": "duplicate"})
+            seen.add(job_id)
+        jobs = []
+        for job_id in job_ids:
+            if job_id not in found:
+                skipped.append({"jobId": job_id, "reason": "job_not_found"})
+                continue
+            job, existing_id = found[job_id]
+            if job.user_id == user.id:
+                skipped.append({"jobId": job_id, "reason": "own_posting"})
+            elif existing_id:
+                skipped.append({"jobId": job_id, "reason": "already_applied", "applicationId": existing_id})
+            else:
+                jobs.append(job)
+
+        created = []
+        if jobs:
+            with timed("application.score"):
+                if TIERED:
+                    scores = [provisional_score(job, user) for job in jobs]
+                else:
+                    user_data = f"{user.skills} {user.experience} {user.education}"
+                    scores = ApplicationService.calculate_final_scores([(job_scoring_text(job), user_data) for job in jobs])
+            model_version = PROVISIONAL_VERSION if TIERED else semantics_instance.version
+            with timed("application.store"):
+                try:
+                    created = ApplicationService._add_all(user.id, jobs, scores, model_version, scored_at)
+                except IntegrityError:
+                    # Some applications were stored concurrently since the check above
+                    applied = {job.id: existing_id for job, existing_id
+                               in get_jobs_with_user_applications([job.id for job in jobs], user.id) if existing_id}
+                    skipped += [{"jobId": job_id, "reason": "already_applied", "applicationId": existing_id}
+                                for job_id, existing_id in applied.items()]
+                    remaining = [(job, score) for job, score in zip(jobs, scores) if job.id not in applied]
+                    created = ApplicationService._add_all(
+                        user.id, [job for job, _ in remaining], [score for _, score in remaining], model_version, scored_at
+                    )
+            if TIERED:
+                ScoreRefinementService.enqueue([app.id for app in created])
+        return {"created": created, "skipped": skipped}
+
+    @staticmethod
+    def _add_all(user_id: str, jobs: list, scores: List[float], model_version: str, scored_at: str) -> List[Application]:
+        return add_applications([
+            Application(job_id=job.id, user_id=user_id, score=score, model_version=model_version,
+                        scored_at=scored_at, provisional=TIERED)
+            for job, score in zip(jobs, scores)
+        ])
 
     @staticmethod 
     def get_applications_of_user(userId: str) -> List[dict]:
@@ -58,6 +205,7 @@ class ApplicationService:
                 "job_id": app.job_id,
                 "user_id": app.user_id,
                 "score": app.score,
+                "provisional": bool(app.provisional),
                 "job_title": job.title if job else "Unknown",
                 "job_description": job.description if job else "",
                 "job_company": job.company if job else "Unknown",
@@ -66,26 +214,148 @@ class ApplicationService:
         return result
 
     @staticmethod
-    def get_applications_of_job(job_id: str) -> List[dict]:
-        """Get all applications for a specific job with user details."""
-        applications = get_applications_for_job(job_id)
+    def get_applications_of_job(job_id: str, skills: Optional[str] = None, min_skill_overlap: int = 0) -> List[dict]:
+        """
+        Get all applications for a specific job with user details, highest score first.
+        Optionally only applicants having all of `skills` (comma-separated) and at
+        least `min_skill_overlap` of the job's required skills.
+        """
+        # One joined query instead of a get_user() per applicant
+        rows = get_top_applications_for_job(job_id, limit=None)
+        rows, overlaps = ApplicationService._filter_by_skills(job_id, rows, skills, min_skill_overlap)
+        return [ApplicationService._applicant(app, user, overlaps) for app, user in rows]
+
+    @staticmethod
+    def _filter_by_skills(job_id: str, rows: list, skills: Optional[str], min_skill_overlap: int):
+        """(rows, {user id: skill overlap}) narrowed by the skill filters; overlaps is None without filters."""
+        if not skills and min_skill_overlap <= 0:
+            return rows, None
+        job = get_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        with timed("applications.skill_filter"):
+            matching = SkillIndexService.filter_users(job, skills, min_skill_overlap)
+        if matching is None:
+            return rows, None
+        return [(app, user) for app, user in rows if app.user_id in matching], matching
+
+    @staticmethod
+    def get_postings_summary(user_id: str, top: int = 5) -> List[dict]:
+        """
+        A poster's jobs, each with its applicant count, score summary and
+        top-`top` applicants (what TrackPostings needs in one request).
+        """
+        jobs, aggregates, applicants = get_postings_with_applicants(user_id, top=top)
         result = []
-        for app in applications:
-            user = get_user(app.user_id)
+        for job in jobs:
+            stats = aggregates.get(job.id)
+            count = stats.count if stats else 0
+            mean = stats.score_sum / count if count else None
             result.append({
-                "id": app.id,
-                "job_id": app.job_id,
-                "user_id": app.user_id,
-                "score": app.score,
-                "user_email": user.email if user else "Unknown",
-                "user_skills": user.skills if user else "",
-                "user_experience": user.experience if user else "",
-                "user_education": user.education if user else ""
+                "id": job.id,
+                "user_id": job.user_id,
+                "title": job.title,
+                "company": job.company,
+                "description": job.description,
+                "requirements": job.requirements,
+                "location": job.location,
+                "date_posted": job.date_posted,
+                "application_count": count,
+                "score_summary": {
+                    "mean": round(mean, 4) if count else None,
+                    "std": round(max(stats.score_sq_sum / count - mean * mean, 0.0) ** 0.5, 4) if count else None,
+                    "min": stats.min_score if count else None,
+                    "max": stats.max_score if count else None
+                },
+                "top_applicants": [
+                    ApplicationService._applicant(app, user) for app, user in applicants.get(job.id, [])
+                ]
             })
-        # Sort by score descending (highest score first)
-        result.sort(key=lambda x: x["score"], reverse=True)
         return result
 
+    @staticmethod
+    def _applicant(app: Application, user, overlaps: Optional[dict] = None) -> dict:
+        applicant = {
+            "id": app.id,
+            "job_id": app.job_id,
+            "user_id": app.user_id,
+            "score": app.score,
+            "provisional": bool(app.provisional),
+            "user_email": user.email if user else "Unknown",
+            "user_skills": user.skills if user else "",
+            "user_experience": user.experience if user else "",
+            "user_education": user.education if user else ""
+        }
+        if overlaps is not None:
+            applicant["skill_overlap"] = overlaps.get(app.user_id, 0)
+        return applicant
+
+    @staticmethod
+    def get_leaderboard(job_id: str, limit: int = 20, min_score: Optional[float] = None,
+                        skills: Optional[str] = None, min_skill_overlap: int = 0) -> dict:
+        """
+        Ranked applicants for a job plus score statistics.
+        Top-N / threshold rows come straight from the (job_id, score) index and
+        the statistics from the incrementally maintained aggregates. With skill
+        filters, ranks are among the matching applicants; the statistics stay job-wide.
+        """
+        filtered = bool(skills) or min_skill_overlap > 0
+        rows = get_top_applications_for_job(job_id, limit=None if filtered else limit, min_score=min_score)
+        rows, overlaps = ApplicationService._filter_by_skills(job_id, rows, skills, min_skill_overlap)
+        applicants = [
+            {"rank": rank, **ApplicationService._applicant(app, user, overlaps)}
+            for rank, (app, user) in enumerate(rows[:limit], start=1)
+        ]
+        return {
+            "job_id": job_id,
+            "stats": ApplicationService.get_score_stats(job_id),
+            "applicants": applicants
+        }
+
+    @staticmethod
+    def get_score_stats(job_id: str) -> dict:
+        """Count, mean, spread, percentiles and histogram of a job's application scores."""
+        stats = get_job_score_stats(job_id)
+        if not stats or stats.count == 0:
+            return {"count": 0, "mean": None, "std": None, "min": None, "max": None,
+                    "percentiles": {}, "histogram": [0] * HISTOGRAM_BUCKETS}
+
+        histogram = get_job_score_histogram(job_id)
+        mean = stats.score_sum / stats.count
+        variance = max(stats.score_sq_sum / stats.count - mean * mean, 0.0)
+        percentiles = {
+            f"p{p}": ApplicationService._histogram_percentile(histogram, p, stats.min_score, stats.max_score)
+            for p in (25, 50, 75, 90, 95)
+        }
+        return {
+            "count": stats.count,
+            "mean": round(mean, 4),
+            "std": round(variance ** 0.5, 4),
+            "min": stats.min_score,
+            "max": stats.max_score,
+            "percentiles": percentiles,
+            "histogram": histogram
+        }
+
+    @staticmethod
+    def _histogram_percentile(histogram: List[int], percentile: float, lo: float, hi: float) -> float:
+        """Estimates a percentile by linear interpolation inside the matching bucket."""
+        total = sum(histogram)
+        target = total * percentile / 100
+        width = HISTOGRAM_MAX_SCORE / len(histogram)
+        seen = 0
+        for i, count in enumerate(histogram):
+            if count and seen + count >= target:
+                estimate = (i + (target - seen) / count) * width
+                # Clamp to observed range (also covers scores clamped into edge buckets)
+                return round(min(max(estimate, lo), hi), 4)
+            seen += count
+        return round(hi, 4)
+
     @staticmethod 
     def calculate_final_score(job_string: str, user_data: str) -> float:
-        return semantics_instance.get_final_score(job_string, user_data)
\ No newline at end of file
+        return semantics_instance.get_final_score(job_string, user_data)
+
+    @staticmethod
+    def calculate_final_scores(pairs: List[tuple]) -> List[float]:
+        return semantics_instance.get_final_scores(pairs)
\ No newline at end of file
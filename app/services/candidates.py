@@ -0,0 +1,112 @@
+import os
+import threading
+from typing import Optional
+from fastapi import HTTPException
+from core.database import get_job, get_user_profiles, get_users_by_ids, get_applicant_ids
+from app.services.users import ProfileChangeFeed
+from app.services.skills import SkillIndexService
+from utils.lexical import BM25Index, profile_terms, job_terms
+from utils.semantics import semantics_instance
+from utils.job_features import job_scoring_text
+from utils.metrics import timed
+
+# Profiles retrieved lexically and then cross-encoded per search
+RERANK_K = int(os.getenv("BMATS_CANDIDATE_RERANK_K", "100"))
+
+class CandidateSearchService:
+    """
+    Finds strong candidates for a job among all users, not only applicants:
+    BM25 over every profile (utils/lexical.py) narrows the field to the top K,
+    and only those K are scored with the cross-encoder.
+
+    The index lives in each worker process and follows the user table through
+    User.profile_updated_at: every search first applies the profiles changed
+    since the last sync, so uploads handled by any worker are picked up.
+    Profiles written without a profile_updated_at (fixture seeding at startup)
+    only enter through a full build.
+    """
+
+    index = BM25Index()
+    _sync_lock = threading.Lock()
+    _built = False
+    _feed = ProfileChangeFeed()
+
+    @staticmethod
+    def sync():
+        """Builds the index on first use (or when too many rows are dead), otherwise applies changed profiles."""
+        cls = CandidateSearchService
+        with cls._sync_lock:
+            if not cls._built or cls.index.needs_rebuild():
+                rows = get_user_profiles()
+                cls.index.build(
+                    (user_id, profile_terms(skills, experience, education))
+                    for user_id, skills, experience, education, _ in rows
+                )
+                cls._feed.reset((row[0], row[4]) for row in rows)
+                cls._built = True
+                print(f"CANDIDATES: indexed {cls.index.size} profiles")
+                return
+
+            for user_id, skills, experience, education, updated_at in get_user_profiles(changed_since=cls._feed.since()):
+                if cls._feed.mark(user_id, updated_at):
+                    cls.index.upsert(user_id, profile_terms(skills, experience, education))
+
+    @staticmethod
+    def warm():
+        """Builds the index on a background thread so the first search doesn't pay for it."""
+        threading.Thread(target=CandidateSearchService.sync, name="candidate-index", daemon=True).start()
+
+    @staticmethod
+    def search(job_id: str, limit: int = 20, k: int = RERANK_K,
+               skills: Optional[str] = None, min_skill_overlap: int = 0) -> dict:
+        """
+        Top `limit` candidates for the job: BM25 top-`k` over all profiles
+        (excluding the poster), re-ranked by the cross-encoder score. The skill
+        filters (SkillIndexService.filter_users) narrow the profiles first.
+        """
+        job = get_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        with timed("candidates.sync"):
+            CandidateSearchService.sync()
+        with timed("candidates.skill_filter"):
+            matching = SkillIndexService.filter_users(job, skills, min_skill_overlap)
+        job_text = job_scoring_text(job)
+        with timed("candidates.retrieve"):
+            hits = CandidateSearchService.index.search(
+                job_terms(job_text, job.required_skills), k, exclude={job.user_id}, include=matching
+            )
+        if not hits:
+            return {"job_id": job_id, "profiles_indexed": CandidateSearchService.index.size, "retrieved": 0, "candidates": []}
+
+        ids = [user_id for user_id, _ in hits]
+        users = {user.id: user for user in get_users_by_ids(ids)}
+        applied = set(get_applicant_ids(job_id, ids))
+        overlaps = matching if matching is not None else SkillIndexService.overlap(job, ids)
+        ranked = [(users[user_id], lexical) for user_id, lexical in hits if user_id in users]
+        with timed("candidates.rerank"):
+            scores = semantics_instance.get_final_scores(
+                [(job_text, f"{user.skills} {user.experience} {user.education}") for user, _ in ranked]
+            )
+
+        candidates = [
+            {
+                "user_id": user.id,
+                "score": score,
+                "lexical_score": round(lexical, 4),
+                "applied": user.id in applied,
+                "skill_overlap": overlaps.get(user.id, 0),
+                "user_skills": user.skills,
+                "user_experience": user.experience,
+                "user_education": user.education
+            }
+            for (user, lexical), score in zip(ranked, scores)
+        ]
+        candidates.sort(key=lambda candidate: candidate["score"], reverse=True)
+        return {
+            "job_id": job_id,
+            "profiles_indexed": CandidateSearchService.index.size,
+            "retrieved": len(ranked),
+            "candidates": candidates[:limit]
+        }
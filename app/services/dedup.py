@@ -0,0 +1,87 @@
+import os
+from typing import Optional, Tuple
+from sqlalchemy import tuple_, delete
+from sqlmodel import Session, select
+from core.database import Job, JobFingerprintBand, engine, invalidate_job_cache
+from utils import fingerprint
+
+# Estimated Jaccard similarity at which a posting is linked to an existing one
+LINK_THRESHOLD = float(os.getenv("BMATS_DEDUP_LINK_THRESHOLD", "0.8"))
+# ...and at which the ETL drops it entirely (set above 1 to always link instead)
+SUPPRESS_THRESHOLD = float(os.getenv("BMATS_DEDUP_SUPPRESS_THRESHOLD", "0.95"))
+
+class JobDedupService:
+
+    @staticmethod
+    def find_duplicate(session: Session, signature, exclude_id: Optional[str] = None) -> Optional[Tuple[str, float]]:
+        """
+        Looks up LSH candidates sharing any band bucket with `signature` and
+        returns (canonical job id, similarity) of the best one at or above
+        LINK_THRESHOLD.
+        """
+        buckets = fingerprint.band_buckets(signature)
+        keys = list(enumerate(buckets))
+        candidate_ids = set(session.exec(
+            select(JobFingerprintBand.job_id).where(
+                tuple_(JobFingerprintBand.band, JobFingerprintBand.bucket).in_(keys)
+            )
+        ).all())
+        candidate_ids.discard(exclude_id)
+        if not candidate_ids:
+            return None
+
+        best = None
+        for job_id, encoded in session.exec(select(Job.id, Job.minhash).where(Job.id.in_(candidate_ids))).all():
+            if not encoded:
+                continue
+            score = fingerprint.similarity(signature, fingerprint.decode(encoded))
+            if score >= LINK_THRESHOLD and (best is None or score > best[1]):
+                best = (job_id, score)
+        return best
+
+    @staticmethod
+    def fingerprint_job(session: Session, job: Job, allow_suppress: bool = False) -> bool:
+        """
+        Computes the job's MinHash and either links it to an existing
+        near-duplicate (sets duplicate_of) or registers it in the LSH index as
+        a canonical job. Returns False when the job should be suppressed
+        (only when `allow_suppress` and similarity >= SUPPRESS_THRESHOLD).
+        The caller adds/commits the job.
+        """
+        if job.minhash:
+            # Re-fingerprinting after a content change: drop the old buckets
+            session.exec(delete(JobFingerprintBand).where(JobFingerprintBand.job_id == job.id))
+        signature = fingerprint.minhash(fingerprint.job_fingerprint_text(job.title, job.company, job.description))
+        job.minhash = fingerprint.encode(signature)
+        match = JobDedupService.find_duplicate(session, signature, exclude_id=job.id)
+        if match:
+            canonical_id, score = match
+            if allow_suppress and score >= SUPPRESS_THRESHOLD:
+                return False
+            job.duplicate_of = canonical_id
+            return True
+
+        job.duplicate_of = None
+        for band, bucket in enumerate(fingerprint.band_buckets(signature)):
+            session.add(JobFingerprintBand(band=band, bucket=bucket, job_id=job.id))
+        return True
+
+    @staticmethod
+    def backfill(batch_size: int = 500) -> int:
+        """Fingerprints jobs stored before fingerprinting existed."""
+        total = 0
+        while True:
+            with Session(engine) as session:
+                jobs = session.exec(select(Job).where(Job.minhash == None).limit(batch_size)).all()
+                if not jobs:
+                    break
+                for job in jobs:
+                    JobDedupService.fingerprint_job(session, job)
+                    session.add(job)
+                    # Make this job's bands visible to the next one in the batch
+                    session.flush()
+                session.commit()
+                total += len(jobs)
+        if total:
+            invalidate_job_cache()
+        return total
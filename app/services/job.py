@@ -1,12 +1,17 @@
 from typing import List, Optional
 from models.job import Job, JobCreate
 from core.database import add_job, get_job, get_all_jobs, search_jobs as db_search_jobs
-from core.database import Job as DBJob, Session, engine, select
+from core.database import Job as DBJob, Session, engine, select, invalidate_job_cache
+from app.services.dedup import JobDedupService
 
 class JobService:
     @staticmethod
     def create_job(user_id: str, data: JobCreate) -> DBJob:
-        """Creates a new job posting for a user."""
+        """
+        Creates a new job posting for a user. A near-duplicate of an existing
+        posting is linked via duplicate_of but never suppressed or hidden
+        from the job list; that is reserved for ETL-loaded copies.
+        """
         job = DBJob(
             user_id=user_id,
             title=data.title,
@@ -14,7 +19,13 @@ class JobService:
             description=data.description,
             requirements=data.requirements
         )
-        return add_job(job)
+        with Session(engine) as session:
+            JobDedupService.fingerprint_job(session, job, allow_suppress=False)
+            session.add(job)
+            session.commit()
+            session.refresh(job)
+        invalidate_job_cache(job.id)
+        return job
 
     @staticmethod
     def get_all_jobs() -> List[DBJob]:
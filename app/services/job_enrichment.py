@@ -0,0 +1,42 @@
+from typing import List
+from sqlmodel import Session, select
+from core.database import Job, engine, invalidate_job_cache
+from utils.job_features import enrich_job
+
+class JobEnrichmentService:
+
+    @staticmethod
+    def enrich_job_ids(job_ids: List[str]) -> int:
+        """
+        Enriches the given jobs in one transaction. Meant to run as a
+        background task after single job creates.
+        """
+        if not job_ids:
+            return 0
+        with Session(engine) as session:
+            jobs = session.exec(select(Job).where(Job.id.in_(job_ids))).all()
+            for job in jobs:
+                enrich_job(job)
+                session.add(job)
+            session.commit()
+        for job_id in job_ids:
+            invalidate_job_cache(job_id)
+        return len(jobs)
+
+    @staticmethod
+    def backfill(batch_size: int = 500) -> int:
+        """Enriches every job that has no required skills yet, in batches."""
+        total = 0
+        while True:
+            with Session(engine) as session:
+                jobs = session.exec(select(Job).where(Job.required_skills == None).limit(batch_size)).all()
+                if not jobs:
+                    break
+                for job in jobs:
+                    enrich_job(job)
+                    session.add(job)
+                session.commit()
+                total += len(jobs)
+        if total:
+            invalidate_job_cache()
+        return total
@@ -0,0 +1,107 @@
+import os
+import queue
+import socket
+import threading
+import traceback
+import uuid
+from datetime import datetime
+from typing import List
+from core.database import acquire_lease, get_provisional_applications, save_refined_scores
+from utils import metrics
+from utils.semantics import semantics_instance
+from utils.job_features import job_scoring_text
+
+# sync: score with the cross-encoder before responding (default);
+# tiered: store an instant skill-overlap score and refine it in the background
+SCORING_MODE = os.getenv("BMATS_SCORING_MODE", "sync")
+TIERED = SCORING_MODE == "tiered"
+BATCH_SIZE = int(os.getenv("BMATS_REFINE_BATCH_SIZE", "32"))
+# How long the worker waits for more ids to fill a batch
+BATCH_WAIT = float(os.getenv("BMATS_REFINE_BATCH_WAIT", "0.05"))
+RECOVERY_LEASE = "refine-recovery"
+
+class ScoreRefinementService:
+    """
+    Replaces provisional application scores with cross-encoder scores on a
+    background thread, in batches. Each worker process refines what it
+    created; at startup one process (by lease) re-queues provisional rows left
+    behind by a restart. Rows are only updated while still provisional, and
+    the rescoring job treats them as stale as a last resort.
+    """
+
+    _queue: "queue.Queue[str]" = queue.Queue()
+    _thread = None
+    _start_lock = threading.Lock()
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    @staticmethod
+    def enqueue(application_ids: List[str]):
+        ScoreRefinementService._ensure_worker()
+        for application_id in application_ids:
+            ScoreRefinementService._queue.put(application_id)
+
+    @staticmethod
+    def backlog() -> int:
+        return ScoreRefinementService._queue.qsize()
+
+    @staticmethod
+    def requeue_pending():
+        """Startup hook: queues provisional rows a previous process did not get to."""
+        if not acquire_lease(RECOVERY_LEASE, ScoreRefinementService.owner, 60.0):
+            return
+        pending = [app.id for app, _, _ in get_provisional_applications()]
+        if pending:
+            print(f"REFINEMENT: re-queued {len(pending)} provisional scores")
+            ScoreRefinementService.enqueue(pending)
+
+    @staticmethod
+    def _ensure_worker():
+        with ScoreRefinementService._start_lock:
+            if ScoreRefinementService._thread is None or not ScoreRefinementService._thread.is_alive():
+                ScoreRefinementService._thread = threading.Thread(
+                    target=ScoreRefinementService._run, name="score-refinement", daemon=True
+                )
+                ScoreRefinementService._thread.start()
+
+    @staticmethod
+    def _next_batch() -> List[str]:
+        ids = [ScoreRefinementService._queue.get()]
+        try:
+            while len(ids) < BATCH_SIZE:
+                ids.append(ScoreRefinementService._queue.get(timeout=BATCH_WAIT))
+        except queue.Empty:
+            pass
+        return ids
+
+    @staticmethod
+    def _run():
+        while True:
+            ids = ScoreRefinementService._next_batch()
+            try:
+                ScoreRefinementService.refine(ids)
+            except Exception:
+                # Rows stay provisional; they are re-queued at the next startup
+                traceback.print_exc()
+
+    @staticmethod
+    def refine(application_ids: List[str]) -> int:
+        """Scores the still-provisional applications among the ids with the cross-encoder."""
+        read_at = datetime.utcnow().isoformat()
+        rows = get_provisional_applications(application_ids)
+        if not rows:
+            return 0
+        with metrics.timed("refine.batch"):
+            scores = semantics_instance.get_final_scores([
+                (job_scoring_text(job), f"{user.skills} {user.experience} {user.education}")
+                for _, job, user in rows
+            ])
+            return save_refined_scores(
+                [(app.id, score, app.scored_at) for (app, _, _), score in zip(rows, scores)],
+                semantics_instance.version, read_at
+            )
+
+metrics.register_collector(lambda: [
+    "# HELP bmats_refine_backlog Provisional scores waiting for refinement in this process.",
+    "# TYPE bmats_refine_backlog gauge",
+    f"bmats_refine_backlog {ScoreRefinementService.backlog()}",
+])
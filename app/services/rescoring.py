@@ -0,0 +1,140 @@
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+from fastapi import HTTPException
+from sqlmodel import Session, select
+from core.database import (
+    engine, RescoreRun, Lease, acquire_lease, release_lease,
+    count_stale_applications, get_stale_application_batch, save_rescored_batch
+)
+from utils.semantics import semantics_instance
+from utils.job_features import job_scoring_text
+
+# Applications scored per checkpoint; jobs are never split across batches
+BATCH_SIZE = int(os.getenv("BMATS_RESCORE_BATCH_SIZE", "256"))
+LEASE_NAME = "rescore"
+LEASE_TTL = 120.0
+
+class RescoringService:
+    """
+    Recomputes stale Application scores (see core.database._stale_application_condition)
+    on a background thread. Each batch covers whole jobs so the job-side text is
+    built once per job, is scored in one batched forward pass, and is committed
+    together with the run's checkpoint. A lease keeps one run active across
+    workers; a run left "running" by a crashed process is picked up again by the
+    next start() (or at startup) once its lease expires.
+    """
+
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    @staticmethod
+    def start(batch_size: int = BATCH_SIZE) -> RescoreRun:
+        """Resumes the interrupted run for the current model version, or starts a new one."""
+        if not acquire_lease(LEASE_NAME, RescoringService.owner, LEASE_TTL):
+            raise HTTPException(status_code=409, detail="A rescoring run is already in progress")
+        try:
+            run = RescoringService._resume_or_create()
+        except Exception:
+            release_lease(LEASE_NAME, RescoringService.owner)
+            raise
+        threading.Thread(
+            target=RescoringService._run, args=(run.id, batch_size), name="rescoring", daemon=True
+        ).start()
+        return run
+
+    @staticmethod
+    def resume_interrupted():
+        """Startup hook: continues a run a crashed process left behind, if its lease has expired."""
+        with Session(engine) as session:
+            unfinished = session.exec(select(RescoreRun).where(RescoreRun.status == "running")).first()
+        if unfinished:
+            try:
+                RescoringService.start()
+                print(f"RESCORING: resuming run {unfinished.id}")
+            except HTTPException:
+                pass
+
+    @staticmethod
+    def _resume_or_create() -> RescoreRun:
+        version = semantics_instance.version
+        now = datetime.utcnow().isoformat()
+        with Session(engine) as session:
+            resumed = None
+            for run in session.exec(select(RescoreRun).where(RescoreRun.status == "running")).all():
+                if run.model_version == version and resumed is None:
+                    resumed = run
+                else:
+                    run.status = "failed"
+                    run.error = "Superseded by a newer scoring model version"
+                    run.finished_at = now
+                session.add(run)
+            if resumed is None:
+                resumed = RescoreRun(model_version=version, started_at=now,
+                                     total=count_stale_applications(version))
+            resumed.owner = RescoringService.owner
+            resumed.updated_at = now
+            session.add(resumed)
+            session.commit()
+            session.refresh(resumed)
+            return resumed
+
+    @staticmethod
+    def _run(run_id: int, batch_size: int):
+        version = semantics_instance.version
+        status, error = "completed", None
+        try:
+            with Session(engine) as session:
+                cursor = session.get(RescoreRun, run_id).cursor_job_id
+            while True:
+                read_at = datetime.utcnow().isoformat()
+                batch = get_stale_application_batch(version, cursor, batch_size)
+                if not batch:
+                    break
+                rows_read, pairs = [], []
+                for job, rows in batch:
+                    job_text = job_scoring_text(job)
+                    for app, user in rows:
+                        rows_read.append((app.id, app.scored_at))
+                        pairs.append((job_text, f"{user.skills} {user.experience} {user.education}"))
+                scores = semantics_instance.get_final_scores(pairs)
+                cursor = batch[-1][0].id
+                run = save_rescored_batch(
+                    run_id, [(app_id, score, scored_at) for (app_id, scored_at), score in zip(rows_read, scores)],
+                    version, read_at, cursor
+                )
+                print(f"RESCORING: run {run_id} {run.processed}/{run.total} applications")
+                if not acquire_lease(LEASE_NAME, RescoringService.owner, LEASE_TTL):
+                    # Someone else took over (our lease expired); stop without finishing the run
+                    return
+        except Exception as e:
+            status, error = "failed", f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+
+        with Session(engine) as session:
+            run = session.get(RescoreRun, run_id)
+            run.status = status
+            run.error = error
+            run.finished_at = run.updated_at = datetime.utcnow().isoformat()
+            session.add(run)
+            session.commit()
+        release_lease(LEASE_NAME, RescoringService.owner)
+
+    @staticmethod
+    def progress() -> dict:
+        """Latest run, its checkpoint and how many applications are still stale."""
+        version = semantics_instance.version
+        with Session(engine) as session:
+            run = session.exec(select(RescoreRun).order_by(RescoreRun.id.desc())).first()
+            lease = session.get(Lease, LEASE_NAME)
+        active = bool(lease and lease.expires_at > time.time())
+        return {
+            "model_version": version,
+            "active": active,
+            "stale_remaining": count_stale_applications(version),
+            "percent": round(100 * run.processed / run.total, 1) if run and run.total else None,
+            "run": run
+        }
@@ -0,0 +1,105 @@
+import threading
+from typing import Dict, List, Optional
+from sqlalchemy import exists
+from sqlmodel import Session, select
+from core.database import User, UserSkill, engine, get_skill_dictionary, get_user_skill_ids, set_user_skills
+from app.services.users import ProfileChangeFeed
+from utils.job_features import job_scoring_text
+from utils.skill_index import SkillBitsetIndex
+from utils.skills import extract_skills, normalize_skills
+
+class SkillIndexService:
+    """
+    Skill filters over user profiles, backed by the normalized Skill/UserSkill
+    tables and an in-memory bitset per skill (utils/skill_index.py).
+
+    Like the candidate index, it lives in each worker process and follows the
+    user table through User.profile_updated_at before every filter.
+    """
+
+    index = SkillBitsetIndex()
+    _sync_lock = threading.Lock()
+    _built = False
+    _feed = ProfileChangeFeed()
+    _dictionary: Dict[str, int] = {}
+    # Cleared while warm() backfills, so the first build includes the backfilled users
+    _backfilled = threading.Event()
+    _backfilled.set()
+
+    @staticmethod
+    def sync():
+        """Builds the index on first use (after any backfill), otherwise applies changed profiles."""
+        cls = SkillIndexService
+        cls._backfilled.wait()
+        with cls._sync_lock:
+            if not cls._built:
+                rows = get_user_skill_ids()
+                cls.index.build((user_id, skill_ids) for user_id, skill_ids, _ in rows)
+                cls._feed.reset((user_id, updated_at) for user_id, _, updated_at in rows)
+                cls._built = True
+                print(f"SKILLS: indexed {cls.index.size} profiles")
+                return
+            for user_id, skill_ids, updated_at in get_user_skill_ids(changed_since=cls._feed.since()):
+                if cls._feed.mark(user_id, updated_at):
+                    cls.index.upsert(user_id, skill_ids)
+
+    @staticmethod
+    def backfill(batch_size: int = 500) -> int:
+        """Creates the normalized skill rows of users stored before they existed, in batches."""
+        with Session(engine) as session:
+            missing = session.exec(
+                select(User.id, User.skills)
+                .where(User.skills != "", ~exists().where(UserSkill.user_id == User.id))
+            ).all()
+        for start in range(0, len(missing), batch_size):
+            with Session(engine) as session:
+                for user_id, skills in missing[start:start + batch_size]:
+                    set_user_skills(session, user_id, skills)
+                session.commit()
+        return len(missing)
+
+    @staticmethod
+    def warm():
+        """Backfills and builds the index on a background thread."""
+        def run():
+            try:
+                SkillIndexService.backfill()
+            finally:
+                SkillIndexService._backfilled.set()
+            SkillIndexService.sync()
+        SkillIndexService._backfilled.clear()
+        threading.Thread(target=run, name="skill-index", daemon=True).start()
+
+    @staticmethod
+    def skill_ids(names) -> List[Optional[int]]:
+        """Ids of the skills (names or a comma-joined string); None for skills nobody has."""
+        names = normalize_skills(names)
+        if any(name not in SkillIndexService._dictionary for name in names):
+            SkillIndexService._dictionary = get_skill_dictionary()
+        return [SkillIndexService._dictionary.get(name) for name in names]
+
+    @staticmethod
+    def job_skills(job) -> List[str]:
+        """The job's required skills (precomputed, else matched in its text)."""
+        return normalize_skills(job.required_skills or extract_skills(job_scoring_text(job)))
+
+    @staticmethod
+    def filter_users(job, skills: Optional[str] = None, min_overlap: int = 0) -> Optional[Dict[str, int]]:
+        """
+        Users having all of `skills` and at least `min_overlap` of the job's
+        required skills, mapped to that overlap; None when no filter is given.
+        """
+        if not normalize_skills(skills or "") and min_overlap <= 0:
+            return None
+        SkillIndexService.sync()
+        return SkillIndexService.index.matching(
+            SkillIndexService.skill_ids(skills or ""),
+            SkillIndexService.skill_ids(SkillIndexService.job_skills(job)),
+            min_overlap
+        )
+
+    @staticmethod
+    def overlap(job, user_ids: List[str]) -> Dict[str, int]:
+        """How many of the job's required skills each user has."""
+        SkillIndexService.sync()
+        return SkillIndexService.index.overlap_counts(user_ids, SkillIndexService.skill_ids(SkillIndexService.job_skills(job)))
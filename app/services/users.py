@@ -1,11 +1,45 @@
 """
 User service to store and manage user profiles in database
 """
-from typing import Optional
-from core.database import User, add_user, get_user, get_user_by_email
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+from core.database import User, add_user, get_user, get_user_by_email, invalidate_user_cache, set_user_skills
 from sqlmodel import Session
 from core.database import engine
 
+# Re-read profiles changed this long before the watermark, in case a slower
+# transaction committed an older timestamp after the last sync
+SYNC_OVERLAP = timedelta(seconds=5)
+
+class ProfileChangeFeed:
+    """
+    Tracks which profile versions (User.profile_updated_at) an in-memory index
+    has applied, so it can follow the user table incrementally: query the rows
+    changed after since(), and apply those for which mark() returns True.
+    """
+
+    def __init__(self):
+        self.reset([])
+
+    def reset(self, versions: Iterable[Tuple[str, Optional[str]]]):
+        """Starts over from a full build that applied these (user id, profile_updated_at)."""
+        self._applied: Dict[str, Optional[str]] = dict(versions)
+        self._watermark = max((updated_at for updated_at in self._applied.values() if updated_at), default=None)
+
+    def since(self) -> str:
+        if not self._watermark:
+            return ""
+        return (datetime.fromisoformat(self._watermark) - SYNC_OVERLAP).isoformat()
+
+    def mark(self, user_id: str, updated_at: Optional[str]) -> bool:
+        """Records the version; False if it was applied already."""
+        if self._applied.get(user_id) == updated_at:
+            return False
+        self._applied[user_id] = updated_at
+        if updated_at and (self._watermark is None or updated_at > self._watermark):
+            self._watermark = updated_at
+        return True
+
 class UserService:
 
     @staticmethod
@@ -34,6 +68,7 @@ class UserService:
         Create or update a user profile:
         - If user doesn't exist, create new user with provided ID
         - If user exists, update their skills, experience, education
+        The normalized skill rows are replaced in the same transaction.
         """
         with Session(engine) as session:
             existing_user = session.get(User, user_id)
@@ -43,9 +78,13 @@ class UserService:
                 existing_user.skills = skills
                 existing_user.experience = experience
                 existing_user.education = education
+                # Makes this user's existing application scores stale (see RescoringService)
+                existing_user.profile_updated_at = datetime.utcnow().isoformat()
                 session.add(existing_user)
+                set_user_skills(session, user_id, skills)
                 session.commit()
                 session.refresh(existing_user)
+                invalidate_user_cache(user_id)
                 return existing_user
             else:
                 # Create new user with provided ID
@@ -53,9 +92,13 @@ class UserService:
                     id=user_id,
                     skills=skills,
                     experience=experience,
-                    education=education
+                    education=education,
+                    profile_updated_at=datetime.utcnow().isoformat()
                 )
                 session.add(new_user)
+                session.flush()
+                set_user_skills(session, user_id, skills)
                 session.commit()
                 session.refresh(new_user)
+                invalidate_user_cache(user_id)
                 return new_user
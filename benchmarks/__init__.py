@@ -0,0 +1,7 @@
+"""
+Micro-benchmarks for the resume pipeline, scoring and database queries.
+
+    python -m benchmarks run --out baseline.json
+    python -m benchmarks run --baseline baseline.json --threshold 0.2   # exits 1 on regression
+    python -m benchmarks compare baseline.json current.json
+"""
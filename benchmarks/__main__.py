@@ -0,0 +1,41 @@
+import argparse
+import os
+import sys
+import tempfile
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run or compare micro-benchmarks.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="Run the suite")
+    run_parser.add_argument("--filter", help="Only run benchmarks whose name contains this string")
+    run_parser.add_argument("--repeat", type=int, default=20)
+    run_parser.add_argument("--out", help="Write results as JSON")
+    run_parser.add_argument("--baseline", help="Compare against a previous --out file")
+    run_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative median slowdown")
+    run_parser.add_argument("--database", help="Database URL (default: a throwaway SQLite file)")
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        # Never benchmark against (and write into) the development database
+        os.environ["BMATS_DATABASE_URL"] = args.database or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+    from benchmarks import suite
+
+    if args.command == "run":
+        current = suite.run(args.filter, args.repeat)
+        if args.out:
+            suite.save(current, args.out)
+        if not args.baseline:
+            sys.exit(0)
+        baseline = suite.load(args.baseline)
+    else:
+        baseline, current = suite.load(args.baseline), suite.load(args.current)
+
+    regressions = suite.compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
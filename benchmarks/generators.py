@@ -0,0 +1,150 @@
+"""
+Deterministic synthetic inputs: resume PDFs and job postings.
+
+Everything is derived from a seed, so two runs (or two machines) benchmark
+exactly the same bytes.
+"""
+import random
+import uuid
+from typing import List
+from core.database import Job, User
+from utils.skills import TECH_SKILLS
+
+FIRST_NAMES = ["Alice", "Jordan", "Priya", "Wei", "Carlos", "Fatima", "Noah", "Emma", "Liam", "Sofia"]
+LAST_NAMES = ["Nguyen", "Smith", "Patel", "Garcia", "Kim", "Okafor", "Muller", "Rossi", "Cohen", "Tanaka"]
+COMPANIES = ["Nokia", "Shopify", "Google DeepMind", "Amazon", "Microsoft", "Stripe", "Wealthsimple", "Cohere"]
+TITLES = ["Software Developer Intern", "Backend Engineering Intern", "Machine Learning Co-op",
+          "Data Engineering Intern", "Frontend Developer Co-op", "Site Reliability Intern"]
+LOCATIONS = ["Hybrid in Ottawa Office", "Remote (Canada)", "Hybrid in Toronto Office", "On-site in Waterloo"]
+SCHOOLS = ["University of Calgary", "University of Waterloo", "McGill University", "University of Toronto"]
+JOB_VERBS = ["build", "design", "implement", "optimize", "deploy", "maintain", "test", "automate"]
+VERBS = ["Engineered", "Developed", "Built", "Implemented", "Designed", "Optimized", "Deployed", "Automated"]
+OBJECTS = ["a data pipeline", "inference microservices", "a REST API", "a caching layer",
+           "a React dashboard", "CI/CD workflows", "a recommendation model", "monitoring alerts"]
+OUTCOMES = ["reducing latency by {n}%", "cutting costs by {n}%", "serving {n}k daily users",
+            "improving accuracy by {n}%", "reducing maintenance time by {n}%"]
+FILLER = ["Collaborated with designers and testers on sprint planning and code reviews.",
+          "Participated in daily standups, retrospectives and design discussions.",
+          "Mentored new team members and documented internal tooling."]
+
+LINES_PER_PAGE = 50
+_SKILLS = sorted(TECH_SKILLS)
+
+def _pii_line(rng: random.Random) -> str:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return f"Reference: {first} {last}, {first.lower()}.{last.lower()}@example.com"
+    if kind == 1:
+        return f"Contact {first} {last} at ({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}"
+    return f"Worked alongside {first} {last} and {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+def _experience_line(rng: random.Random) -> str:
+    skills = ", ".join(rng.sample(_SKILLS, 2))
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 60))
+    return f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {skills} {outcome}."
+
+def resume_lines(pages: int = 1, pii_density: float = 0.1, seed: int = 0) -> List[str]:
+    """
+    Text lines of a synthetic resume filling `pages` pages; `pii_density` is
+    the fraction of body lines carrying a name, email or phone number.
+    """
+    rng = random.Random(seed)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | ({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        "Education",
+        f"{rng.choice(SCHOOLS)}, Bachelor of Science in Computer Science",
+        "Skills",
+        ", ".join(rng.sample(_SKILLS, 12)),
+        "Experience",
+    ]
+    while len(lines) < pages * LINES_PER_PAGE:
+        roll = rng.random()
+        if roll < pii_density:
+            lines.append(_pii_line(rng))
+        elif roll < pii_density + (1 - pii_density) * 0.7:
+            lines.append(_experience_line(rng))
+        else:
+            lines.append(rng.choice(FILLER))
+    return lines
+
+def _escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def build_pdf(lines: List[str], lines_per_page: int = LINES_PER_PAGE) -> bytes:
+    """Minimal text-only PDF (Helvetica, Letter) with `lines_per_page` lines per page."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page_lines in pages:
+        text = "".join(f"({_escape(line)}) Tj T* " for line in page_lines)
+        stream = f"BT /F1 10 Tf 14 TL 50 750 Td {text}ET".encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+def synthetic_resume_pdf(pages: int = 1, pii_density: float = 0.1, seed: int = 0) -> bytes:
+    return build_pdf(resume_lines(pages, pii_density, seed))
+
+def synthetic_jobs(count: int, seed: int = 0, user_ids: List[str] = None) -> List[Job]:
+    """Job postings shaped like seed_sample_jobs: header line, paragraphs, requirements."""
+    rng = random.Random(seed)
+    user_ids = user_ids or ["test-user-001", "test-user-002"]
+    jobs = []
+    for i in range(count):
+        skills = rng.sample(_SKILLS, 6)
+        paragraphs = [
+            f"Duration: {rng.choice([4, 8, 12])} Months (May - August 2026). Location: {rng.choice(LOCATIONS)}. "
+            f"Number of Position(s): {rng.randint(1, 3)}."
+        ]
+        for _ in range(rng.randint(2, 4)):
+            paragraphs.append(" ".join(
+                f"You will {verb} {rng.choice(OBJECTS)} with {rng.choice(skills)}."
+                for verb in rng.sample(JOB_VERBS, 4)
+            ) + " " + rng.choice(FILLER))
+        jobs.append(Job(
+            id=str(uuid.UUID(int=rng.getrandbits(128))),
+            user_id=rng.choice(user_ids),
+            title=rng.choice(TITLES),
+            company=rng.choice(COMPANIES),
+            description="\n\n".join(paragraphs),
+            requirements=f"Currently pursuing a degree in Computer Science. Proficiency in {', '.join(skills[:3])}. "
+                         f"Nice to have: {', '.join(skills[3:])}. Strong communication skills.",
+        ))
+    return jobs
+
+def synthetic_users(count: int, seed: int = 0) -> List[User]:
+    rng = random.Random(seed)
+    users = []
+    for i in range(count):
+        lines = resume_lines(1, 0.0, seed=rng.getrandbits(32))
+        users.append(User(
+            id=f"applicant-bench-{i:05d}",
+            email=f"bench{i}@example.com",
+            password="password123",
+            skills=", ".join(rng.sample(_SKILLS, 8)),
+            experience=" ".join(line.lstrip("- ") for line in lines[7:12]),
+            education=lines[3],
+        ))
+    return users
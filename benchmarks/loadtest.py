@@ -0,0 +1,279 @@
+"""
+Replays the frontend's user journeys against a running API at a given concurrency.
+
+    python -m benchmarks.stub_models --port 8000          # or: uvicorn main:app
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --concurrency 20 --duration 60
+
+Journeys mirror the React components' call sequences:
+    track_postings  TrackPostings.jsx: GET /users/{id}/postings (postings with counts and top applicants)
+    track_postings_legacy  the previous TrackPostings: GET /users/{id}/jobs, then GET /applications/job/{id}
+                    per posting (6 at a time, like a browser)
+    apply_upload    Jobs.jsx: GET /jobs/, POST /users/upload-resume, POST /applications/
+    apply_existing  Jobs.jsx "use existing profile": GET /jobs/, POST /applications/
+    my_applications Applications.jsx: GET /applications/user/{id}
+    sign_in         Login.jsx: POST /auth/sign-in, GET /users/{id}
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from benchmarks.generators import synthetic_jobs, synthetic_resume_pdf
+
+DEFAULT_MIX = {"track_postings": 2, "apply_upload": 1, "apply_existing": 3, "my_applications": 3, "sign_in": 1}
+BROWSER_CONNECTIONS = 6
+
+class Recorder:
+    """Latencies and errors per endpoint name (method + route template)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.journeys: Dict[str, int] = defaultdict(int)
+        self.journey_errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, endpoint: str, seconds: float, status: str, ok: bool):
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            self.statuses[endpoint][status] += 1
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def journey(self, name: str, ok: bool):
+        with self.lock:
+            self.journeys[name] += 1
+            if not ok:
+                self.journey_errors[name] += 1
+
+class Client:
+    def __init__(self, base_url: str, recorder: Recorder, timeout: float = 60):
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=BROWSER_CONNECTIONS)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, endpoint: str, path: str, **kwargs) -> Optional[requests.Response]:
+        """Sends a request and records it under `endpoint`; returns None on failure."""
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            self.recorder.record(f"{method} {endpoint}", time.perf_counter() - started, type(e).__name__, False)
+            return None
+        ok = response.status_code < 400
+        self.recorder.record(f"{method} {endpoint}", time.perf_counter() - started, str(response.status_code), ok)
+        return response if ok else None
+
+# --- Journeys ---
+
+def track_postings(client: Client, ctx: dict, rng: random.Random, pool: ThreadPoolExecutor) -> bool:
+    poster = rng.choice(ctx["posters"])
+    return client.request("GET", "/users/{user_id}/postings", f"/users/{poster['id']}/postings?top=50") is not None
+
+def track_postings_legacy(client: Client, ctx: dict, rng: random.Random, pool: ThreadPoolExecutor) -> bool:
+    poster = rng.choice(ctx["posters"])
+    response = client.request("GET", "/users/{user_id}/jobs", f"/users/{poster['id']}/jobs")
+    if response is None:
+        return False
+    futures = [
+        pool.submit(client.request, "GET", "/applications/job/{jobId}", f"/applications/job/{job['id']}")
+        for job in response.json()
+    ]
+    return all(future.result() is not None for future in futures)
+
+def apply_upload(client: Client, ctx: dict, rng: random.Random, pool: ThreadPoolExecutor) -> bool:
+    applicant = rng.choice(ctx["applicants"])
+    jobs = client.request("GET", "/jobs/", "/jobs/")
+    if jobs is None or not jobs.json():
+        return False
+    job = rng.choice(jobs.json())
+    upload = client.request(
+        "POST", "/users/upload-resume", "/users/upload-resume",
+        data={"user_id": applicant["id"]},
+        files={"file": ("resume.pdf", rng.choice(ctx["resumes"]), "application/pdf")},
+    )
+    if upload is None:
+        return False
+    return client.request("POST", "/applications/", "/applications/",
+                          json={"userId": upload.json()["user_id"], "jobId": job["id"]}) is not None
+
+def apply_existing(client: Client, ctx: dict, rng: random.Random, pool: ThreadPoolExecutor) -> bool:
+    applicant = rng.choice(ctx["applicants"])
+    jobs = client.request("GET", "/jobs/", "/jobs/")
+    if jobs is None or not jobs.json():
+        return False
+    job = rng.choice(jobs.json())
+    return client.request("POST", "/applications/", "/applications/",
+                          json={"userId": applicant["id"], "jobId": job["id"]}) is not None
+
+def my_applications(client: Client, ctx: dict, rng: random.Random, pool: ThreadPoolExecutor) -> bool:
+    applicant = rng.choice(ctx["applicants"])
+    return client.request("GET", "/applications/user/{userId}", f"/applications/user/{applicant['id']}") is not None
+
+def sign_in(client: Client, ctx: dict, rng: random.Random, pool: ThreadPoolExecutor) -> bool:
+    account = rng.choice(ctx["applicants"] + ctx["posters"])
+    response = client.request("POST", "/auth/sign-in", "/auth/sign-in",
+                              json={"email": account["email"], "password": account["password"]})
+    if response is None:
+        return False
+    return client.request("GET", "/users/{user_id}", f"/users/{response.json()['user_id']}") is not None
+
+JOURNEYS = {
+    "track_postings": track_postings,
+    "track_postings_legacy": track_postings_legacy,
+    "apply_upload": apply_upload,
+    "apply_existing": apply_existing,
+    "my_applications": my_applications,
+    "sign_in": sign_in,
+}
+
+# --- Setup & run ---
+
+def setup(base_url: str, posters: int = 5, postings_per_poster: int = 10, applicants: int = 50,
+          seed: int = 0) -> dict:
+    """
+    Creates the accounts, postings and applicant profiles the journeys use.
+    Setup requests are not part of the report.
+    """
+    run_id = uuid.uuid4().hex[:8]
+    client = Client(base_url, Recorder())
+    resumes = [synthetic_resume_pdf(pages=1 + i % 2, pii_density=0.1, seed=seed + i) for i in range(8)]
+
+    def account(role: str, i: int) -> dict:
+        email = f"loadtest-{run_id}-{role}{i}@example.com"
+        response = client.request("POST", "/auth/sign-up", "/auth/sign-up", json={"email": email, "password": "loadtest"})
+        if response is None:
+            raise RuntimeError(f"Could not create load test account {email}")
+        return {"id": response.json()["user_id"], "email": email, "password": "loadtest"}
+
+    ctx = {"posters": [account("poster", i) for i in range(posters)], "applicants": [], "resumes": resumes}
+    jobs = synthetic_jobs(posters * postings_per_poster, seed=seed)
+    for i, poster in enumerate(ctx["posters"]):
+        for job in jobs[i * postings_per_poster:(i + 1) * postings_per_poster]:
+            client.request("POST", "/users/{user_id}/jobs", f"/users/{poster['id']}/jobs", json={
+                "title": job.title, "company": job.company, "description": job.description,
+                "requirements": job.requirements,
+            })
+    for i in range(applicants):
+        applicant = account("applicant", i)
+        client.request("POST", "/users/upload-resume", "/users/upload-resume", data={"user_id": applicant["id"]},
+                       files={"file": ("resume.pdf", resumes[i % len(resumes)], "application/pdf")})
+        ctx["applicants"].append(applicant)
+    return ctx
+
+def run(base_url: str, ctx: dict, concurrency: int = 10, duration: float = 30, mix: Optional[Dict[str, float]] = None,
+        think_time: float = 0.0, seed: int = 0) -> dict:
+    """Runs `concurrency` virtual users picking journeys by `mix` weight for `duration` seconds."""
+    mix = mix or DEFAULT_MIX
+    names, weights = list(mix), list(mix.values())
+    recorder = Recorder()
+    deadline = time.monotonic() + duration
+
+    def virtual_user(index: int):
+        rng = random.Random(seed + index)
+        client = Client(base_url, recorder)
+        with ThreadPoolExecutor(max_workers=BROWSER_CONNECTIONS) as pool:
+            while time.monotonic() < deadline:
+                name = rng.choices(names, weights)[0]
+                try:
+                    ok = JOURNEYS[name](client, ctx, rng, pool)
+                except Exception:
+                    ok = False
+                recorder.journey(name, ok)
+                if think_time:
+                    time.sleep(rng.expovariate(1 / think_time))
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=virtual_user, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return report(recorder, time.monotonic() - started, concurrency)
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    index = min(int(round(percentile / 100 * len(sorted_values) + 0.5)) - 1, len(sorted_values) - 1)
+    return sorted_values[max(index, 0)]
+
+def report(recorder: Recorder, elapsed: float, concurrency: int) -> dict:
+    endpoints = {}
+    total = errors = 0
+    for endpoint, latencies in sorted(recorder.latencies.items()):
+        latencies = sorted(latencies)
+        count, failed = len(latencies), recorder.errors[endpoint]
+        total += count
+        errors += failed
+        endpoints[endpoint] = {
+            "requests": count,
+            "throughput_rps": round(count / elapsed, 2),
+            "error_rate": round(failed / count, 4),
+            "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+            "statuses": dict(recorder.statuses[endpoint]),
+        }
+    return {
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 2),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "journeys": {name: {"completed": count, "errors": recorder.journey_errors[name],
+                            "per_second": round(count / elapsed, 2)}
+                     for name, count in sorted(recorder.journeys.items())},
+        "endpoints": endpoints,
+    }
+
+def print_report(result: dict):
+    print(f"\n{result['requests']} requests in {result['elapsed_seconds']}s at concurrency {result['concurrency']}: "
+          f"{result['throughput_rps']} req/s, error rate {result['error_rate']:.2%}")
+    print(f"\n{'journey':<18} {'completed':>9} {'errors':>7} {'per s':>8}")
+    for name, stats in result["journeys"].items():
+        print(f"{name:<18} {stats['completed']:>9} {stats['errors']:>7} {stats['per_second']:>8}")
+    print(f"\n{'endpoint':<36} {'reqs':>7} {'req/s':>8} {'err%':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for endpoint, stats in result["endpoints"].items():
+        print(f"{endpoint:<36} {stats['requests']:>7} {stats['throughput_rps']:>8} {stats['error_rate']:>6.1%} "
+              f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}")
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in JOURNEYS:
+            raise argparse.ArgumentTypeError(f"Unknown journey '{name}' (choose from {', '.join(JOURNEYS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay frontend user journeys against a running API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=10, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--mix", type=parse_mix, default=None,
+                        help="Journey weights, e.g. track_postings=2,apply_existing=3")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between journeys (seconds)")
+    parser.add_argument("--posters", type=int, default=5)
+    parser.add_argument("--postings-per-poster", type=int, default=10)
+    parser.add_argument("--applicants", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Write the report as JSON")
+    args = parser.parse_args()
+
+    print(f"Setting up {args.posters} posters x {args.postings_per_poster} postings and {args.applicants} applicants...")
+    context = setup(args.url, args.posters, args.postings_per_poster, args.applicants, args.seed)
+    result = run(args.url, context, args.concurrency, args.duration, args.mix, args.think_time, args.seed)
+    print_report(result)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
@@ -0,0 +1,75 @@
+"""
+Query budget check for the poster dashboard.
+
+    python -m benchmarks.query_budget
+
+Seeds a throwaway database with posters of different sizes and fails (exit 1)
+if GET /users/{id}/postings needs more than QUERY_BUDGET statements or its
+query count grows with the number of postings. The per-job path it replaced
+is measured for comparison.
+"""
+import os
+import random
+import sys
+import tempfile
+
+QUERY_BUDGET = 2
+POSTER_SIZES = (1, 10, 30)
+APPLICANTS_PER_JOB = 40
+
+def count_queries(fn) -> int:
+    from utils import metrics
+    timings, token = metrics.start_request()
+    try:
+        fn()
+    finally:
+        metrics.end_request(token)
+    return timings.db_queries
+
+def seed(poster_sizes=POSTER_SIZES) -> dict:
+    from sqlmodel import Session
+    from core.database import engine, create_db_and_tables, add_applications, Application, User
+    from benchmarks.generators import synthetic_jobs, synthetic_users
+
+    engine.echo = False
+    create_db_and_tables()
+    rng = random.Random(0)
+    applicants = synthetic_users(APPLICANTS_PER_JOB * 2, seed=0)
+    posters = {size: f"poster-{size}" for size in poster_sizes}
+    applications = []
+    with Session(engine) as session:
+        session.add_all(applicants)
+        for size, poster_id in posters.items():
+            session.add(User(id=poster_id, email=f"{poster_id}@example.com", password="x",
+                             skills="", experience="", education=""))
+            for job in synthetic_jobs(size, seed=size, user_ids=[poster_id]):
+                session.add(job)
+                for applicant in rng.sample(applicants, APPLICANTS_PER_JOB):
+                    applications.append(Application(job_id=job.id, user_id=applicant.id, score=round(rng.random(), 3)))
+        session.commit()
+    # Through the write path, so the score aggregates exist as in a live database
+    add_applications(applications)
+    return posters
+
+if __name__ == "__main__":
+    os.environ["BMATS_DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/query_budget.db"
+    from app.services.application import ApplicationService
+    from app.services.job import JobService
+
+    posters = seed()
+    failures = []
+    counts = {}
+    for size, poster_id in posters.items():
+        counts[size] = count_queries(lambda: ApplicationService.get_postings_summary(poster_id, top=5))
+        legacy = count_queries(lambda: [
+            ApplicationService.get_applications_of_job(job.id) for job in JobService.get_jobs_by_user(poster_id)
+        ])
+        print(f"{size:>3} postings: summary {counts[size]} queries (budget {QUERY_BUDGET}), per-job path {legacy}")
+        if counts[size] > QUERY_BUDGET:
+            failures.append(f"{size} postings used {counts[size]} queries")
+    if len(set(counts.values())) > 1:
+        failures.append(f"query count grows with postings: {counts}")
+    if failures:
+        print("Query budget exceeded: " + "; ".join(failures))
+        sys.exit(1)
+    print("Query budget OK")
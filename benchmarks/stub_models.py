@@ -0,0 +1,53 @@
+"""
+Runs the API with the cross-encoder and spaCy models replaced by cheap fakes,
+so load tests measure the web/database path (or a fixed simulated model cost).
+
+    python -m benchmarks.stub_models --port 8000 --model-latency 0.02
+"""
+import argparse
+import hashlib
+import os
+import time
+
+def install(model_latency: float = 0.0):
+    """Patches the model loaders; must run before utils.semantics/anonymizer are imported."""
+    import numpy as np
+    import spacy
+    import sentence_transformers
+
+    class FakeCrossEncoder:
+        def __init__(self, name, **kwargs):
+            self.name = name
+
+        def predict(self, pairs, batch_size: int = 32, **kwargs):
+            if model_latency:
+                time.sleep(model_latency * max(len(pairs) / batch_size, 1))
+            # Deterministic pseudo-score in the same range as the real model
+            return np.array([
+                int.from_bytes(hashlib.blake2b(f"{a}\0{b}".encode(), digest_size=4).digest(), "little") / 2 ** 32 * 0.6
+                for a, b in pairs
+            ], dtype=np.float32)
+
+    def fake_load(name, **kwargs):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        return nlp
+
+    sentence_transformers.CrossEncoder = FakeCrossEncoder
+    spacy.load = fake_load
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the API with stubbed models for load testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model-latency", type=float, default=0.0, help="Simulated seconds per predict() batch")
+    args = parser.parse_args()
+
+    install(args.model_latency)
+    os.environ.setdefault("BMATS_ETL_SCHEDULE", "0")
+    # Every simulated user shares this client's address, which is the quota key
+    os.environ.setdefault("BMATS_UPLOAD_BURST", "1000000")
+    os.environ.setdefault("BMATS_APPLY_BURST", "1000000")
+    import uvicorn
+    from main import app
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,268 @@
+import io
+import json
+import platform
+import random
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from benchmarks.generators import synthetic_resume_pdf, resume_lines, synthetic_jobs, synthetic_users
+
+# (name, factory) - the factory does the (untimed) setup and returns the timed callable
+Case = Tuple[str, Callable[[], Callable[[], object]]]
+
+DB_JOBS = 500
+DB_USERS = 200
+DB_APPLICATIONS_PER_JOB = 20
+
+def _pdf_cases() -> Iterator[Case]:
+    from utils.parser import extract_text_from_pdf
+    for pages in (1, 3, 10):
+        def factory(pages=pages):
+            pdf = synthetic_resume_pdf(pages, 0.1, seed=pages)
+            return lambda: extract_text_from_pdf(io.BytesIO(pdf))
+        yield f"pdf.extract_text[pages={pages}]", factory
+
+def _anonymize_cases() -> Iterator[Case]:
+    for pages, density in ((1, 0.05), (1, 0.3), (3, 0.1)):
+        def factory(pages=pages, density=density):
+            from utils.anonymizer import anonymizer_instance
+            text = "\n".join(resume_lines(pages, density, seed=pages))
+            return lambda: anonymizer_instance.anonymize_text(text)
+        yield f"anonymize_text[pages={pages},pii={density}]", factory
+
+def _entity_cases() -> Iterator[Case]:
+    for pages in (1, 3):
+        def factory(pages=pages):
+            from utils.semantics import semantics_instance
+            text = "\n".join(resume_lines(pages, 0.0, seed=pages))
+            return lambda: semantics_instance._extract_entities(text)
+        yield f"extract_entities[pages={pages}]", factory
+
+def _score_cases() -> Iterator[Case]:
+    def pairs(n):
+        from utils.job_features import build_job_scoring_text
+        jobs = synthetic_jobs(n, seed=1)
+        users = synthetic_users(n, seed=1)
+        return [
+            (build_job_scoring_text(j.title, j.description, j.requirements),
+             f"{u.skills} {u.experience} {u.education}")
+            for j, u in zip(jobs, users)
+        ]
+
+    def single():
+        from utils.semantics import semantics_instance
+        job_text, user_text = pairs(1)[0]
+        return lambda: semantics_instance.get_final_score(job_text, user_text)
+
+    def batch():
+        from utils.semantics import semantics_instance
+        batch_pairs = pairs(32)
+        return lambda: semantics_instance.get_final_scores(batch_pairs, batch_size=32)
+
+    yield "get_final_score", single
+    yield "get_final_scores[batch=32]", batch
+
+_db_state: Dict[str, object] = {}
+
+def _seed_database():
+    """Fills the (temporary) benchmark database once with synthetic rows."""
+    if _db_state:
+        return _db_state
+    from sqlmodel import Session
+    from core import database
+    from core.database import engine, create_db_and_tables, Application, rebuild_job_score_stats
+
+    engine.echo = False  # SQL logging would dominate the timings
+    create_db_and_tables()
+    rng = random.Random(0)
+    users = synthetic_users(DB_USERS, seed=0)
+    jobs = synthetic_jobs(DB_JOBS, seed=0, user_ids=["test-user-001", "test-user-002"])
+    job_ids, user_ids = [j.id for j in jobs], [u.id for u in users]
+    with Session(engine) as session:
+        session.add_all(users)
+        session.add_all(jobs)
+        session.flush()
+        for job_id in job_ids:
+            for user_id in rng.sample(user_ids, DB_APPLICATIONS_PER_JOB):
+                session.add(Application(job_id=job_id, user_id=user_id, score=round(rng.random(), 3)))
+        session.flush()
+        for job_id in job_ids:
+            rebuild_job_score_stats(session, job_id)
+        session.commit()
+    database.invalidate_job_cache()
+    database.invalidate_user_cache()
+    _db_state.update(jobs=job_ids, users=user_ids, rng=rng)
+    return _db_state
+
+def _db_cases() -> Iterator[Case]:
+    from sqlmodel import Session, select
+    from core import database
+
+    def case(fn):
+        def factory():
+            state = _seed_database()
+            return fn(state)
+        return factory
+
+    def get_job_cached(state):
+        job_id = state["jobs"][0]
+        database.get_job(job_id)
+        return lambda: database.get_job(job_id)
+
+    def get_job_uncached(state):
+        job_id = state["jobs"][0]
+        def run():
+            database.job_cache.invalidate(job_id)
+            return database.get_job(job_id)
+        return run
+
+    def add_application(state):
+        rng, jobs, users = state["rng"], state["jobs"], state["users"]
+        # (job, user) is unique: insert pairs that have no application yet
+        with Session(database.engine) as session:
+            taken = set(session.exec(select(database.Application.job_id, database.Application.user_id)).all())
+        pairs = [(job_id, user_id) for job_id in jobs for user_id in users if (job_id, user_id) not in taken]
+        rng.shuffle(pairs)
+        pairs = iter(pairs)
+
+        def run():
+            job_id, user_id = next(pairs)
+            return database.add_application(database.Application(job_id=job_id, user_id=user_id, score=rng.random()))
+        return run
+
+    yield "db.get_job[cached]", case(get_job_cached)
+    yield "db.get_job[uncached]", case(get_job_uncached)
+    yield "db.get_all_jobs", case(lambda state: database.get_all_jobs)
+    yield "db.search_jobs", case(lambda state: lambda: database.search_jobs("engineering"))
+    yield "db.get_applications_for_job", case(lambda state: lambda: database.get_applications_for_job(state["jobs"][1]))
+    yield "db.get_top_applications_for_job", case(
+        lambda state: lambda: database.get_top_applications_for_job(state["jobs"][1], limit=20))
+    yield "db.get_job_score_stats", case(lambda state: lambda: database.get_job_score_stats(state["jobs"][1]))
+    yield "db.add_application", case(add_application)
+
+LEXICAL_PROFILES = 100_000
+
+def _lexical_cases() -> Iterator[Case]:
+    from utils.lexical import BM25Index, profile_terms, job_terms
+    from utils.job_features import build_job_scoring_text
+    state = {}
+
+    def index():
+        if not state:
+            # Distinct ids over a repeated pool of profiles: same postings shape, faster setup
+            pool = [profile_terms(u.skills, u.experience, u.education) for u in synthetic_users(5000, seed=2)]
+            built = BM25Index()
+            built.build((f"profile-{i:06d}", pool[i % len(pool)]) for i in range(LEXICAL_PROFILES))
+            jobs = synthetic_jobs(20, seed=2)
+            state.update(index=built, pool=pool, queries=[
+                job_terms(build_job_scoring_text(j.title, j.description, j.requirements)) for j in jobs
+            ], rng=random.Random(2))
+        return state
+
+    def search():
+        s = index()
+        queries = iter(s["queries"] * 1000)
+        return lambda: s["index"].search(next(queries), 100)
+
+    def upsert():
+        s = index()
+        rng = s["rng"]
+        return lambda: s["index"].upsert(f"profile-{rng.randrange(LEXICAL_PROFILES):06d}", rng.choice(s["pool"]))
+
+    yield f"lexical.search[profiles={LEXICAL_PROFILES},k=100]", search
+    yield "lexical.upsert", upsert
+
+def _skill_index_cases() -> Iterator[Case]:
+    from utils.skill_index import SkillBitsetIndex
+    from utils.skills import normalize_skills
+    state = {}
+
+    def index():
+        if not state:
+            pool = [normalize_skills(u.skills) for u in synthetic_users(5000, seed=3)]
+            ids = {name: i for i, name in enumerate(sorted({name for skills in pool for name in skills}))}
+            pool = [[ids[name] for name in skills] for skills in pool]
+            built = SkillBitsetIndex()
+            built.build((f"profile-{i:06d}", pool[i % len(pool)]) for i in range(LEXICAL_PROFILES))
+            rng = random.Random(3)
+            state.update(index=built, queries=[rng.sample(range(len(ids)), 3) for _ in range(20)],
+                         users=[f"profile-{i:06d}" for i in rng.sample(range(LEXICAL_PROFILES), 5000)])
+        return state
+
+    def all_of():
+        s = index()
+        queries = iter(s["queries"] * 1000)
+        return lambda: s["index"].users_with_all(next(queries)[:2])
+
+    def overlap():
+        s = index()
+        queries = iter(s["queries"] * 1000)
+        return lambda: s["index"].overlap_counts(s["users"], next(queries))
+
+    yield f"skills.all_of[profiles={LEXICAL_PROFILES}]", all_of
+    yield "skills.overlap[users=5000]", overlap
+
+def all_cases() -> List[Case]:
+    cases = []
+    for group in (_pdf_cases, _anonymize_cases, _entity_cases, _score_cases, _lexical_cases, _skill_index_cases, _db_cases):
+        cases.extend(group())
+    return cases
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 2) -> dict:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "runs": repeat,
+        "median_ms": round(statistics.median(timings), 4),
+        "p95_ms": round(timings[min(int(len(timings) * 0.95), len(timings) - 1)], 4),
+        "min_ms": round(timings[0], 4),
+    }
+
+def run(name_filter: Optional[str] = None, repeat: int = 20) -> dict:
+    results = {}
+    for name, factory in all_cases():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(factory(), repeat)
+        print(f"{name:<45} median {results[name]['median_ms']:>10.3f} ms  p95 {results[name]['p95_ms']:>10.3f} ms")
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2, min_delta_ms: float = 0.05) -> List[str]:
+    """
+    Prints median changes per benchmark and returns the names that regressed
+    by more than `threshold` (relative) and `min_delta_ms` (absolute).
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            print(f"{name:<45} (new)")
+            continue
+        change = result["median_ms"] / base["median_ms"] - 1 if base["median_ms"] else 0.0
+        regressed = change > threshold and result["median_ms"] - base["median_ms"] > min_delta_ms
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<45} {base['median_ms']:>10.3f} -> {result['median_ms']:>10.3f} ms  "
+              f"{change:+7.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def save(result: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
@@ -1,6 +1,16 @@
 from sqlmodel import SQLModel, Field, Session, create_engine, select
-from typing import Optional, List
+from sqlalchemy import Index, delete, exists, func, inspect, or_, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Optional, List, Any, Tuple
+from collections import Counter, OrderedDict
+from datetime import datetime
+import threading
+import time
+import os
 import uuid
+from utils import metrics
+from utils.skills import normalize_skills
 
 # --- Database Models ---
 
@@ -11,10 +21,21 @@ class User(SQLModel, table=True):
     skills: str  # JSON string or comma-separated
     experience: str
     education: str
+    profile_updated_at: Optional[str] = Field(default=None, index=True) # last resume upload; newer than an application's scored_at makes it stale
+
+class Skill(SQLModel, table=True):
+    """Interned skill names; ids are dense and index the in-memory skill bitsets."""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(unique=True)
+
+class UserSkill(SQLModel, table=True):
+    """A user's normalized skills (User.skills keeps the display string)."""
+    user_id: str = Field(foreign_key="user.id", primary_key=True)
+    skill_id: int = Field(foreign_key="skill.id", primary_key=True, index=True)
 
 class Job(SQLModel, table=True):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    user_id: str = Field(foreign_key="user.id")
+    user_id: str = Field(foreign_key="user.id", index=True)
     title: str
     description: str
     company: str
@@ -24,26 +45,330 @@ class Job(SQLModel, table=True):
     date_posted: Optional[str] = None # Using string for simplicity in SQLite
     salary: Optional[str] = None
     source_id: Optional[str] = None # For tracking external jobs
+    # Precomputed at write time by JobEnrichmentService
+    required_skills: Optional[str] = None # comma-separated, same matcher as resumes
+    scoring_changed_at: Optional[str] = None # last change to the scored text or required skills after the first enrichment
+    minhash: Optional[str] = None # base64 MinHash signature of title/company/description
+    duplicate_of: Optional[str] = None # canonical job id when this posting is a near-duplicate
 
 
+class JobFingerprintBand(SQLModel, table=True):
+    """LSH index: one row per (band, bucket) of every canonical job's MinHash."""
+    band: int = Field(primary_key=True)
+    bucket: int = Field(primary_key=True)
+    job_id: str = Field(foreign_key="job.id", primary_key=True)
+
 class Application(SQLModel, table=True):
+    # (job_id, score) lets leaderboard queries walk the index in score order;
+    # a user applies to a job once, and an Idempotency-Key names one application
+    __table_args__ = (
+        Index("ix_application_job_score", "job_id", "score"),
+        Index("ux_application_job_user", "job_id", "user_id", unique=True),
+        Index("ux_application_user_idempotency_key", "user_id", "idempotency_key", unique=True),
+    )
+
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     job_id: str = Field(foreign_key="job.id")
     user_id: str = Field(foreign_key="user.id")
     score: float
+    model_version: Optional[str] = None # SemanticMatcher.version that produced the score
+    scored_at: Optional[str] = None
+    provisional: Optional[bool] = False # cheap placeholder score awaiting cross-encoder refinement
+    idempotency_key: Optional[str] = None # client's Idempotency-Key for the creating request
+
+# Top of the score range: cross-encoder similarities in [0, 1] times
+# utils.semantics.SCORE_SCALE (provisional scores stay below it)
+HISTOGRAM_MAX_SCORE = 1.6
+# Number of equal-width score buckets over [0, HISTOGRAM_MAX_SCORE]; scores outside are clamped
+HISTOGRAM_BUCKETS = 16
+
+class JobScoreStats(SQLModel, table=True):
+    """Running score aggregates per job, updated on every application insert."""
+    job_id: str = Field(foreign_key="job.id", primary_key=True)
+    count: int = 0
+    score_sum: float = 0.0
+    score_sq_sum: float = 0.0
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    histogram_max: Optional[float] = None # HISTOGRAM_MAX_SCORE the job's buckets were counted with
+
+class JobScoreBucket(SQLModel, table=True):
+    """Histogram bucket counts per job, used for count-by-range and percentiles."""
+    job_id: str = Field(foreign_key="job.id", primary_key=True)
+    bucket: int = Field(primary_key=True)
+    count: int = 0
+
+class EtlWatermark(SQLModel, table=True):
+    """Incremental ETL state for one (title, location) query."""
+    query_key: str = Field(primary_key=True)
+    title: str
+    location: str
+    seen_ids: str = "[]"  # JSON list of the most recent source_ids, newest first
+    last_run_at: Optional[str] = None
+
+class EtlRun(SQLModel, table=True):
+    """One scheduled ETL run, recorded by whichever worker held the lease."""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    owner: str
+    started_at: str
+    finished_at: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    pages: int = 0
+    new: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    duplicates: int = 0
+    error: Optional[str] = None
+
+class RescoreRun(SQLModel, table=True):
+    """Progress checkpoint of a rescoring run; committed with every batch so a run can resume."""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    model_version: str
+    status: str = "running"  # running | completed | failed
+    owner: Optional[str] = None
+    started_at: str
+    updated_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    total: int = 0  # stale applications when the run started
+    processed: int = 0
+    batches: int = 0
+    cursor_job_id: Optional[str] = None  # every job up to here (in id order) has been rescored
+    error: Optional[str] = None
+
+class Lease(SQLModel, table=True):
+    """Named lease giving one process at a time the right to run a job."""
+    name: str = Field(primary_key=True)
+    owner: str
+    expires_at: float
+
+class CacheVersion(SQLModel, table=True):
+    """Per-cache version counter; bumped on writes so other worker processes drop stale entries."""
+    name: str = Field(primary_key=True)
+    version: int = 0
 
 # --- Database Setup ---
 
-DATABASE_URL = "sqlite:///./hackthebias.db"
+DATABASE_URL = os.getenv("BMATS_DATABASE_URL", "sqlite:///./hackthebias.db")
 engine = create_engine(DATABASE_URL, echo=True)
+metrics.instrument_engine(engine)
+
+def _add_missing_columns():
+    """
+    create_all never alters existing tables; add any new nullable model
+    columns to databases created before those columns existed.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+
+def _remove_duplicate_applications():
+    """
+    Keeps one application per (job, user) in databases created before the
+    unique index: the finalized, most recently scored one.
+    """
+    inspector = inspect(engine)
+    if any(index["name"] == "ux_application_job_user" for index in inspector.get_indexes("application")):
+        return
+    with Session(engine) as session:
+        pairs = session.exec(
+            select(Application.job_id, Application.user_id)
+            .group_by(Application.job_id, Application.user_id)
+            .having(func.count() > 1)
+        ).all()
+        for job_id, user_id in pairs:
+            duplicates = session.exec(
+                select(Application)
+                .where(Application.job_id == job_id, Application.user_id == user_id)
+                .order_by(Application.provisional, Application.scored_at.desc())
+            ).all()
+            for application in duplicates[1:]:
+                session.delete(application)
+            session.flush()
+            adjust_job_score_stats(session, job_id, removed=[application.score for application in duplicates[1:]])
+        session.commit()
+    if pairs:
+        print(f"DB: removed duplicate applications of {len(pairs)} (job, user) pairs")
 
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
+    _add_missing_columns()
+    _remove_duplicate_applications()
+    # create_all skips indexes on tables that already exist
+    for index in [*User.__table__.indexes, *Job.__table__.indexes, *Application.__table__.indexes]:
+        index.create(engine, checkfirst=True)
 
 def get_session():
     with Session(engine) as session:
         yield session
 
+# --- Read-through Cache ---
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 300.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drops one key, or the whole cache when no key is given."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+
+CACHE_MAXSIZE = int(os.getenv("BMATS_CACHE_MAXSIZE", "4096"))
+CACHE_TTL = float(os.getenv("BMATS_CACHE_TTL", "300"))
+# When enabled, writes bump a row in the cacheversion table and every process
+# re-checks it at most once per CACHE_SYNC_INTERVAL seconds.
+CACHE_SYNC = os.getenv("BMATS_CACHE_SYNC", "0") == "1"
+CACHE_SYNC_INTERVAL = float(os.getenv("BMATS_CACHE_SYNC_INTERVAL", "1.0"))
+
+job_cache = TTLCache("job", maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL)
+user_cache = TTLCache("user", maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL)
+_caches = {cache.name: cache for cache in (job_cache, user_cache)}
+_seen_versions = {}
+_last_sync = 0.0
+_sync_lock = threading.Lock()
+
+def _publish_invalidation(name: str):
+    """Bumps the shared version for a cache so other processes clear their copy."""
+    if not CACHE_SYNC:
+        return
+    with Session(engine) as session:
+        upsert = sqlite_insert(CacheVersion).values(name=name, version=1)
+        session.exec(upsert.on_conflict_do_update(
+            index_elements=["name"], set_={"version": CacheVersion.version + 1}
+        ))
+        session.commit()
+        _seen_versions[name] = session.get(CacheVersion, name).version
+
+def _sync_caches():
+    """Clears any local cache whose shared version moved since the last check."""
+    global _last_sync
+    if not CACHE_SYNC:
+        return
+    now = time.monotonic()
+    if now - _last_sync < CACHE_SYNC_INTERVAL:
+        return
+    with _sync_lock:
+        if now - _last_sync < CACHE_SYNC_INTERVAL:
+            return
+        _last_sync = now
+        with Session(engine) as session:
+            for row in session.exec(select(CacheVersion)).all():
+                # A row not seen before may have moved since this process filled its cache
+                if _seen_versions.get(row.name) != row.version:
+                    if row.name in _caches:
+                        _caches[row.name].invalidate()
+                    _seen_versions[row.name] = row.version
+
+def invalidate_user_cache(user_id: Optional[str] = None):
+    user_cache.invalidate(user_id)
+    _publish_invalidation(user_cache.name)
+
+def invalidate_job_cache(job_id: Optional[str] = None):
+    job_cache.invalidate(job_id)
+    _publish_invalidation(job_cache.name)
+
+def get_cache_stats() -> dict:
+    """Hit ratio, eviction and invalidation counters for each cache."""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+metrics.register_collector(lambda: metrics.cache_lines(get_cache_stats()))
+
+# --- Leases ---
+
+def acquire_lease(name: str, owner: str, ttl: float) -> bool:
+    """
+    Takes (or renews) the named lease for `ttl` seconds if it is free, expired
+    or already ours. Atomic across processes sharing the database.
+    """
+    now = time.time()
+    with Session(engine) as session:
+        result = session.exec(
+            update(Lease)
+            .where(Lease.name == name)
+            .where((Lease.expires_at < now) | (Lease.owner == owner))
+            .values(owner=owner, expires_at=now + ttl)
+        )
+        if result.rowcount:
+            session.commit()
+            return True
+        if session.get(Lease, name):
+            return False
+        session.add(Lease(name=name, owner=owner, expires_at=now + ttl))
+        try:
+            session.commit()
+            return True
+        except IntegrityError:
+            # Another process created it first
+            session.rollback()
+            return False
+
+def release_lease(name: str, owner: str):
+    with Session(engine) as session:
+        lease = session.get(Lease, name)
+        if lease and lease.owner == owner:
+            session.delete(lease)
+            session.commit()
+
 # --- User Operations ---
 
 def add_user(user: User) -> User:
@@ -51,11 +376,20 @@ def add_user(user: User) -> User:
         session.add(user)
         session.commit()
         session.refresh(user)
-        return user
+    invalidate_user_cache(user.id)
+    return user
 
 def get_user(user_id: str) -> Optional[User]:
+    _sync_caches()
+    found, user = user_cache.get(user_id)
+    if found:
+        return user
     with Session(engine) as session:
-        return session.get(User, user_id)
+        user = session.get(User, user_id)
+    if user is not None:
+        user_cache.set(user_id, user)
+    return user
+
 def get_user_by_email(email: str) -> Optional[User]:
     with Session(engine) as session:
         statement = select(User).where(User.email == email)
@@ -65,6 +399,71 @@ def get_all_users() -> List[User]:
     with Session(engine) as session:
         return session.exec(select(User)).all()
 
+def get_user_profiles(changed_since: Optional[str] = None) -> List[tuple]:
+    """
+    (id, skills, experience, education, profile_updated_at) of every user, or
+    only of those whose profile changed after `changed_since`.
+    """
+    statement = select(User.id, User.skills, User.experience, User.education, User.profile_updated_at)
+    if changed_since is not None:
+        statement = statement.where(User.profile_updated_at > changed_since)
+    with Session(engine) as session:
+        return session.exec(statement).all()
+
+def set_user_skills(session: Session, user_id: str, skills) -> List[int]:
+    """
+    Normalizes and interns the skills (names or a comma-joined string) and
+    replaces the user's UserSkill rows; the caller commits. Returns the skill ids.
+    """
+    names = normalize_skills(skills)
+    skill_ids = []
+    if names:
+        session.exec(sqlite_insert(Skill).values([{"name": name} for name in names]).on_conflict_do_nothing())
+        skill_ids = session.exec(select(Skill.id).where(Skill.name.in_(names))).all()
+    session.exec(delete(UserSkill).where(UserSkill.user_id == user_id))
+    if skill_ids:
+        session.exec(
+            sqlite_insert(UserSkill)
+            .values([{"user_id": user_id, "skill_id": skill_id} for skill_id in skill_ids])
+            .on_conflict_do_nothing()
+        )
+    return skill_ids
+
+def get_skill_dictionary() -> dict:
+    """Skill name -> id."""
+    with Session(engine) as session:
+        return dict(session.exec(select(Skill.name, Skill.id)).all())
+
+def get_user_skill_ids(changed_since: Optional[str] = None) -> List[Tuple[str, List[int], Optional[str]]]:
+    """
+    (user id, skill ids, profile_updated_at) of every user, or only of those
+    whose profile changed after `changed_since`.
+    """
+    statement = (
+        select(User.id, User.profile_updated_at, UserSkill.skill_id)
+        .join(UserSkill, UserSkill.user_id == User.id, isouter=True)
+    )
+    if changed_since is not None:
+        statement = statement.where(User.profile_updated_at > changed_since)
+    users = OrderedDict()
+    with Session(engine) as session:
+        for user_id, updated_at, skill_id in session.exec(statement.order_by(User.id)).all():
+            entry = users.setdefault(user_id, (user_id, [], updated_at))
+            if skill_id is not None:
+                entry[1].append(skill_id)
+    return list(users.values())
+
+def get_users_by_ids(user_ids: List[str]) -> List[User]:
+    with Session(engine) as session:
+        return session.exec(select(User).where(User.id.in_(user_ids))).all()
+
+def get_applicant_ids(job_id: str, user_ids: List[str]) -> List[str]:
+    """Which of `user_ids` already applied to the job."""
+    with Session(engine) as session:
+        return session.exec(
+            select(Application.user_id).where(Application.job_id == job_id, Application.user_id.in_(user_ids))
+        ).all()
+
 # --- Job Operations ---
 
 def add_job(job: Job) -> Job:
@@ -72,15 +471,28 @@ def add_job(job: Job) -> Job:
         session.add(job)
         session.commit()
         session.refresh(job)
-        return job
+    invalidate_job_cache(job.id)
+    return job
 
 def get_job(job_id: str) -> Optional[Job]:
+    _sync_caches()
+    found, job = job_cache.get(job_id)
+    if found:
+        return job
     with Session(engine) as session:
-        return session.get(Job, job_id)
+        job = session.get(Job, job_id)
+    if job is not None:
+        job_cache.set(job_id, job)
+    return job
+
+def _listed_jobs():
+    """Jobs shown on the board: canonical ones, plus every user-created posting (only ETL copies are hidden)."""
+    return or_(Job.duplicate_of == None, Job.source_id == None)
 
 def get_all_jobs() -> List[Job]:
+    """Returns all listed jobs (near-duplicate ETL postings are linked, not listed)."""
     with Session(engine) as session:
-        return session.exec(select(Job)).all()
+        return session.exec(select(Job).where(_listed_jobs())).all()
 
 def search_jobs(query: str) -> List[Job]:
     with Session(engine) as session:
@@ -88,7 +500,7 @@ def search_jobs(query: str) -> List[Job]:
             (Job.title.contains(query)) | 
             (Job.company.contains(query)) |
             (Job.description.contains(query))
-        )
+        ).where(_listed_jobs())
         return session.exec(statement).all()
 
 # --- Application Operations ---
@@ -96,10 +508,63 @@ def search_jobs(query: str) -> List[Job]:
 def add_application(application: Application) -> Application:
     with Session(engine) as session:
         session.add(application)
+        record_application_score(session, application.job_id, application.score)
+        session.commit()
+        session.refresh(application)
+        return application
+
+def add_applications(applications: List[Application]) -> List[Application]:
+    """Inserts applications (and their score aggregates) in a single transaction."""
+    with Session(engine) as session:
+        for application in applications:
+            session.add(application)
+            record_application_score(session, application.job_id, application.score)
+        session.commit()
+        for application in applications:
+            session.refresh(application)
+        return applications
+
+def get_user_application(user_id: str, job_id: Optional[str] = None,
+                         idempotency_key: Optional[str] = None) -> Optional[Application]:
+    """The user's application to `job_id`, or the one created with `idempotency_key`."""
+    with Session(engine) as session:
+        statement = select(Application).where(Application.user_id == user_id)
+        if idempotency_key is not None:
+            statement = statement.where(Application.idempotency_key == idempotency_key)
+        else:
+            statement = statement.where(Application.job_id == job_id)
+        return session.exec(statement).first()
+
+def update_application_score(application_id: str, score: float, model_version: str, scored_at: str,
+                             provisional: bool) -> Application:
+    """Re-scores an existing application and updates its job's aggregates in one transaction."""
+    with Session(engine) as session:
+        application = session.get(Application, application_id)
+        old_score = application.score
+        application.score = score
+        application.model_version = model_version
+        application.scored_at = scored_at
+        application.provisional = provisional
+        session.add(application)
+        session.flush()
+        adjust_job_score_stats(session, application.job_id, removed=[old_score], added=[score])
         session.commit()
         session.refresh(application)
         return application
 
+def get_jobs_with_user_applications(job_ids: List[str], user_id: str) -> List[Tuple[Job, Optional[str]]]:
+    """
+    (Job, id of `user_id`'s existing application or None) for each of
+    `job_ids` that exists, in one query.
+    """
+    with Session(engine) as session:
+        statement = (
+            select(Job, Application.id)
+            .join(Application, (Application.job_id == Job.id) & (Application.user_id == user_id), isouter=True)
+            .where(Job.id.in_(job_ids))
+        )
+        return session.exec(statement).all()
+
 def get_application(application_id: str) -> Optional[Application]:
     with Session(engine) as session:
         return session.get(Application, application_id)
@@ -114,6 +579,309 @@ def get_applications_for_user(user_id: str) -> List[Application]:
         statement = select(Application).where(Application.user_id == user_id)
         return session.exec(statement).all()
 
+def get_top_applications_for_job(job_id: str, limit: Optional[int] = 20, min_score: Optional[float] = None) -> List[tuple]:
+    """
+    Returns (Application, User) pairs for a job ordered by score descending
+    (all of them when `limit` is None). Served from the (job_id, score) index,
+    so cost depends on `limit`, not on the number of applicants.
+    """
+    with Session(engine) as session:
+        statement = (
+            select(Application, User)
+            .join(User, User.id == Application.user_id, isouter=True)
+            .where(Application.job_id == job_id)
+        )
+        if min_score is not None:
+            statement = statement.where(Application.score >= min_score)
+        statement = statement.order_by(Application.score.desc())
+        if limit is not None:
+            statement = statement.limit(limit)
+        return session.exec(statement).all()
+
+def get_postings_with_applicants(user_id: str, top: int = 5) -> Tuple[List[Job], dict, dict]:
+    """
+    A poster's jobs with their running score aggregates and top applicants,
+    in two queries however many postings there are:
+    - jobs: [Job]
+    - aggregates: job_id -> JobScoreStats (jobs without applications are missing)
+    - applicants: job_id -> [(Application, User)] best `top` by score
+    """
+    with Session(engine) as session:
+        def postings():
+            return session.exec(
+                select(Job, JobScoreStats, exists().where(Application.job_id == Job.id))
+                .join(JobScoreStats, JobScoreStats.job_id == Job.id, isouter=True)
+                .where(Job.user_id == user_id)
+            ).all()
+
+        rows = postings()
+        if not rows:
+            return [], {}, {}
+        # Backfill jobs whose applications predate the aggregates (older databases)
+        unaggregated = [job.id for job, stats, has_applications in rows if stats is None and has_applications]
+        if unaggregated:
+            for job_id in unaggregated:
+                rebuild_job_score_stats(session, job_id)
+            session.commit()
+            rows = postings()
+        jobs = [job for job, _, _ in rows]
+        aggregates = {job.id: stats for job, stats, _ in rows if stats is not None}
+        job_ids = select(Job.id).where(Job.user_id == user_id)
+
+        applicants = {}
+        if top > 0:
+            rank = func.row_number().over(
+                partition_by=Application.job_id, order_by=Application.score.desc()
+            ).label("rank")
+            ranked = select(Application.id, rank).where(Application.job_id.in_(job_ids)).subquery()
+            rows = session.exec(
+                select(Application, User)
+                .join(ranked, ranked.c.id == Application.id)
+                .join(User, User.id == Application.user_id, isouter=True)
+                .where(ranked.c.rank <= top)
+                .order_by(Application.job_id, ranked.c.rank)
+            ).all()
+            for app, user in rows:
+                applicants.setdefault(app.job_id, []).append((app, user))
+        return jobs, aggregates, applicants
+
+# --- Score Statistics ---
+
+def score_bucket(score: float) -> int:
+    """Maps a score to its histogram bucket index."""
+    return min(max(int(score * HISTOGRAM_BUCKETS / HISTOGRAM_MAX_SCORE), 0), HISTOGRAM_BUCKETS - 1)
+
+def record_application_score(session: Session, job_id: str, score: float):
+    """
+    Folds one application score into the job's running aggregates.
+    Uses atomic upserts so concurrent inserts don't lose updates; the caller
+    commits together with the application row.
+    """
+    score = float(score)
+    stats_insert = sqlite_insert(JobScoreStats).values(
+        job_id=job_id, count=1, score_sum=score, score_sq_sum=score * score,
+        min_score=score, max_score=score, histogram_max=HISTOGRAM_MAX_SCORE
+    )
+    session.exec(stats_insert.on_conflict_do_update(
+        index_elements=["job_id"],
+        set_={
+            "count": JobScoreStats.count + 1,
+            "score_sum": JobScoreStats.score_sum + score,
+            "score_sq_sum": JobScoreStats.score_sq_sum + score * score,
+            "min_score": func.min(JobScoreStats.min_score, score),
+            "max_score": func.max(JobScoreStats.max_score, score),
+        }
+    ))
+    bucket_insert = sqlite_insert(JobScoreBucket).values(job_id=job_id, bucket=score_bucket(score), count=1)
+    session.exec(bucket_insert.on_conflict_do_update(
+        index_elements=["job_id", "bucket"],
+        set_={"count": JobScoreBucket.count + 1}
+    ))
+
+def rebuild_job_score_stats(session: Session, job_id: str):
+    """Recomputes a job's aggregates from its applications (backfill and bucket migration for older databases)."""
+    for model in (JobScoreStats, JobScoreBucket):
+        for row in session.exec(select(model).where(model.job_id == job_id)).all():
+            session.delete(row)
+    session.flush()
+    scores = session.exec(select(Application.score).where(Application.job_id == job_id)).all()
+    for score in scores:
+        record_application_score(session, job_id, score)
+
+def adjust_job_score_stats(session: Session, job_id: str, removed: List[float] = (), added: List[float] = ()):
+    """
+    Applies changed scores to a job's aggregates as deltas: `removed` scores
+    leave, `added` ones join (a re-score is one of each). The application rows
+    must already be flushed; min/max are re-read through the (job_id, score)
+    index. Atomic updates, like record_application_score; the caller commits.
+    """
+    removed = [float(score) for score in removed]
+    added = [float(score) for score in added]
+    scores = select(Application.score).where(Application.job_id == job_id)
+    session.exec(
+        update(JobScoreStats)
+        .where(JobScoreStats.job_id == job_id)
+        .values(
+            count=JobScoreStats.count + len(added) - len(removed),
+            score_sum=JobScoreStats.score_sum + sum(added) - sum(removed),
+            score_sq_sum=JobScoreStats.score_sq_sum + sum(s * s for s in added) - sum(s * s for s in removed),
+            min_score=scores.with_only_columns(func.min(Application.score)).scalar_subquery(),
+            max_score=scores.with_only_columns(func.max(Application.score)).scalar_subquery(),
+        )
+    )
+    moves = Counter(score_bucket(score) for score in added)
+    moves.subtract(score_bucket(score) for score in removed)
+    for bucket, delta in moves.items():
+        if delta:
+            session.exec(
+                sqlite_insert(JobScoreBucket).values(job_id=job_id, bucket=bucket, count=delta)
+                .on_conflict_do_update(index_elements=["job_id", "bucket"], set_={"count": JobScoreBucket.count + delta})
+            )
+
+def get_job_score_stats(job_id: str) -> Optional[JobScoreStats]:
+    """
+    Returns a job's aggregates, backfilling them if the job has applications
+    but no stats yet, or rebuilding them if its buckets use another layout.
+    """
+    with Session(engine) as session:
+        stats = session.get(JobScoreStats, job_id)
+        if stats is None:
+            has_applications = session.exec(
+                select(Application.id).where(Application.job_id == job_id).limit(1)
+            ).first()
+            if not has_applications:
+                return None
+        if stats is None or stats.histogram_max != HISTOGRAM_MAX_SCORE:
+            rebuild_job_score_stats(session, job_id)
+            session.commit()
+            stats = session.get(JobScoreStats, job_id)
+        return stats
+
+def get_job_score_histogram(job_id: str) -> List[int]:
+    """Returns per-bucket application counts for a job."""
+    histogram = [0] * HISTOGRAM_BUCKETS
+    with Session(engine) as session:
+        for bucket in session.exec(select(JobScoreBucket).where(JobScoreBucket.job_id == job_id)).all():
+            histogram[bucket.bucket] = bucket.count
+    return histogram
+
+# --- Rescoring ---
+
+def _stale_application_condition(model_version: str):
+    """Scored by another model version, never versioned, or older than the resume/job it was scored from."""
+    return or_(
+        Application.model_version == None,
+        Application.model_version != model_version,
+        Application.scored_at == None,
+        User.profile_updated_at > Application.scored_at,
+        Job.scoring_changed_at > Application.scored_at,
+    )
+
+def _stale_applications(model_version: str, *columns):
+    return (
+        select(*columns)
+        .join(User, User.id == Application.user_id)
+        .join(Job, Job.id == Application.job_id)
+        .where(_stale_application_condition(model_version))
+    )
+
+def count_stale_applications(model_version: str) -> int:
+    with Session(engine) as session:
+        return session.exec(
+            _stale_applications(model_version, func.count()).select_from(Application)
+        ).one()
+
+def get_stale_application_batch(model_version: str, after_job_id: Optional[str], max_rows: int) -> List[Tuple[Job, List[tuple]]]:
+    """
+    Stale applications grouped by job, as [(Job, [(Application, User)])], for
+    whole jobs in id order after `after_job_id`, stopping once about
+    `max_rows` applications are collected (at least one job).
+    """
+    with Session(engine) as session:
+        statement = _stale_applications(model_version, Application.job_id, func.count()).select_from(Application)
+        if after_job_id is not None:
+            statement = statement.where(Application.job_id > after_job_id)
+        counts = session.exec(
+            statement.group_by(Application.job_id).order_by(Application.job_id).limit(max_rows)
+        ).all()
+
+        job_ids, rows = [], 0
+        for job_id, count in counts:
+            if job_ids and rows + count > max_rows:
+                break
+            job_ids.append(job_id)
+            rows += count
+        if not job_ids:
+            return []
+
+        groups = OrderedDict()
+        for app, user, job in session.exec(
+            _stale_applications(model_version, Application, User, Job)
+            .where(Application.job_id.in_(job_ids))
+            .order_by(Application.job_id)
+        ).all():
+            groups.setdefault(job.id, (job, []))[1].append((app, user))
+        return list(groups.values())
+
+def _store_scores(session: Session, scores: List[Tuple[str, float, Optional[str]]], model_version: str,
+                  read_at: str, only_provisional: bool = False) -> int:
+    """
+    Writes final (application id, score, scored_at as read) values computed
+    from inputs read at `read_at`, and applies the changes to the affected
+    jobs' aggregates; the caller commits. Rows re-scored since they were read
+    are left alone, and `read_at` becomes scored_at: a profile or job change
+    during inference still makes the new score stale. Returns how many rows
+    were updated.
+    """
+    new_scores = {application_id: (score, scored_at) for application_id, score, scored_at in scores}
+    statement = select(Application).where(Application.id.in_(list(new_scores)))
+    if only_provisional:
+        statement = statement.where(Application.provisional == True)
+    applications = [
+        application for application in session.exec(statement).all()
+        if application.scored_at == new_scores[application.id][1]
+    ]
+    changes = {}
+    for application in applications:
+        score = new_scores[application.id][0]
+        removed, added = changes.setdefault(application.job_id, ([], []))
+        removed.append(application.score)
+        added.append(score)
+        application.score = score
+        application.model_version = model_version
+        application.scored_at = read_at
+        application.provisional = False
+        session.add(application)
+    session.flush()
+    for job_id, (removed, added) in changes.items():
+        adjust_job_score_stats(session, job_id, removed, added)
+    return len(applications)
+
+def save_rescored_batch(run_id: int, scores: List[Tuple[str, float, Optional[str]]], model_version: str,
+                        read_at: str, cursor_job_id: str) -> RescoreRun:
+    """
+    Stores new (application id, score, scored_at as read) values (see
+    _store_scores), updates the affected jobs' aggregates and advances the
+    run's checkpoint, all in one transaction.
+    """
+    now = datetime.utcnow().isoformat()
+    with Session(engine) as session:
+        processed = _store_scores(session, scores, model_version, read_at)
+
+        run = session.get(RescoreRun, run_id)
+        run.processed += processed
+        run.batches += 1
+        run.cursor_job_id = cursor_job_id
+        run.updated_at = now
+        session.add(run)
+        session.commit()
+        session.refresh(run)
+        return run
+
+def get_provisional_applications(application_ids: Optional[List[str]] = None) -> List[Tuple[Application, Job, User]]:
+    """(Application, Job, User) for provisionally scored applications, optionally only the given ids."""
+    with Session(engine) as session:
+        statement = (
+            select(Application, Job, User)
+            .join(Job, Job.id == Application.job_id)
+            .join(User, User.id == Application.user_id)
+            .where(Application.provisional == True)
+        )
+        if application_ids is not None:
+            statement = statement.where(Application.id.in_(application_ids))
+        return session.exec(statement).all()
+
+def save_refined_scores(scores: List[Tuple[str, float, Optional[str]]], model_version: str, read_at: str) -> int:
+    """
+    Replaces provisional scores with refined ones in one transaction. Rows that
+    were finalized or re-scored in the meantime (e.g. by a rescoring run, or a
+    re-apply after a new resume) are left alone.
+    """
+    with Session(engine) as session:
+        updated = _store_scores(session, scores, model_version, read_at, only_provisional=True)
+        session.commit()
+        return updated
+
 # --- Seed Sample Data ---
 
 def seed_sample_jobs():
@@ -230,8 +998,9 @@ Stripe's intern program is designed to give you ownership of meaningful projects
             print("Sample jobs already exist, skipping seed.")
             return
         
+        from utils.job_features import enrich_job
         for job in sample_jobs:
-            session.add(job)
+            session.add(enrich_job(job))
         session.commit()
     
     print(f"Inserted {len(sample_jobs)} sample jobs.")
@@ -337,10 +1106,14 @@ def seed_test_user():
         else:
             print("Test users already exist, skipping seed.")
 
-def seed_sample_applications():
-    """Insert sample applications for each job (about 10 per job)."""
+def seed_sample_applications(batch_size: int = 32):
+    """
+    Insert sample applications for each job (about 10 per job).
+    All pairs are scored with one batched cross-encoder pass.
+    """
     import random
     from utils.semantics import semantics_instance
+    from utils.job_features import job_scoring_text
     
     with Session(engine) as session:
         # Check if applications already exist
@@ -361,32 +1134,34 @@ def seed_sample_applications():
             return
         
         print("Seeding applications with NLP scoring (this may take a moment)...")
-        applications_created = 0
+        selections = []
         for job in jobs:
             # Get applicants who are not the job poster
             eligible_applicants = [a for a in applicants if a.id != job.user_id]
             
             # Randomly select 8-12 applicants for this job
             num_applicants = min(len(eligible_applicants), random.randint(8, 12))
-            selected = random.sample(eligible_applicants, num_applicants)
-            
-            # Build job string for scoring
-            job_string = f"{job.title} {job.description} {job.requirements}"
-            
-            for applicant in selected:
-                # Build user data string for scoring
-                user_data = f"{applicant.skills} {applicant.experience} {applicant.education}"
-                
-                # Calculate real score using NLP pipeline
-                score = semantics_instance.get_final_score(job_string, user_data)
-                
-                app = Application(
-                    job_id=job.id,
-                    user_id=applicant.id,
-                    score=round(score, 3)
-                )
-                session.add(app)
-                applications_created += 1
+            for applicant in random.sample(eligible_applicants, num_applicants):
+                selections.append((job, applicant))
+        
+        # Score every (job, applicant) pair in batches
+        pairs = [
+            (job_scoring_text(job), f"{applicant.skills} {applicant.experience} {applicant.education}")
+            for job, applicant in selections
+        ]
+        scores = semantics_instance.get_final_scores(pairs, batch_size=batch_size)
+        scored_at = datetime.utcnow().isoformat()
+        
+        for (job, applicant), score in zip(selections, scores):
+            app = Application(
+                job_id=job.id,
+                user_id=applicant.id,
+                score=round(score, 3),
+                model_version=semantics_instance.version,
+                scored_at=scored_at
+            )
+            session.add(app)
+            record_application_score(session, job.id, app.score)
         
         session.commit()
-        print(f"Inserted {applications_created} sample applications with NLP scores.")
\ No newline at end of file
+        print(f"Inserted {len(selections)} sample applications with NLP scores.")
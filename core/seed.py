@@ -0,0 +1,128 @@
+"""
+Offline seeding and fixture snapshots.
+
+    python -m core.seed build --out fixtures/seed.json.gz   # seed + batch-score, then snapshot
+    python -m core.seed load --path fixtures/seed.json.gz   # bulk-load a snapshot into an empty DB
+
+On startup (see main.py) BMATS_SEED selects what happens:
+    fixtures (default) - bulk-load BMATS_SEED_FIXTURE into an empty database
+                         (warns and seeds nothing when the file is missing)
+    compute            - seed and score in-process (slow, needs the models)
+    skip               - do nothing (production)
+"""
+import argparse
+import gzip
+import json
+import os
+import time
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from core.database import (
+    engine, create_db_and_tables, seed_test_user, seed_sample_jobs, seed_sample_applications,
+    invalidate_job_cache, invalidate_user_cache,
+    User, Skill, UserSkill, Job, JobFingerprintBand, Application, JobScoreStats, JobScoreBucket
+)
+
+FIXTURE_VERSION = 1
+DEFAULT_FIXTURE = os.getenv("BMATS_SEED_FIXTURE", "./fixtures/seed.json.gz")
+
+# Insert order respects foreign keys
+SNAPSHOT_MODELS = [User, Skill, UserSkill, Job, JobFingerprintBand, Application, JobScoreStats, JobScoreBucket]
+
+def build_fixtures(path: str = DEFAULT_FIXTURE, batch_size: int = 32) -> dict:
+    """Seeds the configured database (scoring in batches) and writes a snapshot of it."""
+    from app.services.job_enrichment import JobEnrichmentService
+    from app.services.dedup import JobDedupService
+
+    create_db_and_tables()
+    seed_test_user()
+    seed_sample_jobs()
+    JobEnrichmentService.backfill()
+    JobDedupService.backfill()
+    seed_sample_applications(batch_size=batch_size)
+    return write_snapshot(path)
+
+def write_snapshot(path: str = DEFAULT_FIXTURE) -> dict:
+    """Dumps the seeded tables into a gzip-compressed JSON snapshot."""
+    snapshot = {"version": FIXTURE_VERSION, "tables": {}}
+    with Session(engine) as session:
+        for model in SNAPSHOT_MODELS:
+            rows = session.exec(select(model)).all()
+            snapshot["tables"][model.__tablename__] = [row.model_dump() for row in rows]
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with gzip.open(path, "wt") as f:
+        json.dump(snapshot, f)
+    counts = {name: len(rows) for name, rows in snapshot["tables"].items()}
+    print(f"Wrote fixture snapshot {path}: {counts}")
+    return counts
+
+def load_fixtures(path: str = DEFAULT_FIXTURE) -> bool:
+    """
+    Bulk-loads a snapshot in a single transaction. Skips when the file is
+    missing or the database already has users.
+    """
+    if not os.path.exists(path):
+        print(f"WARNING: no fixture snapshot at {path}, not seeding. Run `python -m core.seed build` "
+              f"to create one, or set BMATS_SEED=compute to seed and score in-process.")
+        return False
+
+    with Session(engine) as session:
+        if session.exec(select(User.id).limit(1)).first():
+            print("Database already seeded, skipping fixtures.")
+            return False
+
+    started = time.perf_counter()
+    with gzip.open(path, "rt") as f:
+        snapshot = json.load(f)
+    if snapshot.get("version") != FIXTURE_VERSION:
+        print(f"Fixture version {snapshot.get('version')} != {FIXTURE_VERSION}, skipping.")
+        return False
+
+    with Session(engine) as session:
+        for model in SNAPSHOT_MODELS:
+            rows = snapshot["tables"].get(model.__tablename__, [])
+            if rows:
+                session.exec(insert(model.__table__), params=rows)
+        try:
+            session.commit()
+        except IntegrityError:
+            # Another worker loaded the same snapshot first
+            session.rollback()
+            print("Fixtures were loaded concurrently by another worker, skipping.")
+            return False
+
+    invalidate_user_cache()
+    invalidate_job_cache()
+    counts = {name: len(rows) for name, rows in snapshot["tables"].items()}
+    print(f"Loaded fixtures {counts} in {time.perf_counter() - started:.3f}s")
+    return True
+
+def seed_on_startup():
+    """Startup seeding according to BMATS_SEED (fixtures | compute | skip)."""
+    mode = os.getenv("BMATS_SEED", "fixtures")
+    if mode == "skip":
+        return
+    if mode == "compute":
+        seed_test_user()  # Must run before jobs/applications
+        seed_sample_jobs()
+        seed_sample_applications()
+        return
+    load_fixtures(DEFAULT_FIXTURE)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or load seed fixture snapshots.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Seed the database with batched scoring and write a snapshot")
+    build.add_argument("--out", default=DEFAULT_FIXTURE)
+    build.add_argument("--batch-size", type=int, default=32)
+    load = subparsers.add_parser("load", help="Bulk-load a snapshot into an empty database")
+    load.add_argument("--path", default=DEFAULT_FIXTURE)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_fixtures(args.out, args.batch_size)
+    else:
+        create_db_and_tables()
+        load_fixtures(args.path)
@@ -72,7 +72,7 @@ function Applications({ currentUser, isActive }) {
                             <div className="applicationJob">{app.job_title}</div>
                             <div className="applicationCompany">{app.job_company}</div>
                             <span className={`applicationScore ${getScoreClass(app.score)}`}>
-                                Match: {formatScore(app.score)}
+                                Match: {formatScore(app.score)}{app.provisional ? ' (provisional)' : ''}
                             </span>
                         </div>
                     ))
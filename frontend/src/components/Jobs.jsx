@@ -1,6 +1,16 @@
 import { useState, useEffect } from 'react'
 import { createPortal } from 'react-dom'
 
+// Random v4 UUID; crypto.randomUUID only exists in secure contexts (HTTPS or localhost)
+function newIdempotencyKey() {
+    if (crypto.randomUUID) return crypto.randomUUID()
+    const bytes = crypto.getRandomValues(new Uint8Array(16))
+    bytes[6] = (bytes[6] & 0x0f) | 0x40
+    bytes[8] = (bytes[8] & 0x3f) | 0x80
+    const hex = Array.from(bytes, b => b.toString(16).padStart(2, '0')).join('')
+    return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`
+}
+
 // The job list pane
 function Jobs({ currentUser }) {
     const [jobs, setJobs] = useState([])
@@ -8,6 +18,8 @@ function Jobs({ currentUser }) {
     const [loading, setLoading] = useState(true)
     const [selectedJob, setSelectedJob] = useState(null)
     const [showPopup, setShowPopup] = useState(false)
+    // One Idempotency-Key per opened job, so repeated submits of the existing resume store one application
+    const [applyKey, setApplyKey] = useState(null)
     const [showAddJobModal, setShowAddJobModal] = useState(false)
     const [newJobForm, setNewJobForm] = useState({
         title: '',
@@ -40,6 +52,7 @@ function Jobs({ currentUser }) {
 
     const handleJobClick = (job) => {
         setSelectedJob(job)
+        setApplyKey(newIdempotencyKey())
         setShowPopup(true)
     }
 
@@ -63,9 +76,10 @@ function Jobs({ currentUser }) {
             })
             const userData = await uploadRes.json()
 
+            // A new resume must be scored again, so each upload gets its own key
             const appRes = await fetch('/api/applications/', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: { 'Content-Type': 'application/json', 'Idempotency-Key': newIdempotencyKey() },
                 body: JSON.stringify({
                     userId: userData.user_id,
                     jobId: selectedJob.id
@@ -73,7 +87,7 @@ function Jobs({ currentUser }) {
             })
             const appData = await appRes.json()
 
-            alert(`Application submitted! Score: ${(appData.score * 100).toFixed(1)}%`)
+            alert(`Application submitted! Score: ${(appData.score * 100).toFixed(1)}%${appData.provisional ? ' (provisional, refining)' : ''}`)
             handleClosePopup()
         } catch (error) {
             console.error('Error applying:', error)
@@ -87,14 +101,14 @@ function Jobs({ currentUser }) {
         try {
             const response = await fetch('/api/applications/', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: { 'Content-Type': 'application/json', 'Idempotency-Key': applyKey },
                 body: JSON.stringify({
                     userId: currentUser.id,
                     jobId: selectedJob.id
                 })
             })
             const data = await response.json()
-            alert(`Application submitted! Score: ${(data.score * 100).toFixed(1)}%`)
+            alert(`Application submitted! Score: ${(data.score * 100).toFixed(1)}%${data.provisional ? ' (provisional, refining)' : ''}`)
             handleClosePopup()
         } catch (error) {
             console.error('Error applying:', error)
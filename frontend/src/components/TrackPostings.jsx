@@ -1,6 +1,9 @@
 import { useState, useEffect } from 'react'
 import { createPortal } from 'react-dom'
 
+// Highest-scoring applicants listed per posting
+const APPLICANTS_SHOWN = 50
+
 // The track posting pane
 function TrackPostings({ currentUser, isActive }) {
     const [postedJobs, setPostedJobs] = useState([])
@@ -19,25 +22,16 @@ function TrackPostings({ currentUser, isActive }) {
 
     const fetchPostedJobs = async () => {
         try {
-            // Fetch jobs posted by the current user
-            const response = await fetch(`/api/users/${currentUser.id}/jobs`)
+            // Fetch the user's postings with applicant counts and top applicants in one request
+            const response = await fetch(`/api/users/${currentUser.id}/postings?top=${APPLICANTS_SHOWN}`)
             if (response.ok) {
-                const jobs = await response.json()
-
-                // For each job, fetch its applications
-                const jobsWithApplicants = await Promise.all(
-                    jobs.map(async (job) => {
-                        const appResponse = await fetch(`/api/applications/job/${job.id}`)
-                        const applicants = appResponse.ok ? await appResponse.json() : []
-                        return {
-                            ...job,
-                            expanded: false,
-                            applicants: applicants,
-                            applicationCount: applicants.length
-                        }
-                    })
-                )
-                setPostedJobs(jobsWithApplicants)
+                const postings = await response.json()
+                setPostedJobs(postings.map((job) => ({
+                    ...job,
+                    expanded: false,
+                    applicants: job.top_applicants,
+                    applicationCount: job.application_count
+                })))
             }
         } catch (error) {
             console.error('Error fetching posted jobs:', error)
@@ -231,7 +225,13 @@ function TrackPostings({ currentUser, isActive }) {
                                             No applications yet
                                         </div>
                                     ) : (
-                                        job.applicants.map((applicant) => (
+                                        <>
+                                        {job.applicationCount > job.applicants.length && (
+                                            <div style={{ padding: 'var(--space-sm) var(--space-lg)', color: 'var(--text-secondary)' }}>
+                                                Showing the top {job.applicants.length} of {job.applicationCount} applicants
+                                            </div>
+                                        )}
+                                        {job.applicants.map((applicant) => (
                                             <div
                                                 key={applicant.id}
                                                 className="applicantItem"
@@ -244,10 +244,11 @@ function TrackPostings({ currentUser, isActive }) {
                                                     <span className="applicantLabel">{applicant.user_email}</span>
                                                 </div>
                                                 <span className={`applicationScore ${getScoreClass(applicant.score)}`}>
-                                                    {(applicant.score * 100).toFixed(0)}%
+                                                    {(applicant.score * 100).toFixed(0)}%{applicant.provisional ? ' (provisional)' : ''}
                                                 </span>
                                             </div>
-                                        ))
+                                        ))}
+                                        </>
                                     )}
                                 </div>
                             )}
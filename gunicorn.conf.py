@@ -0,0 +1,21 @@
+# Prefork deployment: gunicorn -c gunicorn.conf.py main:app
+#
+# With preload_app the cross-encoder and spaCy pipelines are loaded once in the
+# master and shared copy-on-write by every worker instead of once per worker.
+import os
+
+bind = os.getenv("BMATS_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("BMATS_WORKERS", "4"))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = os.getenv("BMATS_PRELOAD", "1") == "1"
+timeout = int(os.getenv("BMATS_WORKER_TIMEOUT", "120"))
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded, before workers are forked
+    if preload_app:
+        from utils.prefork import prepare_for_fork
+        prepare_for_fork()
+
+def post_fork(server, worker):
+    from utils.prefork import after_fork
+    after_fork()
@@ -0,0 +1,97 @@
+import gzip
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+class RawArchive:
+    """
+    Append-only archive of raw API responses.
+
+    Each response is one JSON line compressed as its own gzip member and
+    appended to the current `segment-NNNNNN.jsonl.gz`, so a segment is still a
+    valid (multi-member) gzip file while single records can be read back by
+    seeking to their byte offset. `index.jsonl` maps every record to
+    (query, offset) -> (segment, byte range).
+    """
+
+    def __init__(self, root: str = "./raw_archive", segment_max_bytes: int = 64 * 1024 * 1024):
+        self.root = root
+        self.segment_max_bytes = segment_max_bytes
+        self.index_path = os.path.join(root, "index.jsonl")
+        self.lock = threading.Lock()
+        self.entries: List[Dict[str, Any]] = []
+        os.makedirs(root, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.entries = [json.loads(line) for line in f if line.strip()]
+        self.segment = max((e["segment"] for e in self.entries), default=1)
+
+    @staticmethod
+    def query_key(title: str, location: str, date: str) -> str:
+        return f"{title.strip().lower()}|{location.strip().lower()}|{date.strip().lower()}"
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.root, f"segment-{segment:06d}.jsonl.gz")
+
+    def append(self, title: str, location: str, date: str, offset: int, payload: Any):
+        """Archives one raw response body for (title, location, date, offset)."""
+        fetched_at = datetime.utcnow().isoformat()
+        record = {"title": title, "location": location, "date": date, "offset": offset,
+                  "fetched_at": fetched_at, "payload": payload}
+        blob = gzip.compress((json.dumps(record) + "\n").encode())
+
+        with self.lock:
+            path = self._segment_path(self.segment)
+            if os.path.exists(path) and os.path.getsize(path) + len(blob) > self.segment_max_bytes:
+                self.segment += 1
+                path = self._segment_path(self.segment)
+            with open(path, "ab") as f:
+                byte_offset = f.tell()
+                f.write(blob)
+            entry = {"query": self.query_key(title, location, date), "offset": offset, "segment": self.segment,
+                     "byte_offset": byte_offset, "byte_length": len(blob), "fetched_at": fetched_at}
+            with open(self.index_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+            self.entries.append(entry)
+
+    def read(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Reads back a single archived record."""
+        with open(self._segment_path(entry["segment"]), "rb") as f:
+            f.seek(entry["byte_offset"])
+            return json.loads(gzip.decompress(f.read(entry["byte_length"])))
+
+    def latest(self, title: str, location: str, date: str) -> Dict[int, Dict[str, Any]]:
+        """Most recent index entry per offset for a query."""
+        key = self.query_key(title, location, date)
+        with self.lock:
+            entries = [e for e in self.entries if e["query"] == key]
+        latest = {}
+        for entry in entries:
+            latest[entry["offset"]] = entry
+        return latest
+
+    def replay_pages(self, title: str, location: str, date: str, pages: Optional[int] = None,
+                     start_offset: int = 0) -> Iterator[Tuple[int, Any]]:
+        """
+        Yields (offset, raw payload) for a query in offset order from the
+        archive alone, using the newest capture of each offset.
+        """
+        latest = self.latest(title, location, date)
+        offsets = sorted(o for o in latest if o >= start_offset)
+        if pages is not None:
+            offsets = offsets[:pages]
+        for offset in offsets:
+            yield offset, self.read(latest[offset])["payload"]
+
+    def queries(self) -> List[Tuple[str, str, str]]:
+        """Distinct (title, location, date) queries present in the archive."""
+        seen = {}
+        with self.lock:
+            entries = list(self.entries)
+        for entry in entries:
+            if entry["query"] not in seen:
+                record = self.read(entry)
+                seen[entry["query"]] = (record["title"], record["location"], record["date"])
+        return list(seen.values())
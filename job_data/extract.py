@@ -1,22 +1,127 @@
 import requests
 import os
+import time
+import random
+import threading
 import dotenv
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+from .archive import RawArchive
 
 dotenv.load_dotenv()
 
+# Offset step between pages of the internships API
+PAGE_SIZE = 10
+
+# Status codes worth retrying: throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`.
+    acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
 class JobExtractor:
-    def __init__(self):
+    def __init__(self, host_url: Optional[str] = None, timeout: float = 10.0, max_retries: int = 4,
+                 backoff_factor: float = 0.5, rate_limit: Optional[float] = None, pool_size: int = 10,
+                 archive: Optional[RawArchive] = None):
         self.api_key = os.getenv("RAPID_API_KEY")
-        self.host_url = "https://internships-api.p.rapidapi.com/active-jb-7d"
+        self.host_url = host_url or os.getenv("JOB_API_URL", "https://internships-api.p.rapidapi.com/active-jb-7d")
         self.headers = {
             "x-rapidapi-host": "internships-api.p.rapidapi.com",
             "x-rapidapi-key": self.api_key
         }
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+        # When set, every raw response body is archived before normalization
+        self.archive = archive
+
+        # One pooled session reused for every request (keep-alive, shared TLS)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(self.headers)
+
+    def _get_with_retry(self, params: Dict[str, str]) -> requests.Response:
+        """
+        GET with the configured timeout, retrying 429/5xx and connection errors
+        with exponential backoff (honouring Retry-After when the server sends one).
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.get(self.host_url, params=params, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response
+                delay = self._retry_after(response)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                delay = None
+
+            if delay is None:
+                delay = self.backoff_factor * (2 ** attempt) * (1 + random.random() * 0.1)
+            attempt += 1
+            print(f"EXTRACT: retry {attempt}/{self.max_retries} for offset {params.get('offset')} in {delay:.2f}s")
+            time.sleep(delay)
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _normalize(data: Any) -> List[Dict[str, Any]]:
+        """Normalize response to a list."""
+        if isinstance(data, list):
+            return data
+        elif isinstance(data, dict):
+            if "job_postings" in data:
+                return data["job_postings"]
+            elif "jobs" in data:
+                return data["jobs"]
+            else:
+                # Fallback: assume dict values are jobs or it's a single page dict
+                # Using values() just in case it's id-keyed
+                return list(data.values())
+        return []
 
     def fetch_jobs(self, title: str = "software engineer", location: str = "us", date: str = "any", offset: int = 0) -> List[Dict[str, Any]]:
         """
-        Fetches raw job data from the API.
+        Fetches raw job data from the API. Errors that survive the retries
+        (and unparseable responses) are raised, so the run records a failure
+        instead of mistaking them for an empty page.
         """
         params = {
             "title_filter": title,
@@ -24,27 +129,66 @@ class JobExtractor:
             "date_filter": date,
             "offset": str(offset)
         }
-        
-        print(f"EXTRACT: Fetching jobs for query: '{title}' in '{location}'...")
+
+        print(f"EXTRACT: Fetching jobs for query: '{title}' in '{location}' (offset {offset})...")
         try:
-            response = requests.get(self.host_url, headers=self.headers, params=params)
-            response.raise_for_status()
+            response = self._get_with_retry(params)
             data = response.json()
-            
-            # Normalize response to a list
-            if isinstance(data, list):
-                return data
-            elif isinstance(data, dict):
-                if "job_postings" in data:
-                    return data["job_postings"]
-                elif "jobs" in data:
-                    return data["jobs"]
-                else:
-                    # Fallback: assume dict values are jobs or it's a single page dict
-                    # Using values() just in case it's id-keyed
-                    return list(data.values())
-            return []
-            
+            if self.archive:
+                self.archive.append(title, location, date, offset, data)
+            return self._normalize(data)
         except Exception as e:
             print(f"EXTRACT ERROR: {e}")
-            return []
+            raise
+
+    def close(self):
+        self.session.close()
+
+class ConcurrentJobExtractor(JobExtractor):
+    """
+    Fetches pages on a thread pool sharing one pooled session.
+    `max_workers` bounds concurrent requests; `rate_limit` (requests/second)
+    is enforced across all workers by the shared token bucket.
+    """
+
+    def __init__(self, max_workers: int = 4, **kwargs):
+        kwargs.setdefault("pool_size", max_workers)
+        super().__init__(**kwargs)
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-extract")
+
+    def fetch_pages(self, title: str = "software engineer", location: str = "us", date: str = "any",
+                    pages: int = 1, start_offset: int = 0) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Yields (offset, jobs) in page order while keeping up to `max_workers`
+        requests in flight. Stops submitting new pages after the first empty one.
+        """
+        offsets = iter(range(start_offset, start_offset + pages * PAGE_SIZE, PAGE_SIZE))
+        in_flight = deque()
+
+        def submit_next() -> bool:
+            offset = next(offsets, None)
+            if offset is None:
+                return False
+            in_flight.append((offset, self.executor.submit(self.fetch_jobs, title, location, date, offset)))
+            return True
+
+        for _ in range(self.max_workers):
+            if not submit_next():
+                break
+
+        try:
+            while in_flight:
+                offset, future = in_flight.popleft()
+                jobs = future.result()
+                if not jobs:
+                    return
+                submit_next()
+                yield offset, jobs
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        super().close()
@@ -1,6 +1,13 @@
 from sqlmodel import Session, select
-from core.database import engine, Job, add_job
-from typing import Dict, Any
+from core.database import engine, Job, add_job, invalidate_job_cache
+from typing import Dict, Any, Callable, List, Optional
+from utils.job_features import enrich_job
+from app.services.dedup import JobDedupService
+
+# Fields refreshed when a known posting changes upstream
+TRACKED_FIELDS = ("title", "company", "description", "organization_url", "location", "date_posted", "salary")
+# ...of which these are part of the cross-encoder input (job_scoring_text)
+SCORED_FIELDS = {"title", "description"}
 
 class JobLoader:
     def __init__(self):
@@ -24,7 +31,9 @@ class JobLoader:
                     return False
             
             # Create and save job
-            db_job = Job(**job_data)
+            db_job = enrich_job(Job(**job_data))
+            if not JobDedupService.fingerprint_job(session, db_job, allow_suppress=True):
+                return False
             session.add(db_job)
             session.commit()
             return True
@@ -37,4 +46,66 @@ class JobLoader:
         for job in jobs_data:
             if self.load_job(job):
                 count += 1
+        if count:
+            invalidate_job_cache()
         return count
+
+    def load_page(self, jobs_data: List[Dict[str, Any]],
+                  is_known: Optional[Callable[[str], bool]] = None) -> Dict[str, int]:
+        """
+        Upserts a page of transformed jobs in one transaction, looking up all
+        known source_ids with a single query. New and changed jobs are
+        enriched (required skills) and fingerprinted in the same
+        batch; near-duplicates are linked to their canonical job, or dropped
+        above the suppression threshold.
+        `is_known` tells ids seen on earlier runs (Watermark.is_known); one
+        without a job row was suppressed then and counts as unchanged.
+        Returns {"new", "updated", "unchanged", "duplicates"} counts
+        ("duplicates" are the ones suppressed now).
+        """
+        counts = {"new": 0, "updated": 0, "unchanged": 0, "duplicates": 0}
+        jobs_data = [job for job in jobs_data if job]
+        if not jobs_data:
+            return counts
+
+        source_ids = [job["source_id"] for job in jobs_data if job.get("source_id")]
+        with Session(self.engine) as session:
+            existing = {}
+            if source_ids:
+                rows = session.exec(select(Job).where(Job.source_id.in_(source_ids))).all()
+                existing = {row.source_id: row for row in rows}
+
+            for job_data in jobs_data:
+                current = existing.get(job_data.get("source_id"))
+                if current is None and is_known and job_data.get("source_id") and is_known(job_data["source_id"]):
+                    counts["unchanged"] += 1
+                    continue
+                if current is None:
+                    db_job = enrich_job(Job(**job_data))
+                    if not JobDedupService.fingerprint_job(session, db_job, allow_suppress=True):
+                        counts["duplicates"] += 1
+                        continue
+                    session.add(db_job)
+                    if db_job.source_id:
+                        existing[db_job.source_id] = db_job
+                    counts["new"] += 1
+                    continue
+
+                changed = set()
+                for field in TRACKED_FIELDS:
+                    value = job_data.get(field)
+                    if value is not None and getattr(current, field) != value:
+                        setattr(current, field, value)
+                        changed.add(field)
+                if changed:
+                    enrich_job(current, text_changed=bool(changed & SCORED_FIELDS))
+                    JobDedupService.fingerprint_job(session, current)
+                    session.add(current)
+                    counts["updated"] += 1
+                else:
+                    counts["unchanged"] += 1
+            session.commit()
+
+        if counts["new"] or counts["updated"]:
+            invalidate_job_cache()
+        return counts
@@ -1,43 +1,142 @@
-from etl.extract import JobExtractor
-from etl.transform import JobTransformer
-from etl.load import JobLoader
+import argparse
+import queue
+import time
+from typing import Optional
+from .extract import ConcurrentJobExtractor
+from .transform import JobTransformer
+from .load import JobLoader
+from .watermark import WatermarkStore
+from .streaming import StreamingRunner
+from .archive import RawArchive
 
 class JobPipeline:
-    def __init__(self):
-        self.extractor = JobExtractor()
+    def __init__(self, concurrency: int = 4, rate_limit: float = None, queue_size: int = 4,
+                 archive: Optional[RawArchive] = None, **extractor_options):
+        self.archive = archive
+        self.extractor = ConcurrentJobExtractor(max_workers=concurrency, rate_limit=rate_limit, archive=archive,
+                                                **extractor_options)
         self.transformer = JobTransformer()
         self.loader = JobLoader()
+        self.watermarks = WatermarkStore()
+        self.queue_size = queue_size
+        self.runner: Optional[StreamingRunner] = None
+        self.last_report: Optional[dict] = None
 
-    def run(self, title: str = "software engineer", location: str = "us", date: str = "any", pages: int = 1):
+    def run(self, title: str = "software engineer", location: str = "us", date: str = "any", pages: int = 1,
+            incremental: bool = True, replay: bool = False) -> dict:
         """
-        Runs the full ETL pipeline.
+        Runs the full ETL pipeline as streaming stages:
+        extract (thread, concurrent fetches) -> transform (thread) -> load (caller),
+        connected by bounded queues so fetching page N+1 overlaps with
+        transforming and loading page N.
+        In incremental mode paging stops at the first page that holds nothing
+        new or changed, and the query's watermark is advanced; copies suppressed
+        on an earlier run are recognized from it and count as unchanged.
+        With `replay=True` pages come from the raw archive instead of the API
+        (no network), and every archived page is re-transformed and reloaded.
+        Returns {"pages", "new", "updated", "unchanged", "duplicates"} counts; per-stage
+        throughput and queue depths are kept in `last_report`.
         """
-        total_added = 0
-        
-        for i in range(pages):
-            offset = i * 10 # Assuming 10 items per page default or similar
-            
-            print(f"--- Pipeline Step 1: Extract (Page {i+1}) ---")
-            raw_jobs = self.extractor.fetch_jobs(title, location, date, offset)
-            print(f"Extracted {len(raw_jobs)} items.")
-            
-            if not raw_jobs:
-                break
-                
-            print(f"--- Pipeline Step 2: Transform ---")
-            transformed_jobs = []
-            for raw in raw_jobs:
-                transformed = self.transformer.transform(raw)
-                if transformed:
-                    transformed_jobs.append(transformed)
-            
-            print(f"--- Pipeline Step 3: Load ---")
-            added = self.loader.load_batch(transformed_jobs)
-            total_added += added
-            print(f"Loaded {added} new jobs from this batch.")
-            
-        print(f"=== ETL Pipeline Complete. Total New Jobs: {total_added} ===")
+        stats = {"pages": 0, "new": 0, "updated": 0, "unchanged": 0, "duplicates": 0}
+        if replay:
+            if not self.archive:
+                raise ValueError("Replay mode needs a RawArchive")
+            # Re-applying a changed transform must touch every page, not stop at the first known one
+            incremental = False
+            raw_pages = (
+                (offset, self.extractor._normalize(payload))
+                for offset, payload in self.archive.replay_pages(title, location, date, pages)
+            )
+        else:
+            raw_pages = self.extractor.fetch_pages(title, location, date, pages)
+        watermark = self.watermarks.load(title, location)
+        runner = self.runner = StreamingRunner(self.queue_size)
+        # Page lists handed back by the load stage for the transform stage to refill
+        free_lists = queue.SimpleQueue()
+
+        def transform_page(page):
+            offset, raw_jobs = page
+            try:
+                out = free_lists.get_nowait()
+            except queue.Empty:
+                out = None
+            return offset, self.transformer.transform_batch(raw_jobs, out)
+
+        pages_stream = runner.source("extract", raw_pages, size=lambda page: len(page[1]))
+        transformed_stream = runner.map("transform", transform_page, pages_stream, size=lambda page: len(page[1]))
+        load_stats = runner.sink_stats("load")
+
+        drained = False
+        try:
+            for offset, transformed_jobs in transformed_stream:
+                stats["pages"] += 1
+                t0 = time.perf_counter()
+
+                # Loaded even when the watermark knows every id: known postings may have been updated
+                source_ids = [job["source_id"] for job in transformed_jobs]
+                counts = self.loader.load_page(transformed_jobs, watermark.is_known if incremental else None)
+                for key, value in counts.items():
+                    stats[key] += value
+                watermark.advance(source_ids)
+                load_stats.record(len(transformed_jobs), time.perf_counter() - t0)
+                free_lists.put(transformed_jobs)
+                print(f"LOAD: offset {offset}: {counts['new']} new, {counts['updated']} updated, "
+                      f"{counts['unchanged']} unchanged, {counts['duplicates']} duplicates suppressed.")
+
+                if incremental and counts["new"] == 0 and counts["updated"] == 0 and counts["duplicates"] == 0:
+                    print(f"Page at offset {offset} fully known, stopping.")
+                    break
+            else:
+                drained = True
+        finally:
+            # Early stop, error or external cancel(): unblock and wind down upstream stages
+            if not drained:
+                runner.cancel()
+            runner.join()
+            load_stats.finish()
+            if not replay:
+                self.watermarks.save(watermark)
+            self.last_report = runner.report()
+
+        if runner.errors:
+            raise runner.errors[0]
+
+        print(f"=== ETL Pipeline Complete. New: {stats['new']}, Updated: {stats['updated']}, "
+              f"Unchanged: {stats['unchanged']}, Duplicates: {stats['duplicates']} ({stats['pages']} pages) ===")
+        return stats
+
+    def cancel(self):
+        """Stops a run in progress (safe to call from another thread)."""
+        if self.runner:
+            self.runner.cancel()
+
+    def run_queries(self, queries: list, pages: int = 1, incremental: bool = True, replay: bool = False) -> dict:
+        """
+        Runs the pipeline for several {"title", "location", "date"} queries.
+        Returns the summed counts.
+        """
+        totals = {"pages": 0, "new": 0, "updated": 0, "unchanged": 0, "duplicates": 0}
+        for query in queries:
+            for key, value in self.run(pages=pages, incremental=incremental, replay=replay, **query).items():
+                totals[key] += value
+        return totals
+
+    def replay_all(self) -> dict:
+        """Re-transforms and reloads every query in the archive."""
+        queries = [{"title": t, "location": l, "date": d} for t, l, d in self.archive.queries()]
+        return self.run_queries(queries, pages=None, replay=True)
 
 if __name__ == "__main__":
-    pipeline = JobPipeline()
-    pipeline.run(title="software engineer", location="San Francisco, CA")
+    parser = argparse.ArgumentParser(description="Run the job ETL pipeline.")
+    parser.add_argument("--title", default="software engineer")
+    parser.add_argument("--location", default="San Francisco, CA")
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--archive-dir", help="Archive raw API responses here (required for --replay)")
+    parser.add_argument("--replay", action="store_true", help="Rebuild from the archive without calling the API")
+    parser.add_argument("--full", action="store_true", help="Ignore the watermark and walk every page")
+    args = parser.parse_args()
+
+    archive = RawArchive(args.archive_dir) if args.archive_dir else None
+    pipeline = JobPipeline(archive=archive)
+    pipeline.run(title=args.title, location=args.location, pages=args.pages,
+                 incremental=not args.full, replay=args.replay)
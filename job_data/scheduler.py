@@ -0,0 +1,139 @@
+import json
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlmodel import Session, select
+from core.database import engine, EtlRun, acquire_lease, release_lease
+
+DEFAULT_QUERIES = [{"title": "software engineer", "location": "us"}]
+
+class EtlScheduler:
+    """
+    Runs the configured ETL queries every `interval` seconds (+/- `jitter`) on a
+    daemon thread, off the request path. A database lease makes the run
+    single-flight across every worker sharing the database: whoever holds it
+    runs, the others skip that tick.
+    """
+
+    LEASE_NAME = "etl-scheduler"
+
+    def __init__(self, queries: Optional[List[Dict[str, str]]] = None, interval: float = 86400,
+                 jitter: float = 300, pages: int = 5, initial_delay: Optional[float] = None,
+                 pipeline_options: Optional[dict] = None):
+        self.queries = queries or DEFAULT_QUERIES
+        self.interval = interval
+        self.jitter = jitter
+        self.pages = pages
+        # First run soon after startup (spread by jitter) unless told otherwise
+        self.initial_delay = initial_delay if initial_delay is not None else random.uniform(0, jitter)
+        self.pipeline_options = pipeline_options or {}
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # Long enough to cover a slow run; renewed between queries
+        self.lease_ttl = max(interval / 2, 600)
+
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.pipeline = None
+        self.running = False
+        self.next_run_at: Optional[float] = None
+        self.counters = {"runs": 0, "failures": 0, "skipped_lease_held": 0, "rows_added": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["EtlScheduler"]:
+        """Builds a scheduler from BMATS_ETL_* settings, or None when disabled."""
+        if os.getenv("BMATS_ETL_SCHEDULE", "0") != "1":
+            return None
+        queries = json.loads(os.getenv("BMATS_ETL_QUERIES", "null")) or DEFAULT_QUERIES
+        initial_delay = os.getenv("BMATS_ETL_INITIAL_DELAY")
+        return cls(
+            queries=queries,
+            interval=float(os.getenv("BMATS_ETL_INTERVAL", "86400")),
+            jitter=float(os.getenv("BMATS_ETL_JITTER", "300")),
+            pages=int(os.getenv("BMATS_ETL_PAGES", "5")),
+            initial_delay=float(initial_delay) if initial_delay is not None else None,
+            pipeline_options={"rate_limit": float(os.getenv("BMATS_ETL_RATE_LIMIT", "2"))}
+        )
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, name="etl-scheduler", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self.stop_event.set()
+        if self.pipeline:
+            self.pipeline.cancel()
+        if self.thread:
+            self.thread.join(timeout)
+
+    def _loop(self):
+        delay = self.initial_delay
+        while True:
+            self.next_run_at = time.time() + delay
+            if self.stop_event.wait(delay):
+                return
+            self.run_once()
+            delay = max(self.interval + random.uniform(-self.jitter, self.jitter), 1)
+
+    def run_once(self) -> Optional[EtlRun]:
+        """Runs every query once if this process can take the lease."""
+        if not acquire_lease(self.LEASE_NAME, self.owner, self.lease_ttl):
+            self.counters["skipped_lease_held"] += 1
+            print("ETL SCHEDULER: another worker holds the lease, skipping.")
+            return None
+
+        from .pipeline import JobPipeline
+
+        self.running = True
+        started = time.perf_counter()
+        run = EtlRun(owner=self.owner, started_at=datetime.utcnow().isoformat())
+        try:
+            self.pipeline = JobPipeline(**self.pipeline_options)
+            for query in self.queries:
+                if self.stop_event.is_set():
+                    break
+                stats = self.pipeline.run(pages=self.pages, **query)
+                for key, value in stats.items():
+                    setattr(run, key, getattr(run, key) + value)
+                acquire_lease(self.LEASE_NAME, self.owner, self.lease_ttl)
+            self.counters["rows_added"] += run.new
+        except Exception as e:
+            self.counters["failures"] += 1
+            run.error = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        finally:
+            if self.pipeline:
+                self.pipeline.extractor.close()
+            self.pipeline = None
+            self.running = False
+            self.counters["runs"] += 1
+            run.finished_at = datetime.utcnow().isoformat()
+            run.duration_seconds = round(time.perf_counter() - started, 3)
+            with Session(engine) as session:
+                session.add(run)
+                session.commit()
+                session.refresh(run)
+            release_lease(self.LEASE_NAME, self.owner)
+        return run
+
+    def status(self) -> dict:
+        """Local scheduler state plus the most recent runs from any worker."""
+        with Session(engine) as session:
+            recent = session.exec(select(EtlRun).order_by(EtlRun.id.desc()).limit(10)).all()
+        return {
+            "enabled": True,
+            "owner": self.owner,
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "jitter_seconds": self.jitter,
+            "queries": self.queries,
+            "next_run_at": datetime.utcfromtimestamp(self.next_run_at).isoformat() if self.next_run_at else None,
+            "counters": dict(self.counters),
+            "last_run": recent[0] if recent else None,
+            "recent_runs": recent
+        }
@@ -0,0 +1,183 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# End-of-stream marker passed through channels
+DONE = object()
+
+class StageStats:
+    """Throughput counters for one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def record(self, items: int, seconds: float):
+        self.batches += 1
+        self.items += items
+        self.busy_seconds += seconds
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "elapsed_seconds": round(elapsed, 4),
+            "items_per_second": round(self.items / elapsed, 2) if elapsed > 0 else 0.0,
+            "utilization": round(self.busy_seconds / elapsed, 3) if elapsed > 0 else 0.0
+        }
+
+class Channel:
+    """
+    Bounded queue between two stages. put/iteration poll the runner's cancel
+    event so neither side can block forever after a cancellation.
+    """
+
+    def __init__(self, name: str, maxsize: int, cancelled: threading.Event):
+        self.name = name
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.cancelled = cancelled
+        self.max_depth = 0
+        self.depth_total = 0
+        self.samples = 0
+
+    def put(self, item: Any) -> bool:
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            depth = self.queue.qsize()
+            self.max_depth = max(self.max_depth, depth)
+            self.depth_total += depth
+            self.samples += 1
+            return True
+        return False
+
+    def close(self):
+        # After a cancel the consumer stops on the event instead of the marker
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(DONE, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            try:
+                item = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                if self.cancelled.is_set():
+                    return
+                continue
+            if item is DONE:
+                return
+            yield item
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "maxsize": self.queue.maxsize,
+            "depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "mean_depth": round(self.depth_total / self.samples, 2) if self.samples else 0.0
+        }
+
+class StreamingRunner:
+    """
+    Connects generator stages with bounded channels, each producer stage on its
+    own thread, so a slow downstream stage overlaps with upstream I/O.
+    """
+
+    def __init__(self, queue_size: int = 4):
+        self.queue_size = queue_size
+        self.cancelled = threading.Event()
+        self.stages: Dict[str, StageStats] = {}
+        self.channels: List[Channel] = []
+        self.threads: List[threading.Thread] = []
+        self.errors: List[BaseException] = []
+
+    def _spawn(self, name: str, produce: Callable[[StageStats], Iterator[Any]]) -> Iterator[Any]:
+        stats = StageStats(name)
+        channel = Channel(name, self.queue_size, self.cancelled)
+        self.stages[name] = stats
+        self.channels.append(channel)
+
+        def worker():
+            try:
+                for item in produce(stats):
+                    if self.cancelled.is_set() or not channel.put(item):
+                        break
+            except BaseException as e:
+                self.errors.append(e)
+                self.cancel()
+            finally:
+                stats.finish()
+                channel.close()
+
+        thread = threading.Thread(target=worker, name=f"etl-{name}", daemon=True)
+        self.threads.append(thread)
+        thread.start()
+        return iter(channel)
+
+    def source(self, name: str, iterable: Iterable[Any], size: Callable[[Any], int] = lambda item: 1) -> Iterator[Any]:
+        """Pulls `iterable` on a background thread; returns an iterator over its items."""
+
+        def produce(stats: StageStats):
+            iterator = iter(iterable)
+            try:
+                while True:
+                    t0 = time.perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                    stats.record(size(item), time.perf_counter() - t0)
+                    yield item
+            finally:
+                if hasattr(iterator, "close"):
+                    iterator.close()
+
+        return self._spawn(name, produce)
+
+    def map(self, name: str, fn: Callable[[Any], Any], upstream: Iterable[Any],
+            size: Callable[[Any], int] = lambda item: 1) -> Iterator[Any]:
+        """Applies `fn` to every upstream item on a background thread."""
+
+        def produce(stats: StageStats):
+            for item in upstream:
+                t0 = time.perf_counter()
+                result = fn(item)
+                stats.record(size(result), time.perf_counter() - t0)
+                yield result
+
+        return self._spawn(name, produce)
+
+    def sink_stats(self, name: str) -> StageStats:
+        """Stats holder for a stage driven by the caller's own thread."""
+        self.stages[name] = StageStats(name)
+        return self.stages[name]
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def join(self, timeout: float = 5.0):
+        deadline = time.monotonic() + timeout
+        for thread in self.threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "stages": {name: stats.as_dict() for name, stats in self.stages.items()},
+            "queues": {channel.name: channel.as_dict() for channel in self.channels},
+            "cancelled": self.cancelled.is_set()
+        }
@@ -0,0 +1,132 @@
+"""
+Local stand-in for the internships API, for exercising the ETL without
+touching the real (rate-limited) endpoint.
+
+    python -m job_data.stub_server --port 8765 --jobs 300 --throttle-every 5
+    JOB_API_URL=http://127.0.0.1:8765/active-jb-7d python -m job_data.pipeline
+"""
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, Any, List
+
+from .extract import PAGE_SIZE
+
+_WORDS = ("python", "react", "cloud", "data", "mobile", "security", "testing", "design", "api", "kubernetes",
+          "ml", "analytics", "backend", "frontend", "devops", "research", "payments", "search", "ads", "infra")
+
+def make_job(index: int, title: str = "software engineer", location: str = "us") -> Dict[str, Any]:
+    """Builds one fake posting shaped like the real API payload."""
+    return {
+        "id": str(1000000 + index),
+        "title": f"{title.title()} Intern #{index}",
+        "organization": f"Company {index % 37}",
+        "organization_url": f"https://example.com/company-{index % 37}",
+        "description": f"Work on {title} projects in {location}. Focus: "
+                       + " ".join(_WORDS[(index * 7 + j * (index % 5 + 1)) % len(_WORDS)] + str(index + j) for j in range(12)),
+        "date_posted": (datetime(2026, 1, 1) + timedelta(hours=index)).isoformat(),
+        "locations_raw": [{"address": {"addressLocality": "Toronto", "addressRegion": "ON", "addressCountry": "CA"}}],
+        "salary_raw": {"currency": "CAD", "value": {"minValue": 20 + index % 10, "maxValue": 30 + index % 10, "unitText": "HOUR"}},
+    }
+
+class StubJobAPI:
+    """
+    Serves `total_jobs` postings newest first, in pages of PAGE_SIZE keyed by
+    `offset`; raising `total_jobs` simulates new postings arriving.
+    Every `throttle_every`-th request gets a 429 with Retry-After, every
+    `fail_every`-th a 503, and each response is delayed by `latency` seconds.
+    """
+
+    def __init__(self, total_jobs: int = 100, latency: float = 0.05, throttle_every: int = 0,
+                 fail_every: int = 0, retry_after: float = 0.1):
+        self.total_jobs = total_jobs
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.fail_every = fail_every
+        self.retry_after = retry_after
+        self.requests = 0
+        self.throttled = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def page(self, params: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        offset = int(params.get("offset", ["0"])[0])
+        title = params.get("title_filter", ["software engineer"])[0]
+        location = params.get("location_filter", ["us"])[0]
+        end = min(offset + PAGE_SIZE, self.total_jobs)
+        return [make_job(self.total_jobs - 1 - i, title, location) for i in range(offset, end)]
+
+    def make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with api.lock:
+                    api.requests += 1
+                    n = api.requests
+                    api.in_flight += 1
+                    api.max_in_flight = max(api.max_in_flight, api.in_flight)
+                try:
+                    time.sleep(api.latency)
+                    if api.throttle_every and n % api.throttle_every == 0:
+                        with api.lock:
+                            api.throttled += 1
+                        self._send(429, {"message": "Too Many Requests"}, {"Retry-After": str(api.retry_after)})
+                    elif api.fail_every and n % api.fail_every == 0:
+                        with api.lock:
+                            api.failed += 1
+                        self._send(503, {"message": "Service Unavailable"})
+                    else:
+                        self._send(200, api.page(parse_qs(urlparse(self.path).query)))
+                finally:
+                    with api.lock:
+                        api.in_flight -= 1
+
+            def _send(self, status, body, headers=None):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+        """Starts the server on a daemon thread and returns it (port 0 picks a free port)."""
+        server = ThreadingHTTPServer((host, port), self.make_handler())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    @staticmethod
+    def url(server: ThreadingHTTPServer) -> str:
+        host, port = server.server_address[:2]
+        return f"http://{host}:{port}/active-jb-7d"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stub of the internships API.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--throttle-every", type=int, default=0)
+    parser.add_argument("--fail-every", type=int, default=0)
+    args = parser.parse_args()
+
+    api = StubJobAPI(args.jobs, args.latency, args.throttle_every, args.fail_every)
+    server = api.serve(port=args.port)
+    print(f"Stub internships API listening on {StubJobAPI.url(server)}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
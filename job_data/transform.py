@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
 
 class JobTransformer:
     @staticmethod
@@ -57,3 +57,22 @@ class JobTransformer:
             "source_id": str(api_data.get("id")),
             "user_id": "external-system" 
         }
+
+    @staticmethod
+    def transform_batch(api_data_list: Iterable[Dict[str, Any]], out: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Transforms a page of API records, skipping invalid ones.
+        Results are written into `out` (cleared first) when given, so the
+        pipeline can recycle page lists instead of allocating one per page.
+        """
+        if out is None:
+            out = []
+        else:
+            out.clear()
+        transform = JobTransformer.transform
+        append = out.append
+        for api_data in api_data_list:
+            transformed = transform(api_data)
+            if transformed:
+                append(transformed)
+        return out
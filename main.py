@@ -1,29 +1,99 @@
-from fastapi import FastAPI
+import os
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from app.routes.users import router as users_router
 from app.routes.jobs import router as jobs_router
 from app.routes.applications import router as applications_router
 from app.routes.auth import router as auth_router
-from core.database import create_db_and_tables, seed_sample_jobs, seed_test_user, seed_sample_applications
+from app.routes.etl import router as etl_router
+from app.routes.admin import router as admin_router
+from core.database import create_db_and_tables, get_cache_stats
+from core.seed import seed_on_startup
+from app.services.job_enrichment import JobEnrichmentService
+from app.services.dedup import JobDedupService
+from app.services.rescoring import RescoringService
+from app.services.candidates import CandidateSearchService
+from app.services.skills import SkillIndexService
+from app.services.refinement import ScoreRefinementService
+from job_data.scheduler import EtlScheduler
+from utils import metrics, profiling, admission
+
+SERVER_TIMING = os.getenv("BMATS_SERVER_TIMING", "1") == "1"
+
+def on_startup():
+    create_db_and_tables()
+    seed_on_startup()  # Fixture snapshot by default; see core/seed.py
+    JobEnrichmentService.backfill()  # Jobs stored before enrichment existed
+    JobDedupService.backfill()  # ...or before fingerprinting existed
+    RescoringService.resume_interrupted()  # Continue a rescoring run cut short by a crash
+    ScoreRefinementService.requeue_pending()  # Provisional scores a previous process did not refine
+    CandidateSearchService.warm()  # Build the candidate search index in the background
+    SkillIndexService.warm()  # ...and the skill bitsets (after normalizing older profiles' skills)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    on_startup()
+    # Periodic ETL on a background thread (enabled with BMATS_ETL_SCHEDULE=1)
+    app.state.etl_scheduler = EtlScheduler.from_env()
+    if app.state.etl_scheduler:
+        app.state.etl_scheduler.start()
+    yield
+    if app.state.etl_scheduler:
+        app.state.etl_scheduler.stop()
 
 app = FastAPI(
     title="HackTheBias API",
     description="API for parsing, anonymizing, and analyzing resumes to reduce hiring bias.",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    """Per-route latency and DB usage histograms plus a Server-Timing header."""
+    timings, token = metrics.start_request()
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        metrics.end_request(token)
+    elapsed = time.perf_counter() - started
+    route = request.scope.get("route")
+    route_path = route.path if route else "unmatched"
+    metrics.HTTP_REQUEST_SECONDS.observe(elapsed, method=request.method, route=route_path, status=response.status_code)
+    metrics.DB_QUERIES_PER_REQUEST.observe(timings.db_queries, route=route_path)
+    metrics.DB_SECONDS_PER_REQUEST.observe(timings.db_seconds, route=route_path)
+    if SERVER_TIMING:
+        response.headers["Server-Timing"] = timings.server_timing(elapsed)
+    return response
+
+# Opt-in per-request profiling; not installed at all unless BMATS_PROFILING=1
+if profiling.ENABLED:
+    app.middleware("http")(profiling.profile_requests)
+
+# Outermost: admit or reject (429) expensive requests before their bodies are read
+if admission.ENABLED:
+    app.add_middleware(admission.AdmissionMiddleware)
+
 # Include Routers
 app.include_router(auth_router)
 app.include_router(jobs_router)
 app.include_router(users_router)
 app.include_router(applications_router)
-
-@app.on_event("startup")
-def on_startup():
-    create_db_and_tables()
-    seed_test_user()  # Must run before jobs/applications
-    seed_sample_jobs()
-    seed_sample_applications()
+app.include_router(etl_router)
+app.include_router(admin_router)
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to HackTheBias API. Visit /docs for documentation."}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit ratio and eviction counters for the in-process job/user caches."""
+    return get_cache_stats()
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Stage latencies, inference batches, DB and cache metrics (Prometheus text format)."""
+    return Response(metrics.render_metrics(), media_type="text/plain; version=0.0.4")
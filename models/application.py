@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 import uuid
 
@@ -8,6 +8,10 @@ class ApplicationSubmit(BaseModel):
     userId: str 
     jobId: str 
 
+class ApplicationBulkSubmit(BaseModel):
+    userId: str
+    jobIds: List[str] = Field(min_length=1, max_length=100)
+
 class ApplicationStored(BaseModel): 
     id: str = Field(default_factory=lambda: str(uuid.uuid4())) 
     userId: str 
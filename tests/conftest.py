@@ -0,0 +1,44 @@
+"""
+Shared test setup: a throwaway SQLite database, no startup seeding, ETL
+scheduling or admission control, and the models replaced by the cheap fakes
+from benchmarks/stub_models.py. Every test starts from empty tables.
+"""
+import os
+import tempfile
+
+# Read at import time by core.database and the services, so set before any app import
+os.environ["BMATS_DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["BMATS_SEED"] = "skip"
+os.environ["BMATS_ETL_SCHEDULE"] = "0"
+os.environ["BMATS_ADMISSION"] = "0"
+
+from benchmarks import stub_models
+
+stub_models.install()
+
+import pytest
+from sqlmodel import SQLModel, Session
+from core import database
+from benchmarks.generators import synthetic_jobs, synthetic_users
+
+@pytest.fixture(autouse=True)
+def empty_database():
+    database.engine.echo = False
+    SQLModel.metadata.drop_all(database.engine)
+    database.create_db_and_tables()
+    database.job_cache.invalidate()
+    database.user_cache.invalidate()
+    yield
+
+@pytest.fixture
+def poster_and_jobs():
+    """(poster, applicants, jobs): three applicants and three jobs by the poster, stored."""
+    users = synthetic_users(4, seed=1)
+    jobs = synthetic_jobs(3, seed=1, user_ids=[users[0].id])
+    ids = ([user.id for user in users], [job.id for job in jobs])
+    with Session(database.engine) as session:
+        session.add_all(users)
+        session.add_all(jobs)
+        session.commit()
+    user_ids, job_ids = ids
+    return user_ids[0], user_ids[1:], job_ids
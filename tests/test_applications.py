@@ -0,0 +1,52 @@
+import pytest
+from fastapi import HTTPException
+from models.application import ApplicationSubmit, ApplicationBulkSubmit
+from app.services.application import ApplicationService
+from app.services.users import UserService
+from core.database import get_applications_for_job
+
+def apply(user_id, job_id, key=None):
+    return ApplicationService.create_application(ApplicationSubmit(userId=user_id, jobId=job_id), idempotency_key=key)
+
+def test_repeated_application_returns_the_stored_one(poster_and_jobs):
+    _, (user_id, *_), (job_id, *_) = poster_and_jobs
+    first = apply(user_id, job_id)
+    again = apply(user_id, job_id)
+    assert again.id == first.id
+    assert again.scored_at == first.scored_at
+    assert len(get_applications_for_job(job_id)) == 1
+
+def test_idempotency_key_replays_and_rejects_reuse_for_another_job(poster_and_jobs):
+    _, (user_id, *_), (job_id, other_job_id, _) = poster_and_jobs
+    first = apply(user_id, job_id, key="key-1")
+    assert apply(user_id, job_id, key="key-1").id == first.id
+    with pytest.raises(HTTPException) as error:
+        apply(user_id, other_job_id, key="key-1")
+    assert error.value.status_code == 422
+
+def test_reapplying_after_profile_change_rescores_in_place(poster_and_jobs):
+    _, (user_id, *_), (job_id, *_) = poster_and_jobs
+    first = apply(user_id, job_id)
+    UserService.create_or_update_user(user_id, "rust, go", "Systems work", "BSc")
+    again = apply(user_id, job_id)
+    assert again.id == first.id
+    assert again.scored_at > first.scored_at
+    assert len(get_applications_for_job(job_id)) == 1
+
+def test_bulk_reports_every_skipped_job(poster_and_jobs):
+    poster_id, (user_id, *_), (job_a, job_b, job_c) = poster_and_jobs
+    applied = apply(user_id, job_c)
+    result = ApplicationService.create_applications_bulk(
+        ApplicationBulkSubmit(userId=user_id, jobIds=[job_a, job_b, job_a, "missing", job_c])
+    )
+    assert sorted(app.job_id for app in result["created"]) == sorted([job_a, job_b])
+    assert result["skipped"] == [
+        {"jobId": job_a, "reason": "duplicate"},
+        {"jobId": "missing", "reason": "job_not_found"},
+        {"jobId": job_c, "reason": "already_applied", "applicationId": applied.id},
+    ]
+
+def test_bulk_skips_own_postings(poster_and_jobs):
+    poster_id, _, (job_a, *_) = poster_and_jobs
+    result = ApplicationService.create_applications_bulk(ApplicationBulkSubmit(userId=poster_id, jobIds=[job_a]))
+    assert result == {"created": [], "skipped": [{"jobId": job_a, "reason": "own_posting"}]}
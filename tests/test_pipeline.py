@@ -0,0 +1,40 @@
+from job_data.pipeline import JobPipeline
+
+DESCRIPTION = ("We build distributed data pipelines in Python and Go for analytics at scale, "
+               "with Kafka and Spark, on-call rotation, code review and mentoring. ") * 3
+
+def posting(source_id, number=None, description=DESCRIPTION):
+    number = source_id if number is None else number
+    return {"id": source_id, "title": f"Data Engineer {number}", "organization": "Acme",
+            "description": f"{description} Team {number} of {number}.", "date_posted": "2026-01-01"}
+
+def run(pipeline, pages):
+    """One incremental run over `pages` (lists of raw postings) instead of the API."""
+    pipeline.extractor.fetch_pages = lambda *args, **kwargs: iter(
+        (offset * 10, page) for offset, page in enumerate(pages)
+    )
+    return pipeline.run(pages=len(pages))
+
+def test_incremental_run_stops_at_first_known_page():
+    pipeline = JobPipeline()
+    pages = [[posting(i) for i in range(10)], [posting(i) for i in range(10, 20)]]
+    assert run(pipeline, pages)["new"] == 20
+    second = run(pipeline, pages)
+    assert second["pages"] == 1
+    assert second["unchanged"] == 10
+
+def test_known_posting_edits_are_loaded():
+    pipeline = JobPipeline()
+    run(pipeline, [[posting(i) for i in range(10)]])
+    edited = [posting(i) for i in range(9)] + [posting(9, description="Now hiring for Rust services. " * 5)]
+    assert run(pipeline, [edited])["updated"] == 1
+
+def test_suppressed_copy_does_not_block_the_stop():
+    pipeline = JobPipeline()
+    # Source id 100 is a syndicated copy of posting 0
+    pages = [[posting(i) for i in range(9)] + [posting(100, number=0)], [posting(i) for i in range(10, 20)]]
+    first = run(pipeline, pages)
+    assert first["duplicates"] == 1
+    second = run(pipeline, pages)
+    assert second["pages"] == 1
+    assert second["duplicates"] == 0
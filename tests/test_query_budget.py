@@ -0,0 +1,12 @@
+from benchmarks.query_budget import QUERY_BUDGET, count_queries, seed
+from app.services.application import ApplicationService
+
+def test_postings_summary_stays_within_query_budget():
+    posters = seed()
+    counts = {
+        size: count_queries(lambda: ApplicationService.get_postings_summary(poster_id, top=5))
+        for size, poster_id in posters.items()
+    }
+    assert max(counts.values()) <= QUERY_BUDGET, counts
+    # Independent of how many postings the poster has
+    assert len(set(counts.values())) == 1, counts
@@ -0,0 +1,234 @@
+"""
+Admission control for the expensive endpoints (resume upload, applying).
+
+Runs as plain ASGI middleware, so a request is admitted or rejected before
+its body is read: saturated or over-quota callers get a fast 429 with
+Retry-After instead of tying up memory and a worker thread.
+
+- per-pool concurrency limit (per worker process)
+- bounded wait queue, ordered by priority (interactive before bulk), then arrival
+- per-caller token bucket, keyed on the client address (run uvicorn/gunicorn
+  with --forwarded-allow-ips behind a proxy so that is the real client);
+  bulk applies cost one token per job
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from starlette.responses import JSONResponse
+from utils import metrics
+
+ENABLED = os.getenv("BMATS_ADMISSION", "1") == "1"
+
+INTERACTIVE = 0
+BULK = 1
+
+ADMISSION_WAIT_SECONDS = metrics.histogram(
+    "bmats_admission_wait_seconds", "Time admitted requests waited in the queue.", ("pool",))
+ADMISSION_REJECTIONS = metrics.counter(
+    "bmats_admission_rejections_total", "Requests rejected with 429.", ("pool", "reason"))
+
+class Rejected(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionPool:
+    """Concurrency limit with a bounded priority wait queue (single event loop)."""
+
+    def __init__(self, name: str, concurrency: int, max_queue: int, timeout: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: List[list] = []  # heap of [priority, seq, future]
+        self._seq = itertools.count()
+        self.avg_service_seconds = 1.0
+        self.admitted = 0
+
+    @property
+    def depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def retry_after(self) -> float:
+        """Rough time until a slot frees up for a new arrival."""
+        return max(1.0, self.avg_service_seconds * (self.depth + 1) / self.concurrency)
+
+    async def acquire(self, priority: int = INTERACTIVE):
+        if self.active < self.concurrency and self.depth == 0:
+            self.active += 1
+            self.admitted += 1
+            ADMISSION_WAIT_SECONDS.observe(0.0, pool=self.name)
+            return
+        if self.depth >= self.max_queue:
+            raise Rejected("queue_full", self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._seq), future])
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            raise Rejected("queue_timeout", self.retry_after())
+        except asyncio.CancelledError:
+            # Client went away after the slot was handed to us: pass it on
+            if future.done() and not future.cancelled():
+                self.release(0.0)
+            raise
+        self.admitted += 1
+        ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - started, pool=self.name)
+
+    def release(self, service_seconds: float):
+        if service_seconds:
+            self.avg_service_seconds = 0.8 * self.avg_service_seconds + 0.2 * service_seconds
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # hand our slot straight to the next waiter
+                return
+        self.active -= 1
+
+class TokenBuckets:
+    """Per-key token buckets (`rate` tokens/second up to `burst`), LRU-bounded."""
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, cost: float = 1.0) -> Optional[float]:
+        """
+        Takes `cost` tokens (at most a full bucket, so any cost can pass);
+        returns None if allowed, else seconds until it would be.
+        """
+        cost = min(cost, self.burst)
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        wait = None
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+def _env_float(name: str, default: str) -> float:
+    return float(os.getenv(name, default))
+
+POOLS: Dict[str, AdmissionPool] = {
+    "upload": AdmissionPool("upload", int(_env_float("BMATS_UPLOAD_CONCURRENCY", "2")),
+                            int(_env_float("BMATS_ADMISSION_QUEUE", "16")), _env_float("BMATS_ADMISSION_TIMEOUT", "10")),
+    "apply": AdmissionPool("apply", int(_env_float("BMATS_APPLY_CONCURRENCY", "4")),
+                           int(_env_float("BMATS_ADMISSION_QUEUE", "16")), _env_float("BMATS_ADMISSION_TIMEOUT", "10")),
+}
+QUOTAS: Dict[str, TokenBuckets] = {
+    "upload": TokenBuckets(_env_float("BMATS_UPLOAD_RATE", "0.2"), _env_float("BMATS_UPLOAD_BURST", "5")),
+    "apply": TokenBuckets(_env_float("BMATS_APPLY_RATE", "1"), _env_float("BMATS_APPLY_BURST", "20")),
+}
+# (method, path) -> (pool, priority)
+RULES: Dict[Tuple[str, str], Tuple[str, int]] = {
+    ("POST", "/users/upload-resume"): ("upload", INTERACTIVE),
+    ("POST", "/applications/"): ("apply", INTERACTIVE),
+    ("POST", "/applications/bulk"): ("apply", BULK),
+}
+# Paths whose quota cost is the number of jobs in the (small JSON) body
+PER_JOB_COST = {"/applications/bulk"}
+MAX_COSTED_BODY = 64 * 1024
+
+def _admission_lines() -> List[str]:
+    lines = []
+    for name, kind, help, value in (
+        ("bmats_admission_queue_depth", "gauge", "Requests waiting for a slot.", lambda p: p.depth),
+        ("bmats_admission_active", "gauge", "Requests holding a slot.", lambda p: p.active),
+        ("bmats_admission_concurrency_limit", "gauge", "Configured slots.", lambda p: p.concurrency),
+        ("bmats_admission_admitted_total", "counter", "Requests admitted.", lambda p: p.admitted),
+    ):
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        for pool_name, pool in sorted(POOLS.items()):
+            lines.append(f'{name}{{pool="{pool_name}"}} {value(pool)}')
+    return lines
+
+metrics.register_collector(_admission_lines)
+
+def _caller(scope) -> str:
+    # Not a client-supplied id: those could be rotated to dodge the quota or
+    # borrowed to spend someone else's
+    client = scope.get("client")
+    return "addr:" + (client[0] if client else "unknown")
+
+async def _job_count(receive):
+    """
+    Reads the whole body to count its jobIds; returns (count, receive replaying
+    the body). Unreadable or oversized bodies count as one job (the route
+    validates them).
+    """
+    messages, size = [], 0
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        size += len(message.get("body", b""))
+        if size > MAX_COSTED_BODY or not message.get("more_body", False):
+            break
+    count = 1
+    if size <= MAX_COSTED_BODY and messages[-1]["type"] == "http.request" and not messages[-1].get("more_body", False):
+        try:
+            job_ids = json.loads(b"".join(m.get("body", b"") for m in messages)).get("jobIds")
+            if isinstance(job_ids, list):
+                count = max(len(set(map(str, job_ids))), 1)
+        except (ValueError, AttributeError):
+            pass
+    pending = iter(messages)
+
+    async def replay():
+        return next(pending, None) or await receive()
+    return count, replay
+
+async def _reject(scope, receive, send, pool: str, reason: str, retry_after: float):
+    ADMISSION_REJECTIONS.inc(pool=pool, reason=reason)
+    response = JSONResponse(
+        {"detail": f"Server busy ({reason.replace('_', ' ')}), retry later"},
+        status_code=429, headers={"Retry-After": str(math.ceil(retry_after))}
+    )
+    await response(scope, receive, send)
+
+class AdmissionMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        rule = RULES.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        pool_name, priority = rule
+        cost = 1
+        if scope["path"] in PER_JOB_COST:
+            cost, receive = await _job_count(receive)
+        wait = QUOTAS[pool_name].take(_caller(scope), cost)
+        if wait is not None:
+            return await _reject(scope, receive, send, pool_name, "quota", wait)
+
+        pool = POOLS[pool_name]
+        try:
+            await pool.acquire(priority)
+        except Rejected as e:
+            return await _reject(scope, receive, send, pool_name, e.reason, e.retry_after)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            pool.release(time.perf_counter() - started)
@@ -1,6 +1,7 @@
 import spacy
 import re
 import warnings
+from utils import chunking
 
 # Suppress warnings if model isn't found immediately (handled in init)
 warnings.filterwarnings("ignore")
@@ -21,8 +22,9 @@ class Anonymizer:
         if not text:
             return ""
 
-        # 1. Processing with Spacy for NER (Names, Orgs, etc if needed)
-        doc = self.nlp(text)
+        # 1. Processing with Spacy for NER (Names, Orgs, etc if needed);
+        # long documents in chunks, offsets still relative to `text`
+        doc = chunking.process(self.nlp, text, sents=False)
         
         # We will build a list of character exclusions (indices to redact)
         redaction_ranges = []
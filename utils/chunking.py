@@ -0,0 +1,120 @@
+"""
+Chunked spaCy processing for long documents.
+
+spaCy refuses texts longer than nlp.max_length, and parser time and memory
+grow faster than the text, so documents over BMATS_NER_CHUNK_CHARS are split on
+page, paragraph or line boundaries into chunks that share about
+BMATS_NER_CHUNK_OVERLAP characters with their neighbours. The chunks go through
+nlp.pipe (over BMATS_NER_PROCESSES processes when > 1) and the entity and
+sentence offsets are shifted back into document coordinates.
+
+A span cut by a chunk edge shows up again, whole, in the neighbouring chunk
+(as long as it fits in the overlap). When spans from two chunks overlap, the
+one seen with more text around it wins, so each is reported once.
+"""
+import bisect
+import os
+import re
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+from utils import metrics
+
+CHUNK_CHARS = int(os.getenv("BMATS_NER_CHUNK_CHARS", "20000"))
+CHUNK_OVERLAP = int(os.getenv("BMATS_NER_CHUNK_OVERLAP", "400"))
+NER_PROCESSES = int(os.getenv("BMATS_NER_PROCESSES", "1"))
+# Forking only pays off with at least this many chunks per process
+MIN_CHUNKS_PER_PROCESS = 2
+# Separates pages in extracted PDF text (utils/parser.py)
+PAGE_BREAK = "\f"
+# Where to cut, most preferred first
+_BOUNDARIES = (PAGE_BREAK, "\n\n", "\n", ". ", " ")
+_WHITESPACE = re.compile(r"\s")
+
+NLP_CHUNKS = metrics.counter("bmats_nlp_chunks_total", "Chunks run through spaCy for documents over the chunk size.")
+
+class Span(NamedTuple):
+    """An entity or sentence in document coordinates (attribute names as on spaCy spans)."""
+    start_char: int
+    end_char: int
+    label_: str
+    text: str
+
+class ChunkedDoc(NamedTuple):
+    """What callers use of a spaCy Doc: the text, its entities and (if requested) its sentences."""
+    text: str
+    ents: List[Span]
+    sents: List[Span]
+
+def _cut(text: str, lo: int, hi: int) -> int:
+    """Chunk end in (lo, hi]: just after the last, most preferred boundary; `hi` if there is none."""
+    for boundary in _BOUNDARIES:
+        found = text.rfind(boundary, lo, hi)
+        if found >= 0:
+            return found + len(boundary)
+    return hi
+
+def split_text(text: str, max_chars: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP) -> List[Tuple[int, int]]:
+    """(start, end) of chunks of at most `max_chars` covering the text, neighbours sharing about `overlap` chars."""
+    if len(text) <= max_chars:
+        return [(0, len(text))]
+    overlap = min(overlap, max_chars // 4)
+    chunks = []
+    start = 0
+    while start + max_chars < len(text):
+        end = _cut(text, start + max_chars // 2, start + max_chars)
+        chunks.append((start, end))
+        # The next chunk starts `overlap` back, at the following word boundary
+        space = _WHITESPACE.search(text, end - overlap, end)
+        start = space.end() if space else end - overlap
+    chunks.append((start, len(text)))
+    return chunks
+
+def _candidates(spans: Iterable, start: int, end: int, length: int) -> Iterable[Tuple[int, Span]]:
+    """Spans of the chunk [start, end) in document coordinates, with their distance to a cut edge."""
+    for span in spans:
+        left = span.start_char if start > 0 else length
+        right = end - start - span.end_char if end < length else length
+        yield min(left, right), Span(start + span.start_char, start + span.end_char, span.label_, span.text)
+
+def _stitch(candidates: List[Tuple[int, Span]]) -> List[Span]:
+    """Non-overlapping spans from (context, span) candidates, most context first; in text order."""
+    candidates.sort(key=lambda candidate: (-candidate[0], candidate[1].start_char))
+    starts: List[int] = []
+    kept: List[Span] = []
+    for _, span in candidates:
+        i = bisect.bisect_right(starts, span.start_char)
+        if i and kept[i - 1].end_char > span.start_char:
+            continue
+        if i < len(kept) and kept[i].start_char < span.end_char:
+            continue
+        starts.insert(i, span.start_char)
+        kept.insert(i, span)
+    return kept
+
+def process(nlp, text: str, sents: bool = True, max_chars: int = CHUNK_CHARS,
+            n_process: Optional[int] = None):
+    """
+    nlp(text) for texts up to `max_chars`; otherwise a ChunkedDoc stitched
+    from the chunks. Set sents=False when the pipeline has no sentence
+    boundaries or they are not needed.
+    """
+    chunks = split_text(text, min(max_chars, nlp.max_length))
+    if len(chunks) == 1:
+        return nlp(text)
+
+    n_process = n_process or NER_PROCESSES
+    n_process = max(1, min(n_process, len(chunks) // MIN_CHUNKS_PER_PROCESS))
+    docs = nlp.pipe(
+        (text[start:end] for start, end in chunks),
+        n_process=n_process,
+        # One batch per process, so the chunks are spread over all of them
+        batch_size=-(-len(chunks) // n_process)
+    )
+    NLP_CHUNKS.inc(len(chunks))
+
+    ents: List[Tuple[int, Span]] = []
+    sentences: List[Tuple[int, Span]] = []
+    for (start, end), doc in zip(chunks, docs):
+        ents.extend(_candidates(doc.ents, start, end, len(text)))
+        if sents:
+            sentences.extend(_candidates(doc.sents, start, end, len(text)))
+    return ChunkedDoc(text, _stitch(ents), _stitch(sentences))
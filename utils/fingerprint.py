@@ -0,0 +1,65 @@
+import base64
+import hashlib
+import re
+import numpy as np
+from typing import List, Set
+
+# MinHash signature length, split into BANDS x ROWS for LSH. With 16 bands of
+# 4 rows, pairs with Jaccard ~0.5 have an even chance of sharing a bucket and
+# pairs above ~0.75 are found almost always.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = np.random.RandomState(1)
+# Fixed permutation parameters so signatures are comparable across processes
+_PERM_A = _rng.randint(1, _MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, _MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+def normalize(text: str) -> List[str]:
+    """Lowercases, drops punctuation and splits into words."""
+    return _NON_WORD.sub(" ", text.lower()).split()
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> Set[str]:
+    words = normalize(text)
+    if len(words) < k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+def _hash32(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=4).digest(), "little")
+
+def minhash(text: str) -> np.ndarray:
+    """NUM_PERM-long MinHash signature (uint32) of the text's word shingles."""
+    hashes = np.fromiter((_hash32(s) for s in shingles(text)), dtype=np.uint64)
+    if hashes.size == 0:
+        return np.full(NUM_PERM, _MAX_HASH, dtype=np.uint32)
+    # Universal hash (a*x + b) mod p; the uint64 wraparound in a*x is intended
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two underlying shingle sets."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+def band_buckets(signature: np.ndarray) -> List[int]:
+    """One LSH bucket key per band, as a signed 64-bit int (fits an SQLite INTEGER)."""
+    rows = signature.reshape(BANDS, ROWS)
+    return [
+        int.from_bytes(hashlib.blake2b(row.tobytes(), digest_size=8).digest(), "little", signed=True)
+        for row in rows
+    ]
+
+def encode(signature: np.ndarray) -> str:
+    return base64.b64encode(signature.astype("<u4").tobytes()).decode()
+
+def decode(value: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(value), dtype="<u4")
+
+def job_fingerprint_text(title: str, company: str, description: str) -> str:
+    return f"{title} {company} {description}"
@@ -0,0 +1,46 @@
+from datetime import datetime
+from utils.skills import extract_skills, normalize_skills
+
+# stsb-roberta-base reads at most 512 tokens per (job, resume) pair and truncates
+# the longer side from the end, so job text past this budget never reaches the model
+MAX_JOB_CHARS = 4096
+
+def build_job_scoring_text(title: str, description: str, requirements: str) -> str:
+    """Job side of the cross-encoder input, capped to what the model can consume."""
+    return f"{title} {description} {requirements}"[:MAX_JOB_CHARS]
+
+def job_scoring_text(job) -> str:
+    """The job's side of the cross-encoder input."""
+    return build_job_scoring_text(job.title, job.description, job.requirements)
+
+# Version tag of provisional scores (never equal to a cross-encoder version,
+# so the rescoring job also treats them as stale)
+PROVISIONAL_VERSION = "provisional-skills-v1"
+# Full skill coverage maps to the top of the cross-encoder's usual score range
+PROVISIONAL_MAX_SCORE = 0.9
+
+def _skill_set(skills: str) -> set:
+    return set(normalize_skills(skills or ""))
+
+def provisional_score(job, user) -> float:
+    """
+    Instant stand-in for the cross-encoder score: the share of the job's
+    required skills listed on the user's profile.
+    """
+    required = _skill_set(job.required_skills) or set(normalize_skills(extract_skills(job_scoring_text(job))))
+    if not required:
+        return PROVISIONAL_MAX_SCORE / 2
+    return round(PROVISIONAL_MAX_SCORE * len(required & _skill_set(user.skills)) / len(required), 4)
+
+def enrich_job(job, text_changed: bool = False):
+    """
+    Fills a Job's required skills in place (same keyword matcher as resumes,
+    in canonical form). Set `text_changed` when the scored text was edited;
+    scoring_changed_at only moves, making the job's applications stale, when
+    that or the skills differ from an earlier enrichment.
+    """
+    skills = ", ".join(normalize_skills(extract_skills(f"{job.title} {job.description} {job.requirements}")))
+    if job.required_skills is not None and (text_changed or skills != job.required_skills):
+        job.scoring_changed_at = datetime.utcnow().isoformat()
+    job.required_skills = skills
+    return job
@@ -1,7 +1,7 @@
 import requests, json, dotenv, os
 from datetime import datetime
 from sqlmodel import Session, select
-from core.database import engine, Job, add_job
+from core.database import engine, Job, add_job, invalidate_job_cache
 
 dotenv.load_dotenv() 
 
@@ -155,6 +155,8 @@ def fetch_and_store_internships(title: str = "software engineer", location: str
                 count += 1
             
             session.commit()
+            if count:
+                invalidate_job_cache()
             print(f"Successfully stored {count} new jobs.")
             
     except Exception as e:
@@ -0,0 +1,218 @@
+"""
+In-memory BM25 index over user profiles for candidate retrieval.
+
+Postings are stored term-major (CSC): for each term, the rows (profiles) that
+contain it and their saturated tf weight. Scoring a job is a sparse
+matrix-vector product over the job's terms only, so its cost follows the
+postings of those terms rather than profiles x vocabulary.
+
+Updates are incremental: a changed profile's old row is tombstoned and its new
+postings go to a small delta that is folded into the main arrays once it grows
+past DELTA_MAX_POSTINGS. Document frequencies keep counting tombstoned rows
+and the average length is fixed at build time; both are refreshed by the next
+full build (needs_rebuild() once enough rows are dead or the index has doubled).
+"""
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from utils.skills import extract_skills, normalize_skills
+
+K1 = 1.2
+B = 0.75
+DELTA_MAX_POSTINGS = 200_000
+# Fraction of dead rows at which a full rebuild is due
+REBUILD_DEAD_FRACTION = 0.25
+# ...or growth since the last build (the stats it used no longer describe the index)
+REBUILD_GROWTH = 2.0
+REBUILD_MIN_DOCS = 500
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the their this to "
+    "was we were will with you your".split()
+)
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords, bare numbers or single characters."""
+    return [
+        word for word in _TOKEN.findall((text or "").lower())
+        if len(word) > 1 and word not in STOPWORDS and not word.isdigit()
+    ]
+
+def profile_terms(skills: str, experience: str, education: str) -> List[str]:
+    """Profile text tokens plus one `skill:` term per listed skill (multi-word skills stay whole)."""
+    terms = tokenize(f"{skills} {experience} {education}")
+    terms += ["skill:" + skill for skill in normalize_skills(skills or "")]
+    return terms
+
+def job_terms(text: str, required_skills: Optional[str] = None) -> List[str]:
+    """Job text tokens plus its required skills (precomputed, else matched in the text)."""
+    skills = normalize_skills(required_skills or extract_skills(text))
+    return tokenize(text) + ["skill:" + skill for skill in skills]
+
+def _bm25_weights(tfs: np.ndarray, lengths: np.ndarray, avgdl: float) -> np.ndarray:
+    return (tfs * (K1 + 1) / (tfs + K1 * (1 - B + B * lengths / avgdl))).astype(np.float32)
+
+class BM25Index:
+    """Thread-safe BM25 index of documents given as (id, terms)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.build([])
+
+    def build(self, docs: Iterable[Tuple[str, List[str]]]):
+        """Replaces the whole index with `docs`."""
+        vocab: Dict[str, int] = {}
+        doc_ids: List[str] = []
+        term_ids, rows, tfs, lengths = [], [], [], []
+        for doc_id, terms in docs:
+            if not terms:
+                continue
+            row = len(doc_ids)
+            doc_ids.append(doc_id)
+            lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                rows.append(row)
+                tfs.append(tf)
+
+        term_ids = np.array(term_ids, dtype=np.int32)
+        rows = np.array(rows, dtype=np.int32)
+        lengths = np.array(lengths, dtype=np.float32)
+        avgdl = float(lengths.mean()) if lengths.size else 1.0
+        weights = _bm25_weights(np.array(tfs, dtype=np.float32), lengths[rows], avgdl)
+        order = np.argsort(term_ids, kind="stable")
+        df = np.bincount(term_ids, minlength=len(vocab)).astype(np.int32)
+        ptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(df, out=ptr[1:])
+
+        with self._lock:
+            self._vocab = vocab
+            self._df = df
+            self._avgdl = avgdl
+            self._ptr = ptr
+            self._rows = rows[order]
+            self._weights = weights[order]
+            self._doc_ids = doc_ids
+            self._built_docs = len(doc_ids)
+            self._row_of = {doc_id: row for row, doc_id in enumerate(doc_ids)}
+            self._alive = np.ones(len(doc_ids), dtype=bool)
+            self._dead = 0
+            self._delta_terms: List[int] = []
+            self._delta_rows: List[int] = []
+            self._delta_weights: List[float] = []
+            self._delta_arrays = None
+
+    @property
+    def size(self) -> int:
+        return len(self._row_of)
+
+    def needs_rebuild(self) -> bool:
+        return (self._dead > REBUILD_DEAD_FRACTION * max(len(self._doc_ids), 1)
+                or len(self._row_of) > REBUILD_GROWTH * max(self._built_docs, REBUILD_MIN_DOCS))
+
+    def upsert(self, doc_id: str, terms: List[str]):
+        """Replaces (or adds) one document; empty `terms` removes it."""
+        with self._lock:
+            old_row = self._row_of.pop(doc_id, None)
+            if old_row is not None:
+                self._alive[old_row] = False
+                self._dead += 1
+            if not terms:
+                return
+            row = len(self._doc_ids)
+            self._doc_ids.append(doc_id)
+            self._row_of[doc_id] = row
+            if row >= self._alive.size:
+                self._alive = np.concatenate([self._alive, np.zeros(max(self._alive.size, 64), dtype=bool)])
+            self._alive[row] = True
+
+            counts = Counter(terms)
+            for term in counts:
+                if term not in self._vocab:
+                    self._vocab[term] = len(self._vocab)
+            if len(self._vocab) > self._df.size:
+                grown = np.zeros(max(2 * self._df.size, len(self._vocab)), dtype=np.int32)
+                grown[:self._df.size] = self._df
+                self._df = grown
+            term_ids = [self._vocab[term] for term in counts]
+            self._df[term_ids] += 1
+            tfs = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            self._delta_terms.extend(term_ids)
+            self._delta_rows.extend([row] * len(term_ids))
+            self._delta_weights.extend(_bm25_weights(tfs, np.float32(len(terms)), self._avgdl).tolist())
+            self._delta_arrays = None
+            if len(self._delta_terms) > DELTA_MAX_POSTINGS:
+                self._fold()
+
+    def _fold(self):
+        """Merges the delta into the term-major arrays (caller holds the lock)."""
+        terms = np.array(self._delta_terms, dtype=np.int32)
+        order = np.argsort(terms, kind="stable")
+        terms = terms[order]
+        vocab_size = len(self._vocab)
+        ptr = np.concatenate([self._ptr, np.full(vocab_size + 1 - self._ptr.size, self._ptr[-1], dtype=np.int64)])
+        # Each delta posting goes at the end of its term's segment
+        positions = ptr[terms + 1]
+        self._rows = np.insert(self._rows, positions, np.array(self._delta_rows, dtype=np.int32)[order])
+        self._weights = np.insert(self._weights, positions, np.array(self._delta_weights, dtype=np.float32)[order])
+        ptr[1:] += np.cumsum(np.bincount(terms, minlength=vocab_size))
+        self._ptr = ptr
+        self._delta_terms, self._delta_rows, self._delta_weights = [], [], []
+        self._delta_arrays = None
+
+    def search(self, terms: List[str], k: int, exclude: Optional[Set[str]] = None,
+               include: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Top-`k` (doc id, BM25 score) for the query terms, best first; zero
+        scores are left out. `include` restricts the results to those ids.
+        """
+        with self._lock:
+            query = Counter(self._vocab[term] for term in terms if term in self._vocab)
+            n_rows = len(self._doc_ids)
+            if not query or not n_rows:
+                return []
+            n_docs = len(self._row_of)
+            scores = np.zeros(n_rows, dtype=np.float32)
+            query_weights = {}
+            base_terms = self._ptr.size - 1
+            for term_id, qtf in query.items():
+                df = int(self._df[term_id])
+                weight = qtf * math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                query_weights[term_id] = weight
+                if term_id < base_terms:
+                    start, end = self._ptr[term_id], self._ptr[term_id + 1]
+                    # Rows are unique within a term, so fancy-index += is exact
+                    scores[self._rows[start:end]] += weight * self._weights[start:end]
+
+            if self._delta_terms:
+                if self._delta_arrays is None:
+                    self._delta_arrays = (np.array(self._delta_terms, dtype=np.int64),
+                                          np.array(self._delta_rows, dtype=np.int64),
+                                          np.array(self._delta_weights, dtype=np.float32))
+                delta_terms, delta_rows, delta_weights = self._delta_arrays
+                lookup = np.zeros(len(self._vocab), dtype=np.float32)
+                lookup[list(query_weights)] = list(query_weights.values())
+                contributions = lookup[delta_terms] * delta_weights
+                hit = contributions > 0
+                scores += np.bincount(delta_rows[hit], weights=contributions[hit], minlength=n_rows).astype(np.float32)
+
+            scores[~self._alive[:n_rows]] = 0
+            for doc_id in exclude or ():
+                row = self._row_of.get(doc_id)
+                if row is not None:
+                    scores[row] = 0
+            if include is not None:
+                keep = np.zeros(n_rows, dtype=bool)
+                keep[[self._row_of[doc_id] for doc_id in include if doc_id in self._row_of]] = True
+                scores[~keep] = 0
+
+            k = min(k, int(np.count_nonzero(scores)))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(self._doc_ids[row], float(scores[row])) for row in top]
@@ -0,0 +1,106 @@
+"""
+Per-worker memory report for the prefork deployment (Linux only).
+
+    python -m utils.memory_report --pid <gunicorn master pid>
+    python -m utils.memory_report --compare --workers 4   # preload off vs on
+
+USS (private pages) is what each extra worker really costs; PSS splits the
+shared pages evenly between the processes mapping them.
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+
+_FIELDS = {"Rss": "rss", "Pss": "pss", "Shared_Clean": "shared_clean", "Shared_Dirty": "shared_dirty",
+           "Private_Clean": "private_clean", "Private_Dirty": "private_dirty"}
+
+def process_memory(pid: int) -> Dict[str, int]:
+    """RSS/PSS/USS in KiB for one process, from /proc/<pid>/smaps_rollup."""
+    values = {name: 0 for name in _FIELDS.values()}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in _FIELDS:
+                values[_FIELDS[key]] = int(rest.split()[0])
+    values["uss"] = values["private_clean"] + values["private_dirty"]
+    values["shared"] = values["shared_clean"] + values["shared_dirty"]
+    return values
+
+def child_pids(pid: int) -> List[int]:
+    children = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as f:
+            children.extend(int(c) for c in f.read().split())
+    return sorted(children)
+
+def report(master_pid: int) -> Dict[str, object]:
+    workers = {pid: process_memory(pid) for pid in child_pids(master_pid)}
+    return {
+        "master": process_memory(master_pid),
+        "workers": workers,
+        "total_pss": process_memory(master_pid)["pss"] + sum(w["pss"] for w in workers.values()),
+    }
+
+def print_report(title: str, result: Dict[str, object]):
+    mib = lambda kib: f"{kib / 1024:9.1f}"
+    print(f"\n{title}")
+    print(f"{'process':>14} {'RSS MiB':>9} {'PSS MiB':>9} {'USS MiB':>9} {'shared MiB':>10}")
+    rows = [("master", result["master"])] + [(f"worker {pid}", m) for pid, m in result["workers"].items()]
+    for name, m in rows:
+        print(f"{name:>14} {mib(m['rss'])} {mib(m['pss'])} {mib(m['uss'])} {mib(m['shared']):>10}")
+    print(f"{'total PSS':>14} {'':>9} {mib(result['total_pss'])}")
+
+def measure(workers: int, preload: bool, port: int, timeout: float = 300) -> Dict[str, object]:
+    """Starts gunicorn with the repo config, waits until it serves, and reports."""
+    env = dict(os.environ, BMATS_WORKERS=str(workers), BMATS_PRELOAD="1" if preload else "0",
+               BMATS_BIND=f"127.0.0.1:{port}", BMATS_ETL_SCHEDULE="0")
+    proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"], env=env)
+    try:
+        deadline = time.time() + timeout
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with {proc.returncode}")
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=5)
+                if len(child_pids(proc.pid)) == workers:
+                    break
+            except OSError:
+                pass
+            if time.time() > deadline:
+                raise TimeoutError("gunicorn did not become ready")
+            time.sleep(1)
+        # Touch every worker a few times so lazily-initialised state is counted
+        for _ in range(workers * 4):
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=5).read()
+        time.sleep(2)
+        return report(proc.pid)
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(30)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-worker RSS/PSS/USS report for gunicorn workers.")
+    parser.add_argument("--pid", type=int, help="Report on an already running gunicorn master")
+    parser.add_argument("--compare", action="store_true", help="Start gunicorn with preload off, then on")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.pid:
+        print_report(f"gunicorn master {args.pid}", report(args.pid))
+    elif args.compare:
+        results = {preload: measure(args.workers, preload, args.port) for preload in (False, True)}
+        for preload, result in results.items():
+            print_report(f"preload_app={preload}, {args.workers} workers", result)
+        uss = {p: sum(w["uss"] for w in r["workers"].values()) / max(len(r["workers"]), 1)
+               for p, r in results.items()}
+        print(f"\nMean worker USS: {uss[False] / 1024:.1f} MiB without preload, "
+              f"{uss[True] / 1024:.1f} MiB with preload")
+        print(f"Total PSS: {results[False]['total_pss'] / 1024:.1f} MiB -> {results[True]['total_pss'] / 1024:.1f} MiB")
+    else:
+        parser.error("pass --pid or --compare")
@@ -0,0 +1,202 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Each worker keeps its own registry; scrape every worker (or run a single
+worker) to see everything. Per-request stage timings are collected in a
+context variable and returned to the client as a `Server-Timing` header.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{str(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        # label values -> [per-bucket counts, sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = 'le="' + _format_value(bound) + '"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+_registry: List = []
+_collectors: List[Callable[[], List[str]]] = []
+
+def histogram(name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    metric = Histogram(name, help, labelnames, buckets)
+    _registry.append(metric)
+    return metric
+
+def counter(name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+    metric = Counter(name, help, labelnames)
+    _registry.append(metric)
+    return metric
+
+def register_collector(collector: Callable[[], List[str]]):
+    """Adds a callable producing exposition lines at scrape time (e.g. cache stats)."""
+    _collectors.append(collector)
+
+def render_metrics() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
+
+HTTP_REQUEST_SECONDS = histogram("bmats_http_request_seconds", "Request latency by route.", ("method", "route", "status"))
+STAGE_SECONDS = histogram("bmats_stage_seconds", "Latency of instrumented pipeline stages.", ("stage",))
+INFERENCE_SECONDS = histogram("bmats_inference_seconds", "Cross-encoder predict() duration.")
+INFERENCE_BATCH_SIZE = histogram("bmats_inference_batch_size", "Pairs scored per predict() call.", buckets=BATCH_BUCKETS)
+DB_QUERY_SECONDS = histogram("bmats_db_query_seconds", "Duration of individual SQL statements.", ("statement",))
+DB_QUERIES_PER_REQUEST = histogram("bmats_db_queries_per_request", "SQL statements executed per request.", ("route",), buckets=COUNT_BUCKETS)
+DB_SECONDS_PER_REQUEST = histogram("bmats_db_seconds_per_request", "Time spent in SQL per request.", ("route",))
+
+# --- Per-request timings ---
+
+class RequestTimings:
+    def __init__(self):
+        self.stages: "OrderedDict[str, float]" = OrderedDict()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+    def add(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def server_timing(self, total_seconds: float) -> str:
+        entries = [f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_queries} queries"']
+        entries.extend(f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in self.stages.items())
+        entries.append(f"total;dur={total_seconds * 1000:.2f}")
+        return ", ".join(entries)
+
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("bmats_request_timings", default=None)
+
+def start_request():
+    """Starts collecting timings for the current request; returns (timings, reset token)."""
+    timings = RequestTimings()
+    return timings, _request_timings.set(timings)
+
+def end_request(token):
+    _request_timings.reset(token)
+
+@contextmanager
+def timed(stage: str):
+    """Times a block into bmats_stage_seconds and the current request's Server-Timing."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.add(stage, elapsed)
+
+def observe_inference(batch_size: int, seconds: float):
+    INFERENCE_SECONDS.observe(seconds)
+    INFERENCE_BATCH_SIZE.observe(batch_size)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add("inference", seconds)
+
+def instrument_engine(engine):
+    """Times every statement on `engine` and counts them against the current request."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("bmats_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["bmats_query_start"].pop()
+        DB_QUERY_SECONDS.observe(elapsed, statement=statement.lstrip().split(" ", 1)[0].upper())
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.db_queries += 1
+            timings.db_seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # A failed statement never reaches after_cursor_execute: drop its start time
+        conn = context.connection
+        if conn is not None and conn.info.get("bmats_query_start"):
+            conn.info["bmats_query_start"].pop()
+
+def cache_lines(stats: Dict[str, dict]) -> List[str]:
+    """Exposition lines for TTLCache.stats() output keyed by cache name."""
+    lines = []
+    for field, kind, help in (("hits", "counter", "Cache hits."), ("misses", "counter", "Cache misses."),
+                              ("evictions", "counter", "LRU evictions."), ("expirations", "counter", "TTL expirations."),
+                              ("size", "gauge", "Entries currently cached."), ("hit_ratio", "gauge", "Hits / lookups.")):
+        name = f"bmats_cache_{field}_total" if kind == "counter" else f"bmats_cache_{field}"
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        for cache, values in sorted(stats.items()):
+            lines.append(f'{name}{{cache="{cache}"}} {values[field]}')
+    return lines
@@ -1,19 +1,21 @@
 import pdfplumber
 from typing import Union, BinaryIO
+from utils.chunking import PAGE_BREAK
 
 def extract_text_from_pdf(pdf_file: Union[str, BinaryIO]) -> str:
     """
     Extracts text from a given PDF file path or file-like object.
+    Pages are separated by a form feed line, where long documents are split for NER.
     """
-    text = ""
+    pages = []
     try:
         with pdfplumber.open(pdf_file) as pdf:
             for page in pdf.pages:
                 page_text = page.extract_text()
                 if page_text:
-                    text += page_text + "\n"
+                    pages.append(page_text)
     except Exception as e:
         print(f"Error reading PDF: {e}")
         return ""
     
-    return text.strip()
+    return f"\n{PAGE_BREAK}\n".join(pages).strip()
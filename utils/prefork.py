@@ -0,0 +1,31 @@
+import gc
+import os
+
+def freeze_models():
+    """
+    Puts the loaded models into inference-only state so nothing in the
+    workers writes to the weight pages inherited from the parent.
+    """
+    from utils.semantics import semantics_instance
+    model = semantics_instance.cross_encoder.model
+    model.eval()
+    for param in model.parameters():
+        param.requires_grad_(False)
+
+def prepare_for_fork():
+    """
+    Called once in the parent after the app (and its model singletons) is
+    imported and before any worker is forked.
+    """
+    # The Rust tokenizers thread pool is not fork-safe
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    freeze_models()
+    # Move every surviving object into the permanent generation so worker GC
+    # passes don't touch (and copy) the parent's pages
+    gc.collect()
+    gc.freeze()
+
+def after_fork():
+    """Per-worker setup: keep N workers x torch threads within the node's cores."""
+    import torch
+    torch.set_num_threads(int(os.getenv("BMATS_TORCH_THREADS", "1")))
@@ -0,0 +1,148 @@
+"""
+Opt-in per-request profiling (BMATS_PROFILING=1).
+
+A request is profiled when it sends `X-Profile: 1` (or the configured
+BMATS_PROFILE_TOKEN) or is picked by BMATS_PROFILE_SAMPLE_RATE. Only sync
+handlers wrapped with @profile_thread are profiled, in the threadpool thread
+running them: the event loop thread interleaves every in-flight request, so a
+profile taken there would mix in other requests' work. Async handlers produce
+no profile. One handler is profiled at a time. On Python 3.12+ cProfile hooks
+all threads, so profiles there are only clean under serialized traffic.
+
+Profiles are written as pstats files (open with `python -m pstats`,
+snakeviz, or convert for speedscope) to a directory that keeps only the
+newest BMATS_PROFILE_KEEP of them.
+
+When disabled the middleware is not installed at all.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import random
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import List, Optional
+
+ENABLED = os.getenv("BMATS_PROFILING", "0") == "1"
+PROFILE_DIR = os.getenv("BMATS_PROFILE_DIR", "./profiles")
+SAMPLE_RATE = float(os.getenv("BMATS_PROFILE_SAMPLE_RATE", "0"))
+KEEP = int(os.getenv("BMATS_PROFILE_KEEP", "50"))
+TOKEN = os.getenv("BMATS_PROFILE_TOKEN")
+HEADER = "x-profile"
+
+# Profiles taken in threadpool threads on behalf of the current request
+_thread_profiles: ContextVar[Optional[list]] = ContextVar("bmats_thread_profiles", default=None)
+# cProfile cannot run twice at once on 3.12+, and concurrent profiles would overlap anyway
+_profile_lock = threading.Lock()
+
+def profile_thread(fn):
+    """Decorator for sync handlers: profiles the worker thread when the request is being profiled."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        collected = _thread_profiles.get()
+        if collected is None or not _profile_lock.acquire(blocking=False):
+            return fn(*args, **kwargs)
+        try:
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profile.disable()
+                collected.append(profile)
+        finally:
+            _profile_lock.release()
+    return wrapper
+
+class RequestProfiler:
+    def __init__(self, directory: str = PROFILE_DIR, sample_rate: float = SAMPLE_RATE, keep: int = KEEP,
+                 token: Optional[str] = TOKEN):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self.token = token
+        self._counter = 0
+
+    def wanted(self, header_value: Optional[str]) -> bool:
+        if header_value is not None:
+            return header_value == self.token if self.token else header_value not in ("", "0")
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def write(self, profiles: List[cProfile.Profile], method: str, path: str, status: int, elapsed: float) -> str:
+        """Writes the request's merged handler profiles and their summary, and rotates old ones. Returns the profile id."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._counter += 1
+        profile_id = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}-{self._counter}"
+        summary = io.StringIO()
+        stats = pstats.Stats(*profiles, stream=summary)
+        stats.dump_stats(os.path.join(self.directory, f"{profile_id}.prof"))
+        stats.sort_stats("cumulative").print_stats(15)
+        with open(os.path.join(self.directory, f"{profile_id}.json"), "w") as f:
+            json.dump({
+                "id": profile_id,
+                "created_at": datetime.utcnow().isoformat(),
+                "method": method,
+                "path": path,
+                "status": status,
+                "duration_ms": round(elapsed * 1000, 2),
+                "top_cumulative": summary.getvalue(),
+            }, f)
+        self._rotate()
+        return profile_id
+
+    def _rotate(self):
+        profiles = sorted(name for name in os.listdir(self.directory) if name.endswith(".prof"))
+        for name in profiles[:max(len(profiles) - self.keep, 0)]:
+            for suffix in (".prof", ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, name[:-len(".prof")] + suffix))
+                except FileNotFoundError:
+                    pass
+
+    def recent(self, limit: int = 50) -> List[dict]:
+        """Newest profiles first, without the text summary."""
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted((n for n in os.listdir(self.directory) if n.endswith(".json")), reverse=True)[:limit]
+        result = []
+        for name in names:
+            with open(os.path.join(self.directory, name)) as f:
+                meta = json.load(f)
+            meta.pop("top_cumulative", None)
+            result.append(meta)
+        return result
+
+    def summary(self, profile_id: str) -> Optional[dict]:
+        path = os.path.join(self.directory, f"{os.path.basename(profile_id)}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def stats_path(self, profile_id: str) -> Optional[str]:
+        path = os.path.join(self.directory, f"{os.path.basename(profile_id)}.prof")
+        return path if os.path.exists(path) else None
+
+profiler_instance = RequestProfiler()
+
+async def profile_requests(request, call_next):
+    """Middleware: profiles the request when asked to (see module docstring)."""
+    if not profiler_instance.wanted(request.headers.get(HEADER)):
+        return await call_next(request)
+    thread_profiles = []
+    token = _thread_profiles.set(thread_profiles)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _thread_profiles.reset(token)
+    if thread_profiles:
+        response.headers["X-Profile-Id"] = profiler_instance.write(
+            thread_profiles, request.method, request.url.path, response.status_code, time.perf_counter() - started
+        )
+    return response
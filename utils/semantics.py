@@ -3,11 +3,18 @@ import numpy as np
 import spacy
 import re
 import logging
+import os
+import time
+from utils.skills import TECH_SKILLS, extract_skills
+from utils import metrics, chunking
 
 # Configure logging to show INFO level
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Raw stsb-roberta-base scores top out around 0.6 for strong matches
+SCORE_SCALE = 1.6
+
 class SemanticMatcher:
     def __init__(self, cross_encoder_name: str = 'cross-encoder/stsb-roberta-base', spacy_model: str = "en_core_web_sm"):
         """
@@ -15,6 +22,9 @@ class SemanticMatcher:
         Uses stsb-roberta-base which is trained for semantic textual similarity (0-1 scores).
         """
         self.cross_encoder = CrossEncoder(cross_encoder_name)
+        # Stored with every application score so stale ones can be rescored;
+        # changes whenever the model or scaling does (or set BMATS_SCORING_VERSION)
+        self.version = os.getenv("BMATS_SCORING_VERSION") or f"{cross_encoder_name}*{SCORE_SCALE}"
         
         # Load spaCy for entity extraction
         try:
@@ -24,26 +34,7 @@ class SemanticMatcher:
             self.nlp = spacy.blank("en")
         
         # Tech skills list for entity extraction
-        self.tech_skills = {
-            "python", "java", "javascript", "typescript", "go", "golang", "rust", "c++", 
-            "c#", "ruby", "php", "swift", "kotlin", "scala", "r", "matlab",
-            "react", "vue", "angular", "svelte", "html", "css", "tailwind", "bootstrap",
-            "next.js", "nextjs", "nuxt", "gatsby", "webpack", "vite",
-            "node.js", "nodejs", "express", "django", "flask", "fastapi", "spring", 
-            "spring boot", "rails", "laravel", ".net", "asp.net",
-            "sql", "postgresql", "postgres", "mysql", "mongodb", "redis", "elasticsearch",
-            "dynamodb", "cassandra", "sqlite", "oracle", "neo4j",
-            "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "k8s",
-            "terraform", "ansible", "jenkins", "github actions", "gitlab", "ci/cd",
-            "linux", "unix", "bash", "shell",
-            "machine learning", "deep learning", "tensorflow", "pytorch", "keras",
-            "scikit-learn", "sklearn", "pandas", "numpy", "nlp", "computer vision",
-            "neural network", "transformer", "bert", "gpt", "llm",
-            "data engineering", "etl", "spark", "airflow", "kafka", "hadoop",
-            "data pipeline", "databricks", "snowflake", "bigquery", "dbt",
-            "git", "agile", "scrum", "microservices", "rest", "api", "graphql",
-            "grpc", "rabbitmq", "celery", "nginx", "apache"
-        }
+        self.tech_skills = TECH_SKILLS
 
     def _extract_entities(self, text: str) -> dict:
         """
@@ -52,19 +43,16 @@ class SemanticMatcher:
         - Experience: Bullet points with action verbs describing work
         - Education: Educational institutions and degrees
         """
-        doc = self.nlp(text)
+        # Long documents are processed in chunks (utils/chunking.py)
+        doc = chunking.process(self.nlp, text)
         entities = {
             "skills": [],
             "experience": [],
             "education": []
         }
         
-        text_lower = text.lower()
-        
         # Extract skills via keyword matching
-        for skill in self.tech_skills:
-            if skill in text_lower:
-                entities["skills"].append(skill)
+        entities["skills"].extend(extract_skills(text))
         
         education_keywords = {"university", "college", "school", "institute", "academy", 
                             "bachelor", "master", "phd", "degree", "bs", "ms", "ba", "ma"}
@@ -123,9 +111,23 @@ class SemanticMatcher:
         """
         # Cross-encoder directly outputs similarity score (0-1 range for stsb-roberta-base)
         # Typical raw scores: ~0.5-0.6 for strong matches, ~0.0-0.1 for non-matches
+        started = time.perf_counter()
         raw_score = self.cross_encoder.predict([(job_description, resume_text)])[0]
+        metrics.observe_inference(1, time.perf_counter() - started)
 
-        return raw_score*1.6
+        return raw_score*SCORE_SCALE
+
+    def get_final_scores(self, pairs: list, batch_size: int = 32) -> list:
+        """
+        Batched get_final_score over (job_description, resume_text) pairs:
+        one predict call, batched forward passes, same scaling.
+        """
+        if not pairs:
+            return []
+        started = time.perf_counter()
+        raw_scores = self.cross_encoder.predict(pairs, batch_size=batch_size)
+        metrics.observe_inference(len(pairs), time.perf_counter() - started)
+        return [float(raw_score) * SCORE_SCALE for raw_score in raw_scores]
 
 # Singleton instance
 semantics_instance = SemanticMatcher()
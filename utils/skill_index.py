@@ -0,0 +1,119 @@
+"""
+In-memory skill bitsets over user profiles.
+
+Each user gets a dense row number and each skill (by its id in the skill
+dictionary table) a packed bitset over those rows, stored as one uint64
+matrix [skill, word]. "Users having all of X, Y, Z" is an AND over three rows
+of the matrix; skill-overlap counts for a set of users gather one bit per
+(skill, user). Both stay in the microsecond range for thousands of profiles
+(and well under a millisecond for 100k).
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+class SkillBitsetIndex:
+    """Thread-safe per-skill bitsets keyed by user id and integer skill id."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.build([])
+
+    def build(self, users: Iterable[Tuple[str, Sequence[int]]]):
+        """Replaces the index with (user id, skill ids) pairs."""
+        users = list(users)
+        max_skill = max((max(ids) for _, ids in users if ids), default=0)
+        bits = np.zeros((max_skill + 1, max(-(-len(users) // 64), 1)), dtype=np.uint64)
+        row_of = {}
+        skills_of = []
+        for row, (user_id, skill_ids) in enumerate(users):
+            row_of[user_id] = row
+            skills_of.append(tuple(skill_ids))
+            for skill_id in skill_ids:
+                bits[skill_id, row >> 6] |= np.uint64(1 << (row & 63))
+        with self._lock:
+            self._bits = bits
+            self._row_of = row_of
+            self._user_ids = [user_id for user_id, _ in users]
+            self._skills_of = skills_of
+
+    @property
+    def size(self) -> int:
+        return len(self._user_ids)
+
+    def _ensure_capacity(self, rows: int, skills: int):
+        """Grows the matrix (doubling) to hold `rows` users and skill ids below `skills`."""
+        n_skills, n_words = self._bits.shape
+        words = -(-rows // 64)
+        if skills <= n_skills and words <= n_words:
+            return
+        grown = np.zeros((max(skills, n_skills), max(words, 2 * n_words) if words > n_words else n_words),
+                         dtype=np.uint64)
+        grown[:n_skills, :n_words] = self._bits
+        self._bits = grown
+
+    def upsert(self, user_id: str, skill_ids: Sequence[int]):
+        """Sets a user's skills, replacing any previous ones."""
+        with self._lock:
+            row = self._row_of.get(user_id)
+            if row is None:
+                row = len(self._user_ids)
+                self._row_of[user_id] = row
+                self._user_ids.append(user_id)
+                self._skills_of.append(())
+            self._ensure_capacity(row + 1, max(skill_ids, default=-1) + 1)
+            word, mask = row >> 6, np.uint64(1 << (row & 63))
+            for skill_id in self._skills_of[row]:
+                self._bits[skill_id, word] &= ~mask
+            for skill_id in skill_ids:
+                self._bits[skill_id, word] |= mask
+            self._skills_of[row] = tuple(skill_ids)
+
+    def _rows_mask(self, skill_ids: Sequence[Optional[int]]) -> np.ndarray:
+        """Bool mask over rows having every skill (caller holds the lock)."""
+        n_rows = len(self._user_ids)
+        if any(skill_id is None or skill_id >= self._bits.shape[0] for skill_id in skill_ids):
+            return np.zeros(n_rows, dtype=bool)
+        if not skill_ids:
+            return np.ones(n_rows, dtype=bool)
+        words = np.bitwise_and.reduce(self._bits[list(skill_ids)], axis=0)
+        return np.unpackbits(words.view(np.uint8), bitorder="little", count=n_rows).astype(bool)
+
+    def users_with_all(self, skill_ids: Sequence[Optional[int]]) -> List[str]:
+        """Users having every one of the skills (None stands for an unknown skill: nobody has it)."""
+        with self._lock:
+            return [self._user_ids[row] for row in np.flatnonzero(self._rows_mask(skill_ids))]
+
+    def overlap_counts(self, user_ids: Sequence[str], skill_ids: Sequence[Optional[int]]) -> Dict[str, int]:
+        """How many of the skills each of the (indexed) users has."""
+        known = [skill_id for skill_id in set(skill_ids) if skill_id is not None]
+        with self._lock:
+            row_of = self._row_of.get
+            present = [(user_id, row) for user_id in user_ids if (row := row_of(user_id)) is not None]
+            rows = np.array([row for _, row in present], dtype=np.int64)
+            present = [user_id for user_id, _ in present]
+            known = [skill_id for skill_id in known if skill_id < self._bits.shape[0]]
+            if not known or not rows.size:
+                return {user_id: 0 for user_id in present}
+            gathered = self._bits[np.ix_(known, rows >> 6)]
+            counts = ((gathered >> (rows & 63).astype(np.uint64)) & np.uint64(1)).sum(axis=0)
+            return dict(zip(present, counts.tolist()))
+
+    def matching(self, required: Sequence[Optional[int]] = (), overlap_skills: Sequence[Optional[int]] = (),
+                 min_overlap: int = 0) -> Dict[str, int]:
+        """
+        Users having all `required` skills and at least `min_overlap` of
+        `overlap_skills`, mapped to their overlap count.
+        """
+        known = [skill_id for skill_id in set(overlap_skills) if skill_id is not None]
+        with self._lock:
+            mask = self._rows_mask(required)
+            n_rows = mask.size
+            known = [skill_id for skill_id in known if skill_id < self._bits.shape[0]]
+            if known:
+                per_skill = np.unpackbits(self._bits[known].view(np.uint8), axis=1, bitorder="little", count=n_rows)
+                counts = per_skill.sum(axis=0, dtype=np.int32)
+            else:
+                counts = np.zeros(n_rows, dtype=np.int32)
+            mask &= counts >= min_overlap
+            return {self._user_ids[row]: int(counts[row]) for row in np.flatnonzero(mask)}
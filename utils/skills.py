@@ -0,0 +1,56 @@
+import re
+from typing import Iterable, List
+
+# Tech skills list for entity extraction (shared by resume and job processing)
+TECH_SKILLS = frozenset({
+    "python", "java", "javascript", "typescript", "go", "golang", "rust", "c++", 
+    "c#", "ruby", "php", "swift", "kotlin", "scala", "r", "matlab",
+    "react", "vue", "angular", "svelte", "html", "css", "tailwind", "bootstrap",
+    "next.js", "nextjs", "nuxt", "gatsby", "webpack", "vite",
+    "node.js", "nodejs", "express", "django", "flask", "fastapi", "spring", 
+    "spring boot", "rails", "laravel", ".net", "asp.net",
+    "sql", "postgresql", "postgres", "mysql", "mongodb", "redis", "elasticsearch",
+    "dynamodb", "cassandra", "sqlite", "oracle", "neo4j",
+    "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "k8s",
+    "terraform", "ansible", "jenkins", "github actions", "gitlab", "ci/cd",
+    "linux", "unix", "bash", "shell",
+    "machine learning", "deep learning", "tensorflow", "pytorch", "keras",
+    "scikit-learn", "sklearn", "pandas", "numpy", "nlp", "computer vision",
+    "neural network", "transformer", "bert", "gpt", "llm",
+    "data engineering", "etl", "spark", "airflow", "kafka", "hadoop",
+    "data pipeline", "databricks", "snowflake", "bigquery", "dbt",
+    "git", "agile", "scrum", "microservices", "rest", "api", "graphql",
+    "grpc", "rabbitmq", "celery", "nginx", "apache"
+})
+
+# Whole-word patterns, so "r", "go" or "scala" don't match inside "other",
+# "google" or "scalable"; "+", "#" and "&" count as word characters (c++, c#, r&d)
+_SKILL_PATTERNS = [
+    (skill, re.compile(rf"(?<![\w+#&]){re.escape(skill)}(?![\w+#&])"))
+    for skill in sorted(TECH_SKILLS)
+]
+
+def extract_skills(text: str) -> List[str]:
+    """
+    Returns the tech skills mentioned in `text` as whole words via keyword
+    matching, in a stable (alphabetical) order.
+    """
+    text_lower = text.lower()
+    return [skill for skill, pattern in _SKILL_PATTERNS if skill in text_lower and pattern.search(text_lower)]
+
+
+# Spellings the keyword matcher finds separately, mapped to one canonical skill
+SKILL_ALIASES = {
+    "golang": "go", "nextjs": "next.js", "nodejs": "node.js", "postgres": "postgresql",
+    "k8s": "kubernetes", "sklearn": "scikit-learn", "google cloud": "gcp",
+}
+
+def normalize_skill(name: str) -> str:
+    name = name.strip().lower()
+    return SKILL_ALIASES.get(name, name)
+
+def normalize_skills(names: Iterable[str]) -> List[str]:
+    """Canonical, de-duplicated skill names (sorted); accepts a comma-joined string too."""
+    if isinstance(names, str):
+        names = names.split(",")
+    return sorted({normalize_skill(name) for name in names if name and name.strip()})
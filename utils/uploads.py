@@ -0,0 +1,177 @@
+"""
+Streaming, size-limited resume uploads.
+
+The multipart body is read chunk by chunk as it arrives. The file part goes
+into a SpooledTemporaryFile (in memory up to BMATS_UPLOAD_SPOOL_BYTES, then on
+disk) while its SHA-256 is computed and its first bytes are checked for the PDF
+magic. The request is rejected as soon as it is known to be too large
+(declared Content-Length, or bytes actually received) or not a PDF, on the
+event loop and before any threadpool worker or model is involved. The parser
+then reads the spooled file in place (a read-only mmap once it is on disk)
+instead of a copy.
+"""
+import hashlib
+import mmap
+import os
+from contextlib import contextmanager
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Dict, Iterator, Optional
+from fastapi import HTTPException, Request
+from python_multipart import MultipartParser
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+MAX_UPLOAD_BYTES = int(os.getenv("BMATS_MAX_UPLOAD_BYTES", str(5 * 1024 * 1024)))
+SPOOL_BYTES = int(os.getenv("BMATS_UPLOAD_SPOOL_BYTES", str(1024 * 1024)))
+# Boundaries, part headers and the small form fields around the file
+MULTIPART_OVERHEAD = 64 * 1024
+MAX_FIELD_BYTES = 4096
+PDF_MAGIC = b"%PDF-"
+# PDF readers accept the header anywhere in the first KB
+MAGIC_WINDOW = 1024
+
+def _too_large():
+    return HTTPException(status_code=413, detail=f"Upload too large (max {MAX_UPLOAD_BYTES // 1024} KB)")
+
+def _not_pdf():
+    return HTTPException(status_code=400, detail="Invalid file type. Only PDF is supported.")
+
+class SpooledUpload:
+    """A received file part plus the form's text fields."""
+
+    def __init__(self):
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.file = SpooledTemporaryFile(max_size=SPOOL_BYTES)
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._head = b""
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def on_disk(self) -> bool:
+        return self.file._rolled
+
+    def _feed(self, data: bytes):
+        """Counts, hashes and sniffs a chunk of file data (the caller writes it)."""
+        self.size += len(data)
+        if self.size > MAX_UPLOAD_BYTES:
+            raise _too_large()
+        self._hash.update(data)
+        if len(self._head) < MAGIC_WINDOW:
+            self._head += data[:MAGIC_WINDOW - len(self._head)]
+            if len(self._head) >= MAGIC_WINDOW and PDF_MAGIC not in self._head:
+                raise _not_pdf()
+
+    @contextmanager
+    def view(self) -> Iterator[BinaryIO]:
+        """File-like view of the upload for the parser, without copying it."""
+        self.file.seek(0)
+        if not self.on_disk:
+            yield self.file
+            return
+        mapped = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+    def close(self):
+        self.file.close()
+
+async def receive_pdf_upload(request: Request, file_field: str = "file") -> SpooledUpload:
+    """
+    Streams a multipart/form-data request with one PDF file part into a SpooledUpload.
+    Raises 413 for oversized bodies and 400 for malformed or non-PDF uploads.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD:
+        raise _too_large()
+
+    upload = SpooledUpload()
+    part = {}
+    pending = []
+
+    def on_part_begin():
+        part.clear()
+        part.update(headers={}, header_name=b"", header_value=b"", name=None, is_file=False, data=bytearray())
+
+    def on_header_field(data, start, end):
+        part["header_name"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        part["header_value"] += data[start:end]
+
+    def on_header_end():
+        part["headers"][part["header_name"].lower()] = part["header_value"]
+        part["header_name"] = part["header_value"] = b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(part["headers"].get(b"content-disposition", b""))
+        part["name"] = options.get(b"name", b"").decode("utf-8", "replace")
+        if b"filename" in options:
+            if part["name"] != file_field or upload.filename is not None:
+                raise HTTPException(status_code=400, detail=f"Expected a single '{file_field}' file part")
+            part["is_file"] = True
+            upload.filename = options[b"filename"].decode("utf-8", "replace")
+
+    def on_part_data(data, start, end):
+        chunk = data[start:end]
+        if part["is_file"]:
+            upload._feed(chunk)
+            pending.append(chunk)
+        else:
+            part["data"] += chunk
+            if len(part["data"]) > MAX_FIELD_BYTES:
+                raise HTTPException(status_code=400, detail=f"Form field '{part['name']}' too large")
+
+    def on_part_end():
+        if not part["is_file"]:
+            upload.fields[part["name"]] = part["data"].decode("utf-8", "replace")
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD:
+                raise _too_large()
+            parser.write(chunk)
+            if pending:
+                data = b"".join(pending)
+                pending.clear()
+                # Writes go to memory until the spool rolls over to disk
+                if upload.on_disk:
+                    await run_in_threadpool(upload.file.write, data)
+                else:
+                    upload.file.write(data)
+        parser.finalize()
+    except FormParserError:
+        upload.close()
+        raise HTTPException(status_code=400, detail="Invalid multipart data")
+    except BaseException:
+        upload.close()
+        raise
+
+    if upload.filename is None or upload.size == 0:
+        upload.close()
+        raise HTTPException(status_code=400, detail=f"Missing '{file_field}' file part")
+    if PDF_MAGIC not in upload._head:
+        upload.close()
+        raise _not_pdf()
+    return upload